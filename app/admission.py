@@ -0,0 +1,163 @@
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from app.memory import MB, available_memory
+
+PRECISIONS = ["double", "single"]
+AMPLITUDE_BYTES = {"double": 16, "single": 8}  # complex128 / complex64
+# Dense copies of the state held at the peak: the simulator's buffer plus the
+# array handed back to Python (Cirq also keeps a scratch buffer)
+STATE_COPIES = {"Qiskit Aer": 2, "Cirq": 3, "PennyLane": 2}
+DEFAULT_STATE_COPIES = 3
+BASE_OVERHEAD = 256 * MB  # interpreter plus an imported framework, per worker
+MPS_BOND_DIM = 256
+DEFAULT_HEADROOM = 0.8  # share of available memory runs may reserve
+BUDGET_ENV = "QBENCH_MEMORY_BUDGET_MB"
+# Used when the machine's memory cannot be read
+FALLBACK_STATEVECTOR_QUBITS = 24
+
+
+class AdmissionRejected(MemoryError):
+    """A run whose estimate exceeds the whole memory budget."""
+
+
+def estimate_memory(num_qubits, method="statevector", precision="double", backend=None,
+                    shots=None, non_clifford=0, reference=False):
+    """
+    Rough peak bytes of one backend run. Dense statevector dominates
+    everything else: 2**n amplitudes per copy, 16 bytes in double precision
+    and 8 in single. reference=True adds the complex128 ideal state the run
+    reads for state_fidelity (app.reference).
+    """
+    n = num_qubits
+    amp = AMPLITUDE_BYTES[precision]
+    if method == "statevector":
+        state = STATE_COPIES.get(backend, DEFAULT_STATE_COPIES) * amp * 2 ** n
+    elif method == "stabilizer":
+        state = 2 * n * (2 * n + 1)
+    elif method == "extended_stabilizer":
+        # One stabilizer state per term of the decomposition, ~2**(0.23 t) terms
+        state = 2 * n * (2 * n + 1) * 2 ** math.ceil(0.23 * non_clifford)
+    elif method == "matrix_product_state":
+        state = n * 2 * MPS_BOND_DIM ** 2 * amp
+    else:
+        raise ValueError(f"Unknown simulation method '{method}'")
+    if shots:
+        state += shots * n  # sampled bit matrix
+    if reference:
+        state += AMPLITUDE_BYTES["double"] * 2 ** n
+    return BASE_OVERHEAD + state
+
+
+def statevector_qubit_limit(budget, precision="double", backend=None):
+    """Widest dense statevector whose estimate fits in `budget` bytes."""
+    if budget is None:
+        return FALLBACK_STATEVECTOR_QUBITS
+    n = 0
+    while estimate_memory(n + 1, "statevector", precision, backend) <= budget:
+        n += 1
+    return n
+
+
+def qasm_num_qubits(qasm_code):
+    """Qubit count from the qreg declarations, without parsing the program."""
+    return sum(int(size) for size in re.findall(r"\bqreg\s+\w+\s*\[\s*(\d+)\s*\]", qasm_code))
+
+
+class AdmissionController:
+    """
+    Memory reservations for runs in flight. A run is admitted when its
+    estimate fits next to everything already reserved, queued while it would
+    only fit once other runs finish, and rejected when it exceeds the whole
+    budget. The budget is `headroom` of the available memory (or
+    QBENCH_MEMORY_BUDGET_MB), re-read whenever nothing is reserved so that
+    our own workers never count against it.
+    """
+
+    def __init__(self, budget=None, headroom=DEFAULT_HEADROOM):
+        self.headroom = headroom
+        self._fixed_budget = budget
+        self._budget = None
+        self._reserved = 0
+        self._changed = threading.Condition()
+
+    def _read_budget(self):
+        if self._fixed_budget is not None:
+            return self._fixed_budget
+        if os.environ.get(BUDGET_ENV):
+            return int(float(os.environ[BUDGET_ENV]) * MB)
+        available = available_memory()
+        return int(available * self.headroom) if available is not None else None
+
+    @property
+    def budget(self):
+        """Bytes runs may reserve in total, or None when memory cannot be read."""
+        with self._changed:
+            if self._reserved == 0 or self._budget is None:
+                self._budget = self._read_budget()
+            return self._budget
+
+    @property
+    def reserved(self):
+        with self._changed:
+            return self._reserved
+
+    def statevector_limit(self, precision="double", backend=None, concurrency=1):
+        """Widest statevector `concurrency` runs can each hold at once."""
+        budget = self.budget
+        return statevector_qubit_limit(budget and budget // max(concurrency, 1), precision, backend)
+
+    def check(self, estimate):
+        """Raises AdmissionRejected if `estimate` can never be admitted."""
+        budget = self.budget
+        if budget is not None and estimate > budget:
+            raise AdmissionRejected(
+                f"Needs ~{estimate / MB:,.0f} MB, memory budget is {budget / MB:,.0f} MB"
+            )
+
+    def try_reserve(self, estimate):
+        """Reserves without blocking. False means queue and retry later."""
+        self.check(estimate)
+        with self._changed:
+            if self._budget is not None and self._reserved and self._reserved + estimate > self._budget:
+                return False
+            self._reserved += estimate
+            return True
+
+    def release(self, estimate):
+        with self._changed:
+            self._reserved = max(self._reserved - estimate, 0)
+            self._changed.notify_all()
+
+    @contextmanager
+    def reserve(self, estimate, timeout=None, cancel_event=None):
+        """Blocks until `estimate` bytes are admitted, then holds them for the block."""
+        deadline = time.monotonic() + timeout if timeout else None
+        while not self.try_reserve(estimate):
+            if cancel_event is not None and cancel_event.is_set():
+                raise AdmissionRejected("Cancelled while waiting for memory")
+            if deadline is not None and time.monotonic() > deadline:
+                raise AdmissionRejected(f"No memory for ~{estimate / MB:,.0f} MB after {timeout:.0f}s")
+            with self._changed:
+                self._changed.wait(0.5)
+        try:
+            yield estimate
+        finally:
+            self.release(estimate)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_controller():
+    """The process-wide controller shared by every analyzer (and service job)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = AdmissionController()
+        return _default
@@ -0,0 +1,116 @@
+import numpy as np
+
+# Extended stabilizer cost grows exponentially with the non-Clifford count
+MAX_NON_CLIFFORD_EXTENDED = 16
+# MPS stays cheap while two-qubit gates act on near neighbours of the line
+MAX_INTERACTION_DISTANCE_MPS = 3
+
+CLIFFORD_GATES = {
+    "id", "x", "y", "z", "h", "s", "sdg", "sx", "sxdg",
+    "cx", "cy", "cz", "swap", "iswap", "ecr", "dcx",
+}
+# Rotations that are Clifford when the angle is a multiple of pi/2
+ROTATION_GATES = {"rx", "ry", "rz", "p", "u1"}
+NON_UNITARY = {"measure", "barrier", "reset", "delay", "save_statevector"}
+
+SIM_METHODS = ["statevector", "stabilizer", "extended_stabilizer", "matrix_product_state"]
+# Methods each backend can run; Cirq and PennyLane only add a Clifford simulator
+# (cirq.CliffordSimulator, default.clifford) to the dense state
+BACKEND_METHODS = {
+    "Qiskit Aer": SIM_METHODS,
+    "Cirq": ["statevector", "stabilizer"],
+    "PennyLane": ["statevector", "stabilizer"],
+}
+
+
+def _is_clifford(op):
+    if op.name in CLIFFORD_GATES:
+        return True
+    if op.name in ROTATION_GATES:
+        try:
+            angle = float(op.params[0])
+        except (TypeError, ValueError):
+            return False
+        quarter_turns = angle / (np.pi / 2)
+        return bool(np.isclose(quarter_turns, np.round(quarter_turns), atol=1e-9))
+    return False
+
+
+def analyze_circuit(qc):
+    """
+    Structural profile used for simulation-method routing: Clifford content,
+    non-Clifford gate count and how far apart interacting qubits are.
+    """
+    index = {q: i for i, q in enumerate(qc.qubits)}
+    non_clifford = 0
+    two_qubit = 0
+    max_distance = 0
+    edges = set()
+
+    for inst in qc.data:
+        op = inst.operation
+        if op.name in NON_UNITARY:
+            continue
+        if not _is_clifford(op):
+            non_clifford += 1
+        if len(inst.qubits) >= 2:
+            two_qubit += 1
+            wires = sorted(index[q] for q in inst.qubits)
+            max_distance = max(max_distance, wires[-1] - wires[0])
+            edges.update(zip(wires, wires[1:]))
+
+    return {
+        "num_qubits": qc.num_qubits,
+        "clifford": non_clifford == 0,
+        "non_clifford_count": non_clifford,
+        "two_qubit_gates": two_qubit,
+        "interaction_edges": len(edges),
+        "max_interaction_distance": max_distance,
+    }
+
+
+def select_method(profile, max_statevector_qubits, methods=SIM_METHODS):
+    """
+    Picks a simulation method among methods for a circuit profile, or None
+    when none fits. Dense statevector is kept whenever it fits so small
+    circuits stay comparable across frameworks.
+    """
+    n = profile["num_qubits"]
+    if n <= max_statevector_qubits and "statevector" in methods:
+        return "statevector"
+    if profile["clifford"] and "stabilizer" in methods:
+        return "stabilizer"
+    if profile["non_clifford_count"] <= MAX_NON_CLIFFORD_EXTENDED and "extended_stabilizer" in methods:
+        return "extended_stabilizer"
+    if profile["max_interaction_distance"] <= MAX_INTERACTION_DISTANCE_MPS and "matrix_product_state" in methods:
+        return "matrix_product_state"
+    return None
+
+
+def resolve_method(profile, requested, max_statevector_qubits, backend=None):
+    """
+    Validates a requested method ("auto" or one of SIM_METHODS) against the
+    profile and the methods the backend offers (BACKEND_METHODS).
+    """
+    methods = BACKEND_METHODS.get(backend, SIM_METHODS)
+    if requested in (None, "auto"):
+        method = select_method(profile, max_statevector_qubits, methods)
+        if method is None:
+            raise ValueError(
+                f"Circuit too large for local simulation ({profile['num_qubits']} qubits, "
+                f"{profile['non_clifford_count']} non-Clifford gates, "
+                f"interaction distance {profile['max_interaction_distance']})."
+            )
+        return method
+
+    if requested not in SIM_METHODS:
+        raise ValueError(f"Unknown simulation method '{requested}'")
+    if requested not in methods:
+        raise ValueError(f"{backend} has no '{requested}' simulator")
+    if requested == "statevector" and profile["num_qubits"] > max_statevector_qubits:
+        raise ValueError(
+            f"Circuit too large for local simulation ({profile['num_qubits']} > {max_statevector_qubits} qubits)."
+        )
+    if requested == "stabilizer" and not profile["clifford"]:
+        raise ValueError("Stabilizer method needs a Clifford-only circuit")
+    return requested
@@ -0,0 +1,62 @@
+import importlib
+import time
+
+
+class BackendPlugin:
+    """
+    A named benchmark backend. `run(analyzer, qasm_code, **kwargs)` returns a
+    runner metrics dict; `modules` are imported on first use only, so a
+    session that never touches a framework never pays for importing it.
+    `package` is the distribution whose version identifies the backend in
+    the benchmark history.
+    """
+
+    def __init__(self, name, run, backend_type="Simulator", modules=(), loader=None, package=None):
+        self.name = name
+        self.package = package
+        self.run_fn = run
+        self.type = backend_type
+        self.modules = tuple(modules)
+        self.loader = loader
+        self.import_time = None  # seconds spent importing, set on first load
+
+    @property
+    def loaded(self):
+        return self.import_time is not None
+
+    def load(self):
+        """Imports the framework if needed. Returns the seconds spent doing so (0.0 when warm)."""
+        if self.loaded:
+            return 0.0
+        t0 = time.perf_counter_ns()
+        if self.loader:
+            self.loader()
+        for module in self.modules:
+            importlib.import_module(module)
+        self.import_time = (time.perf_counter_ns() - t0) / 1e9
+        return self.import_time
+
+    def run(self, analyzer, qasm_code, **kwargs):
+        self.load()
+        return self.run_fn(analyzer, qasm_code, **kwargs)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "lazy"
+        return f"BackendPlugin({self.name!r}, {self.type}, {state})"
+
+
+# name -> plugin; insertion order is execution order (Qiskit Aer first for the baseline)
+BACKENDS = {}
+
+
+def register_backend(plugin):
+    BACKENDS[plugin.name] = plugin
+    return plugin
+
+
+def get_backend(name):
+    return BACKENDS.get(name)
+
+
+def simulator_backends():
+    return [name for name, plugin in BACKENDS.items() if plugin.type == "Simulator"]
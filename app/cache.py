@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "qbench")
+DEFAULT_MAX_MB = 512
+TRACKED_PACKAGES = ["qiskit", "qiskit-aer", "qiskit-ibm-runtime", "cirq", "pennylane", "pennylane-lightning", "numpy"]
+
+
+# --- KEYS ---
+def canonicalize_qasm(qasm_code):
+    """Whitespace, comment and barrier insensitive form of a QASM program."""
+    code = re.sub(r"//[^\n]*", "", qasm_code)
+    statements = []
+    for stmt in code.split(";"):
+        stmt = " ".join(stmt.split())
+        if not stmt or stmt.startswith("barrier"):
+            continue
+        # "cx q[0] , q[1]" and "cx q[0],q[1]" are the same instruction
+        statements.append(re.sub(r"\s*([,()\[\]])\s*", r"\1", stmt))
+    return ";\n".join(statements) + ";"
+
+
+def circuit_hash(qasm_code):
+    return hashlib.sha256(canonicalize_qasm(qasm_code).encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def framework_versions():
+    versions = {}
+    for pkg in TRACKED_PACKAGES:
+        try:
+            versions[pkg] = metadata.version(pkg)
+        except metadata.PackageNotFoundError:
+            versions[pkg] = None
+    return versions
+
+
+def result_key(qasm_code, backend_name, options=None, kind="run"):
+    payload = {
+        "kind": kind,
+        "circuit": circuit_hash(qasm_code),
+        "backend": backend_name,
+        "options": options or {},
+        "versions": framework_versions(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# --- STORE ---
+class ResultCache:
+    """
+    Size-bounded on-disk cache of runner outputs, one pickle per key.
+    Reads refresh the file mtime, so eviction drops the least recently used
+    entries first once the directory grows past max_mb.
+    """
+
+    def __init__(self, directory=None, max_mb=DEFAULT_MAX_MB):
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, "results")
+        self.max_bytes = int(max_mb * 1024 ** 2)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+            return value
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def put(self, key, value):
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"Result cache write failed: {e}")
+            return
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pkl"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+
+from app.runner import MAX_QUBITS_LOCAL, SIMULATOR_BACKENDS
+
+SCALING_METRICS = ["total_latency", "execution_time", "memory_mb"]
+
+
+# --- QASM HELPERS ---
+def _header(n):
+    # No creg on purpose: hardware runs then get a measure_all()
+    return ["OPENQASM 2.0;", 'include "qelib1.inc";', f"qreg q[{n}];"]
+
+
+def _angle(theta):
+    return f"{theta:.6f}"
+
+
+def _random_pairs(rng, n):
+    perm = rng.permutation(n)
+    return [(int(perm[i]), int(perm[i + 1])) for i in range(0, n - 1, 2)]
+
+
+# --- CIRCUIT FAMILIES ---
+def ghz(n, depth=None, seed=None):
+    lines = _header(n) + ["h q[0];"]
+    lines += [f"cx q[{i}], q[{i + 1}];" for i in range(n - 1)]
+    return "\n".join(lines) + "\n"
+
+
+def qft(n, depth=None, seed=None):
+    lines = _header(n)
+    for i in range(n):
+        lines.append(f"h q[{i}];")
+        for j in range(i + 1, n):
+            lines.append(f"cu1({_angle(np.pi / 2 ** (j - i))}) q[{j}], q[{i}];")
+    for i in range(n // 2):
+        lines.append(f"swap q[{i}], q[{n - 1 - i}];")
+    return "\n".join(lines) + "\n"
+
+
+def quantum_volume(n, depth=None, seed=0):
+    """Quantum-volume style: random pairings, each pair gets u3 layers around a cx."""
+    rng = np.random.default_rng(seed)
+    lines = _header(n)
+    for _ in range(depth or n):
+        for a, b in _random_pairs(rng, n):
+            for _ in range(2):
+                for q in (a, b):
+                    t, p, l = rng.uniform(0, 2 * np.pi, 3)
+                    lines.append(f"u3({_angle(t)},{_angle(p)},{_angle(l)}) q[{q}];")
+                lines.append(f"cx q[{a}], q[{b}];")
+    return "\n".join(lines) + "\n"
+
+
+def hardware_efficient(n, depth=None, seed=0):
+    """Hardware-efficient ansatz: ry/rz rotation layer plus a linear cx ladder."""
+    rng = np.random.default_rng(seed)
+    lines = _header(n)
+    for _ in range(depth or 2):
+        for q in range(n):
+            lines.append(f"ry({_angle(rng.uniform(0, 2 * np.pi))}) q[{q}];")
+            lines.append(f"rz({_angle(rng.uniform(0, 2 * np.pi))}) q[{q}];")
+        lines += [f"cx q[{q}], q[{q + 1}];" for q in range(n - 1)]
+    return "\n".join(lines) + "\n"
+
+
+def clifford(n, depth=None, seed=0):
+    """Random Clifford-only layers (h, s, sdg, x plus cx/cz on random pairs)."""
+    rng = np.random.default_rng(seed)
+    single = ["h", "s", "sdg", "x"]
+    lines = _header(n)
+    for _ in range(depth or n):
+        for q in range(n):
+            lines.append(f"{single[rng.integers(len(single))]} q[{q}];")
+        for a, b in _random_pairs(rng, n):
+            lines.append(f"{'cx' if rng.random() < 0.5 else 'cz'} q[{a}], q[{b}];")
+    return "\n".join(lines) + "\n"
+
+
+CIRCUIT_FAMILIES = {
+    "ghz": ghz,
+    "qft": qft,
+    "quantum_volume": quantum_volume,
+    "hardware_efficient": hardware_efficient,
+    "clifford": clifford,
+}
+
+
+# --- SWEEPS ---
+def generate_suite(families=None, qubits=None, depths=(None,), seed=0):
+    """Yields {family, num_qubits, depth, qasm} for every point of the sweep grid."""
+    families = families or list(CIRCUIT_FAMILIES)
+    qubits = qubits or range(2, MAX_QUBITS_LOCAL + 1, 2)
+    for family in families:
+        generator = CIRCUIT_FAMILIES[family]
+        for n in qubits:
+            for depth in depths:
+                yield {
+                    "family": family,
+                    "num_qubits": n,
+                    "depth": depth,
+                    "qasm": generator(n, depth=depth, seed=seed),
+                }
+
+
+def run_sweep(analyzer, families=None, qubits=None, depths=(None,), backends=None,
+              metrics=SCALING_METRICS, on_progress=None, **benchmark_kwargs):
+    """
+    Runs every generated circuit through analyzer.execute_benchmark and returns
+    a tidy long-form DataFrame: one row per (circuit, backend, metric).
+    Extra keyword arguments (parallel, warmup, repeats...) are passed through.
+    """
+    backends = backends or SIMULATOR_BACKENDS
+    instances = list(generate_suite(families, qubits, depths))
+    frames = []
+    for i, inst in enumerate(instances):
+        df = analyzer.execute_benchmark(inst["qasm"], backends, **benchmark_kwargs)
+        if df.empty:
+            continue
+        df = df.drop(columns=["probs"], errors="ignore")
+        df["family"] = inst["family"]
+        df["num_qubits"] = inst["num_qubits"]
+        df["depth"] = inst["depth"]
+        if "error" not in df.columns:
+            df["error"] = None
+        frames.append(df)
+        if on_progress:
+            on_progress(i + 1, len(instances))
+
+    if not frames:
+        return pd.DataFrame(columns=["family", "num_qubits", "depth", "backend", "type", "error", "metric", "value"])
+
+    wide = pd.concat(frames, ignore_index=True)
+    value_vars = [m for m in metrics if m in wide.columns]
+    return wide.melt(
+        id_vars=["family", "num_qubits", "depth", "backend", "type", "error"],
+        value_vars=value_vars, var_name="metric", value_name="value",
+    )
+
+
+def plot_scaling(tidy_df, metrics=("total_latency", "memory_mb")):
+    """Log-log scaling curves: one row per circuit family, one column per metric."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    df = tidy_df[tidy_df["error"].isna() & tidy_df["metric"].isin(metrics)]
+    df = df[df["value"] > 0]
+    if df.empty:
+        return None
+
+    sns.set_theme(style="whitegrid")
+    families = sorted(df["family"].unique())
+    fig, axes = plt.subplots(len(families), len(metrics), figsize=(7 * len(metrics), 4.5 * len(families)),
+                             squeeze=False)
+    fig.suptitle("QBench: Scaling Curves", fontsize=20, y=1.02)
+
+    for r, family in enumerate(families):
+        for c, metric in enumerate(metrics):
+            ax = axes[r][c]
+            sub = df[(df["family"] == family) & (df["metric"] == metric)]
+            for backend, grp in sub.groupby("backend"):
+                # Median per width, with the interquartile band when repeated runs exist
+                values = grp.groupby("num_qubits")["value"]
+                median = values.median()
+                line, = ax.plot(median.index, median.values, marker="o", label=backend)
+                if (values.count() > 1).any():
+                    ax.fill_between(median.index, values.quantile(0.25), values.quantile(0.75),
+                                    color=line.get_color(), alpha=0.2)
+            ax.set_xscale("log", base=2)
+            ax.set_yscale("log")
+            ax.set_title(f"{family} - {metric.replace('_', ' ').title()}", fontsize=13, fontweight='bold')
+            ax.set_xlabel("Qubits")
+            ax.set_ylabel("MB" if metric.endswith("_mb") else "Seconds")
+            if sub["backend"].nunique():
+                ax.legend(fontsize='x-small')
+
+    plt.tight_layout()
+    return fig
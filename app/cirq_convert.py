@@ -0,0 +1,86 @@
+import numpy as np
+
+from app.ir import unroll
+
+SKIPPED = {"barrier", "delay"}
+
+
+def _turns(op):
+    # Cirq's *PowGate exponents are in half turns
+    return float(op.params[0]) / np.pi
+
+
+def _gate_table(cirq):
+    # Qiskit name -> builder(op); conventions match qiskit's matrices
+    return {
+        "id": lambda op: cirq.I,
+        "h": lambda op: cirq.H,
+        "x": lambda op: cirq.X,
+        "y": lambda op: cirq.Y,
+        "z": lambda op: cirq.Z,
+        "s": lambda op: cirq.S,
+        "sdg": lambda op: cirq.S ** -1,
+        "t": lambda op: cirq.T,
+        "tdg": lambda op: cirq.T ** -1,
+        "sx": lambda op: cirq.XPowGate(exponent=0.5),
+        "sxdg": lambda op: cirq.XPowGate(exponent=-0.5),
+        "rx": lambda op: cirq.rx(float(op.params[0])),
+        "ry": lambda op: cirq.ry(float(op.params[0])),
+        "rz": lambda op: cirq.rz(float(op.params[0])),
+        "p": lambda op: cirq.ZPowGate(exponent=_turns(op)),
+        "u1": lambda op: cirq.ZPowGate(exponent=_turns(op)),
+        # Single-qubit matrices have no qubit-order ambiguity
+        "u2": lambda op: cirq.MatrixGate(np.asarray(op.to_matrix())),
+        "u3": lambda op: cirq.MatrixGate(np.asarray(op.to_matrix())),
+        "u": lambda op: cirq.MatrixGate(np.asarray(op.to_matrix())),
+        "cx": lambda op: cirq.CNOT,
+        "cy": lambda op: cirq.ControlledGate(cirq.Y),
+        "cz": lambda op: cirq.CZ,
+        "ch": lambda op: cirq.ControlledGate(cirq.H),
+        "swap": lambda op: cirq.SWAP,
+        "iswap": lambda op: cirq.ISWAP,
+        "cp": lambda op: cirq.CZPowGate(exponent=_turns(op)),
+        "cu1": lambda op: cirq.CZPowGate(exponent=_turns(op)),
+        "crx": lambda op: cirq.ControlledGate(cirq.rx(float(op.params[0]))),
+        "cry": lambda op: cirq.ControlledGate(cirq.ry(float(op.params[0]))),
+        "crz": lambda op: cirq.ControlledGate(cirq.rz(float(op.params[0]))),
+        "rxx": lambda op: cirq.XXPowGate(exponent=_turns(op), global_shift=-0.5),
+        "ryy": lambda op: cirq.YYPowGate(exponent=_turns(op), global_shift=-0.5),
+        "rzz": lambda op: cirq.ZZPowGate(exponent=_turns(op), global_shift=-0.5),
+        "ccx": lambda op: cirq.CCX,
+        "cswap": lambda op: cirq.CSWAP,
+    }
+
+
+_TABLE = None
+
+
+def to_cirq(qc):
+    """
+    Lowers a Qiskit circuit to (cirq.Circuit, qubits) on LineQubits 0..n-1,
+    so idle qubits still count and qubit i of both frameworks is the same.
+    """
+    import cirq
+
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = _gate_table(cirq)
+
+    qc = unroll(qc, set(_TABLE) | SKIPPED | {"measure", "reset"})
+    qubits = cirq.LineQubit.range(qc.num_qubits)
+    index = {q: i for i, q in enumerate(qc.qubits)}
+
+    ops = []
+    for i, inst in enumerate(qc.data):
+        name = inst.operation.name
+        targets = [qubits[index[q]] for q in inst.qubits]
+        if name in SKIPPED:
+            continue
+        if name == "measure":
+            # Mid-circuit measurements keep their collapse; final ones were stripped by the IR
+            ops.append(cirq.measure(*targets, key=f"mid_{i}"))
+        elif name == "reset":
+            ops.append(cirq.ResetChannel().on(*targets))
+        else:
+            ops.append(_TABLE[name](inst.operation).on(*targets))
+    return cirq.Circuit(ops), qubits
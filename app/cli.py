@@ -0,0 +1,266 @@
+"""
+Headless batch benchmarking: every QASM file found goes through
+QBenchAnalyzer.execute_benchmark in a pool of worker processes, and result
+rows are streamed to the output as each circuit finishes.
+
+    qbench circuits/ --output results.jsonl
+    qbench "suite/**/*.qasm" --backends "Qiskit Aer" Cirq --workers 4 --repeats 5
+    qbench circuits/ --output results.parquet      # one part file per circuit
+
+Re-running the same command resumes: circuits with a successful row already in
+the output for every requested backend are skipped. Rows with an error (a
+backend failure, or a worker timeout, crash or memory rejection) do not count,
+so those circuits run again.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+from app.cache import circuit_hash
+from app.workers import DEFAULT_TIMEOUT, WorkerTask, run_isolated
+
+DEFAULT_OUTPUT = "qbench_results.jsonl"
+QASM_SUFFIXES = (".qasm", ".qasm2")
+
+
+def find_circuits(patterns):
+    """Expands directories (recursively), files and glob patterns into sorted QASM paths."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                paths.update(os.path.join(root, f) for f in files if f.endswith(QASM_SUFFIXES))
+        elif os.path.isfile(pattern):
+            paths.add(pattern)
+        else:
+            paths.update(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+    return sorted(paths)
+
+
+# --- OUTPUT ---
+class JsonlSink:
+    """Appends one JSON object per row; a crash loses at most the line being written."""
+
+    def __init__(self, path):
+        self.path = path
+        self._checked_tail = False
+
+    def completed(self):
+        """(circuit_hash, backend) pairs with a successful row; failed rows are retried."""
+        done = set()
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted run
+                    if row.get("error") is None:
+                        done.add((row.get("circuit_hash"), row.get("backend")))
+        except OSError:
+            pass
+        return done
+
+    def write(self, df, circuit_key):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        prefix = ""
+        if not self._checked_tail:
+            # Start on a fresh line if the previous run died mid-row
+            self._checked_tail = True
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    prefix = "" if f.read(1) == b"\n" else "\n"
+        with open(self.path, "a") as f:
+            f.write(prefix)
+            f.write(df.to_json(orient="records", lines=True, default_handler=str).rstrip("\n") + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class ParquetSink:
+    """A directory of Parquet part files, one per circuit, each written atomically."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def completed(self):
+        """(circuit_hash, backend) pairs with a successful row; failed rows are retried."""
+        import pandas as pd
+
+        done = set()
+        if not os.path.isdir(self.path):
+            return done
+        for name in os.listdir(self.path):
+            if not name.endswith(".parquet"):
+                continue
+            try:
+                part = pd.read_parquet(os.path.join(self.path, name))
+            except Exception:
+                continue
+            if "error" in part.columns:
+                part = part[part["error"].isna()]
+            done.update(zip(part["circuit_hash"], part["backend"]))
+        return done
+
+    def write(self, df, circuit_key):
+        os.makedirs(self.path, exist_ok=True)
+        # Mixed None/str/number columns become strings rather than failing the schema
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].map(lambda v: v if v is None or isinstance(v, str) else str(v))
+        target = os.path.join(self.path, f"part-{circuit_key[:16]}.parquet")
+        tmp = target + ".tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, target)
+
+
+def open_sink(path):
+    return ParquetSink(path) if path.endswith(".parquet") else JsonlSink(path)
+
+
+# --- WORKERS ---
+def _benchmark_file(path, backends, benchmark_options, analyzer_options, trace_dir=None):
+    # Entry point inside worker processes
+    from app.runner import QBenchAnalyzer
+
+    with open(path) as f:
+        qasm_code = f.read()
+    analyzer = QBenchAnalyzer(**analyzer_options)
+    df = analyzer.execute_benchmark(qasm_code, backends, **benchmark_options)
+    if trace_dir:
+        analyzer.export_trace(df, os.path.join(trace_dir, f"{circuit_hash(qasm_code)[:16]}.json"))
+    return df.drop(columns=["probs"], errors="ignore").to_dict("records")
+
+
+def _circuit_memory(qasm_code, backends, admission, precision="double"):
+    # Backends of one circuit run one after another, so the widest estimate is the peak
+    from app.admission import estimate_memory, qasm_num_qubits
+
+    n = qasm_num_qubits(qasm_code)
+    peaks = []
+    for backend in backends:
+        # Past the statevector limit the runner routes to a structure-aware method
+        method = "statevector" if n <= admission.statevector_limit(precision, backend) else "stabilizer"
+        peaks.append(estimate_memory(n, method, precision, backend))
+    return max(peaks, default=0)
+
+
+def run_batch(paths, output, backends, workers=None, timeout=DEFAULT_TIMEOUT, resume=True,
+              benchmark_options=None, analyzer_options=None, trace_dir=None, admission=None, log=print):
+    """
+    Benchmarks every file in `paths` and streams the rows to `output`.
+    With trace_dir, each circuit's Chrome trace is written there as <hash>.json.
+    With an admission controller, circuits start only once their estimated
+    memory fits next to the circuits already running (see app.admission).
+    Returns (circuits_run, circuits_skipped, circuits_failed).
+    """
+    import pandas as pd
+
+    sink = open_sink(output)
+    done = sink.completed() if resume else set()
+
+    tasks, skipped = [], 0
+    sources = {}
+    precision = (benchmark_options or {}).get("precision", "double")
+    for path in paths:
+        try:
+            with open(path) as f:
+                qasm_code = f.read()
+            key = circuit_hash(qasm_code)
+        except OSError as e:
+            log(f"Skipping {path}: {e}")
+            continue
+        if all((key, b) in done for b in backends):
+            skipped += 1
+            continue
+        sources[path] = key
+        memory = 0
+        if admission is not None:
+            memory = _circuit_memory(qasm_code, backends, admission, precision)
+        tasks.append(WorkerTask(path, _benchmark_file,
+                                (path, backends, benchmark_options or {}, analyzer_options or {}, trace_dir),
+                                memory=memory))
+
+    failed = []
+    finished = [0]
+
+    def on_result(path, outcome):
+        finished[0] += 1
+        status, value = outcome
+        if status == "ok":
+            rows = value
+        else:
+            # The whole circuit failed (timeout, crash): record it per backend
+            failed.append(path)
+            rows = [{"backend": b, "error": value} for b in backends]
+        df = pd.DataFrame(rows)
+        df.insert(0, "source", path)
+        df["circuit_hash"] = sources[path]
+        sink.write(df, sources[path])
+        errors = int(df["error"].notna().sum()) if "error" in df.columns else 0
+        log(f"[{finished[0]}/{len(tasks)}] {path}: {len(df)} rows, {errors} errors")
+
+    if tasks:
+        run_isolated(tasks, max_workers=workers, timeout=timeout, on_result=on_result, admission=admission)
+    return len(tasks), skipped, len(failed)
+
+
+def main(argv=None):
+    from app.admission import PRECISIONS, default_controller
+    from app.analysis import SIM_METHODS
+    from app.pennylane_convert import PENNYLANE_DEVICES
+    from app.runner import SIMULATOR_BACKENDS
+
+    parser = argparse.ArgumentParser(prog="qbench", description="Benchmark a corpus of QASM circuits headlessly.")
+    parser.add_argument("inputs", nargs="+", help="QASM files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT,
+                        help="results file (.jsonl) or Parquet directory (.parquet)")
+    parser.add_argument("-b", "--backends", nargs="+", default=SIMULATOR_BACKENDS)
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="circuits benchmarked at once (default: CPU count); "
+                             "concurrent circuits share the CPU, use 1 for the cleanest timings")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per circuit")
+    parser.add_argument("--warmup", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--shots", type=int, default=None)
+    parser.add_argument("--method", choices=["auto"] + SIM_METHODS, default="auto")
+    parser.add_argument("--precision", choices=PRECISIONS, default="double",
+                        help="single = complex64 statevectors, half the memory of double")
+    parser.add_argument("--pennylane-device", choices=PENNYLANE_DEVICES, default="auto")
+    parser.add_argument("--offline-hardware", action="store_true",
+                        help="resolve non-simulator backends from qiskit-ibm-runtime's fake devices")
+    parser.add_argument("--no-cache", action="store_true", help="force fresh timings")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="rerun circuits already in the output (failed rows are always retried)")
+    parser.add_argument("--trace", metavar="DIR", default=None,
+                        help="write a Chrome trace (Perfetto) JSON per circuit into DIR")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="run simulators under cProfile (adds cprofile_path/cprofile_top columns)")
+    args = parser.parse_args(argv)
+
+    paths = find_circuits(args.inputs)
+    if not paths:
+        print("No QASM files matched.", file=sys.stderr)
+        return 2
+
+    benchmark_options = {
+        "warmup": args.warmup, "repeats": args.repeats, "shots": args.shots,
+        "method": args.method, "use_cache": not args.no_cache, "cprofile": args.cprofile,
+        "precision": args.precision,
+    }
+    analyzer_options = {"pennylane_device": args.pennylane_device, "offline_hardware": args.offline_hardware}
+    ran, skipped, failed = run_batch(
+        paths, args.output, args.backends, workers=args.workers, timeout=args.timeout,
+        resume=not args.no_resume, benchmark_options=benchmark_options, analyzer_options=analyzer_options,
+        trace_dir=args.trace, admission=default_controller(), log=lambda msg: print(msg, file=sys.stderr),
+    )
+    print(f"{ran} circuits benchmarked, {skipped} already in {args.output}, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
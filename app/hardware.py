@@ -0,0 +1,230 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers in other processes are not serialized
+    fcntl = None
+
+from app.cache import DEFAULT_CACHE_DIR
+from app.ir import CircuitIR, as_ir
+from app.results import ProbabilityResult
+
+DEFAULT_LEDGER_PATH = os.path.join(DEFAULT_CACHE_DIR, "jobs.json")
+POLL_INTERVAL = 2.0  # seconds
+
+
+def fake_backend_resolver(name):
+    """Resolves e.g. "FakeManilaV2" from qiskit_ibm_runtime.fake_provider (runs locally on Aer)."""
+    from qiskit_ibm_runtime import fake_provider
+    try:
+        return getattr(fake_provider, name)()
+    except AttributeError:
+        raise ValueError(f"No backend matches '{name}' in fake_provider")
+
+
+def list_fake_backends():
+    from qiskit_ibm_runtime import fake_provider
+    return sorted(n for n in dir(fake_provider) if n.startswith("Fake") and n.endswith("V2"))
+
+
+class JobLedger:
+    """
+    Local JSON record of submitted hardware jobs, so queued work survives the
+    session and its results can be merged into a later results DataFrame.
+    Every read-modify-write holds an exclusive lock on <path>.lock, so CLI
+    workers, Streamlit sessions and the service never drop each other's jobs.
+    """
+
+    _thread_lock = threading.Lock()
+
+    def __init__(self, path=DEFAULT_LEDGER_PATH):
+        self.path = path
+
+    @contextmanager
+    def _locked(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self._thread_lock, open(self.path + ".lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _write(self, entries):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def add(self, entry):
+        with self._locked():
+            entries = self.load()
+            entries.append(entry)
+            self._write(entries)
+
+    def update(self, job_id, **fields):
+        with self._locked():
+            entries = self.load()
+            for entry in entries:
+                if entry["job_id"] == job_id:
+                    entry.update(fields)
+            self._write(entries)
+
+    def pending(self):
+        return [e for e in self.load() if e.get("status") == "SUBMITTED"]
+
+
+class HardwareQueue:
+    """
+    Non-blocking hardware pipeline: every device gets a single Sampler job
+    holding all requested circuits as PUBs, job IDs go to the ledger, and
+    poll() turns finished jobs into result rows whenever they are ready,
+    in this session or a later one.
+
+    backend_resolver defaults to service.backend; pass fake_backend_resolver
+    to exercise the whole flow offline.
+    """
+
+    def __init__(self, service=None, ledger=None, backend_resolver=None):
+        self.service = service
+        self.ledger = ledger or JobLedger()
+        self._resolve = backend_resolver or (service.backend if service else fake_backend_resolver)
+        self._live = {}  # job_id -> job handle submitted in this process
+
+    def submit(self, qasm_codes, backend_names, transpile_fn, shots=None):
+        """
+        Submits every circuit to every device without waiting. Returns
+        (job_ids, error_rows): devices that could not be submitted become rows.
+        """
+        from qiskit_ibm_runtime import SamplerV2 as Sampler
+
+        if isinstance(qasm_codes, (str, CircuitIR)):
+            qasm_codes = [qasm_codes]
+
+        job_ids, errors = [], []
+        for backend_name in backend_names:
+            try:
+                backend = self._resolve(backend_name)
+                pubs, circuits = [], []
+                for qasm_code in qasm_codes:
+                    ir = as_ir(qasm_code)
+                    qc = ir.circuit.copy()
+                    if qc.num_clbits == 0: qc.measure_all()
+                    c_hash = ir.hash
+                    record = {"circuit_hash": c_hash, "qasm": ir.qasm, "parse_time": ir.parse_time,
+                              "pre_depth": ir.metrics["pre_depth"], "pre_gate_count": ir.metrics["pre_gate_count"]}
+
+                    t0 = time.perf_counter()
+                    transpiled, record["compilation_cache"] = transpile_fn(qc, backend, 3, c_hash + ":measured")
+                    record["compilation_time"] = time.perf_counter() - t0
+                    record["post_depth"] = transpiled.depth()
+                    record["post_gate_count"] = sum(transpiled.count_ops().values())
+                    pubs.append(transpiled)
+                    circuits.append(record)
+
+                sampler = Sampler(mode=backend)
+                job = sampler.run(pubs, shots=shots) if shots else sampler.run(pubs)
+                job_id = job.job_id()
+                self._live[job_id] = job
+                self.ledger.add({
+                    "job_id": job_id, "backend": backend_name, "status": "SUBMITTED",
+                    "submitted_at": time.time(), "shots": shots, "circuits": circuits,
+                })
+                job_ids.append(job_id)
+            except Exception as e:
+                err_str = str(e)
+                if "No backend matches" in err_str:
+                    err_str = "Access Denied (Not in your Plan)"
+                errors.append({"backend": backend_name, "type": "Hardware", "error": err_str, "probs": None})
+        return job_ids, errors
+
+    def _job(self, job_id):
+        if job_id in self._live:
+            return self._live[job_id]
+        if self.service is None:
+            raise LookupError(f"Job {job_id} was run locally in another session")
+        return self.service.job(job_id)
+
+    def _rows(self, entry, job):
+        result = job.result()
+        finished = time.time()
+        latency = finished - entry["submitted_at"]
+        try:
+            quantum_seconds = job.metrics()["usage"]["quantum_seconds"]
+        except Exception:
+            quantum_seconds = None
+
+        rows = []
+        for i, record in enumerate(entry["circuits"]):
+            counts_data = list(result[i].data.values())[0].get_counts()
+            total_shots = sum(counts_data.values())
+            execution_time = quantum_seconds or latency
+            rows.append({
+                "backend": entry["backend"], "type": "Hardware", "job_id": entry["job_id"],
+                "circuit_hash": record["circuit_hash"], "parse_time": record.get("parse_time", 0.0),
+                "pre_depth": record["pre_depth"], "pre_gate_count": record["pre_gate_count"],
+                "post_depth": record["post_depth"], "post_gate_count": record["post_gate_count"],
+                "compilation_time": record["compilation_time"],
+                "compilation_cache": record["compilation_cache"],
+                "execution_time": execution_time,
+                "total_latency": latency,
+                "throughput_shots_sec": total_shots / execution_time if execution_time else 0.0,
+                "memory_mb": 0.0,
+                "probs": ProbabilityResult.from_counts(counts_data),
+            })
+        return rows
+
+    def poll(self, job_ids=None, wait=0.0):
+        """
+        Collects finished jobs (all pending ledger jobs, or just job_ids),
+        waiting up to `wait` seconds. Returns (rows, still_pending_job_ids).
+        """
+        deadline = time.monotonic() + wait
+        pending = {e["job_id"]: e for e in self.ledger.pending()
+                   if job_ids is None or e["job_id"] in job_ids}
+        rows = []
+        while True:
+            for job_id, entry in list(pending.items()):
+                try:
+                    job = self._job(job_id)
+                    if not job.in_final_state():
+                        continue
+                    status = str(job.status())
+                    if "DONE" in status.upper():
+                        rows.extend(self._rows(entry, job))
+                        self.ledger.update(job_id, status="DONE", finished_at=time.time())
+                    else:
+                        rows.append({"backend": entry["backend"], "type": "Hardware", "job_id": job_id,
+                                     "error": f"Job {job_id} ended with status {status}", "probs": None})
+                        self.ledger.update(job_id, status=status)
+                except LookupError as e:
+                    rows.append({"backend": entry["backend"], "type": "Hardware", "job_id": job_id,
+                                 "error": str(e), "probs": None})
+                    self.ledger.update(job_id, status="LOST")
+                except Exception as e:
+                    print(f"Hardware poll warning for {job_id}: {e}")
+                    continue
+                del pending[job_id]
+
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(min(POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+
+        return rows, list(pending)
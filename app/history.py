@@ -0,0 +1,264 @@
+"""
+Append-only benchmark history in SQLite, so runs can be compared across
+framework upgrades and over time without re-running anything.
+
+    python -m app.history                          # latest version vs the previous one
+    python -m app.history --by time --window 5     # last 5 runs vs the ones before
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.backends import get_backend
+from app.cache import DEFAULT_CACHE_DIR, framework_versions
+
+DEFAULT_HISTORY_PATH = os.path.join(DEFAULT_CACHE_DIR, "history.sqlite")
+# Numeric columns stored as real columns (queryable in SQL) next to the full row JSON
+HISTORY_METRICS = [
+    "num_qubits", "parse_time", "compilation_time", "execution_time", "total_latency",
+    "memory_mb", "peak_rss_mb", "throughput_shots_sec", "fidelity", "tvd", "state_fidelity",
+    "success_probability",
+]
+HARDWARE_PACKAGE = "qiskit-ibm-runtime"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at REAL NOT NULL,
+    host TEXT NOT NULL,
+    circuit_hash TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    backend_type TEXT,
+    backend_version TEXT,
+    versions TEXT,
+    options TEXT,
+    error TEXT,
+    {", ".join(f"{m} REAL" for m in HISTORY_METRICS)},
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_circuit ON runs (circuit_hash, backend, recorded_at);
+CREATE INDEX IF NOT EXISTS runs_version ON runs (backend, backend_version);
+CREATE INDEX IF NOT EXISTS runs_host ON runs (host, recorded_at);
+CREATE INDEX IF NOT EXISTS runs_time ON runs (recorded_at);
+"""
+
+
+def permutation_pvalue(baseline, candidate, n_perm=5000, seed=0):
+    """
+    One-sided permutation test on the difference of medians: the probability
+    of a slowdown at least this large if both groups came from one distribution.
+    """
+    a = np.asarray(baseline, dtype=float)
+    b = np.asarray(candidate, dtype=float)
+    if a.size < 2 or b.size < 2:
+        return float("nan")
+    observed = np.median(b) - np.median(a)
+    pooled = np.concatenate([a, b])
+    rng = np.random.default_rng(seed)
+    perms = rng.permuted(np.tile(pooled, (n_perm, 1)), axis=1)
+    diffs = np.median(perms[:, a.size:], axis=1) - np.median(perms[:, :a.size], axis=1)
+    return float((np.sum(diffs >= observed) + 1) / (n_perm + 1))
+
+
+def _version_key(version):
+    # "1.10.0" sorts after "1.9.2"; non-numeric parts compare as text
+    return tuple((0, int(p)) if p.isdigit() else (1, p) for p in str(version).replace("-", ".").split("."))
+
+
+class HistoryStore:
+    """
+    One row per (run, backend), indexed by circuit hash, backend, backend
+    version, host and timestamp. Rows are only ever inserted; cache hits are
+    not re-recorded because they repeat an earlier measurement.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # WAL lets CLI workers, the service and the dashboard write side by side. A bare
+        # Connection used as a context manager only commits, so close it here as well
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # --- WRITE ---
+    def record(self, df, options=None, circuit_hash=None, host=None, recorded_at=None):
+        """Appends the rows of a sanitized results DataFrame. Returns the number stored."""
+        if df is None or df.empty:
+            return 0
+        host = host or socket.gethostname()
+        recorded_at = recorded_at or time.time()
+        versions = framework_versions()
+        options_json = json.dumps(options or {}, sort_keys=True, default=str)
+
+        fresh = df
+        if "cache_hit" in df.columns:
+            fresh = df[df["cache_hit"] != True]
+        fresh = fresh.drop(columns=["probs"], errors="ignore")
+        records = json.loads(fresh.to_json(orient="records", default_handler=str))
+
+        rows = []
+        for rec in records:
+            plugin = get_backend(rec.get("backend"))
+            package = plugin.package if plugin is not None else HARDWARE_PACKAGE
+            rows.append((
+                recorded_at, host, rec.get("circuit_hash") or circuit_hash, rec.get("backend"), rec.get("type"),
+                versions.get(package), json.dumps(versions, sort_keys=True), options_json, rec.get("error"),
+                *[rec.get(m) for m in HISTORY_METRICS], json.dumps(rec),
+            ))
+        if not rows:
+            return 0
+        columns = ["recorded_at", "host", "circuit_hash", "backend", "backend_type", "backend_version",
+                   "versions", "options", "error", *HISTORY_METRICS, "data"]
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", rows
+            )
+        return len(rows)
+
+    # --- READ ---
+    def revision(self):
+        """Id of the newest row (0 when empty): changes whenever anything is recorded."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM runs").fetchone()[0]
+
+    def load(self, circuit_hash=None, backend=None, host=None, since=None, until=None,
+             include_errors=False, limit=None):
+        """History rows as a DataFrame (newest last), filtered on the indexed columns."""
+        import pandas as pd
+
+        clauses, params = [], []
+        for column, value in (("circuit_hash", circuit_hash), ("backend", backend), ("host", host)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("recorded_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("recorded_at < ?")
+            params.append(until)
+        if not include_errors:
+            clauses.append("error IS NULL")
+        query = "SELECT * FROM runs"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if limit:
+            # Newest `limit` rows, still returned oldest first
+            query = f"SELECT * FROM ({query} ORDER BY recorded_at DESC LIMIT {int(limit)}) ORDER BY recorded_at"
+        else:
+            query += " ORDER BY recorded_at"
+        with self._connect() as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        df["recorded_at"] = pd.to_datetime(df["recorded_at"], unit="s")
+        return df
+
+    def circuits(self):
+        """Known circuits with their run counts and last run time."""
+        import pandas as pd
+
+        with self._connect() as conn:
+            df = pd.read_sql_query(
+                "SELECT circuit_hash, MAX(num_qubits) AS num_qubits, COUNT(*) AS runs, "
+                "MAX(recorded_at) AS last_run FROM runs GROUP BY circuit_hash ORDER BY last_run DESC", conn
+            )
+        df["last_run"] = pd.to_datetime(df["last_run"], unit="s")
+        return df
+
+    def regressions(self, metric="total_latency", by="version", window=5, threshold=0.10, alpha=0.05,
+                    circuit_hash=None, backend=None, host=None):
+        """
+        Compares a candidate group of runs with a baseline group for every
+        (circuit, backend, host, options) series that has both:
+
+        - by="version": runs of the newest backend version vs the previous version
+        - by="time": the last `window` runs vs the `window` runs before them
+
+        A row is a regression when the candidate median is at least
+        `threshold` slower and the permutation p-value is below `alpha`.
+        """
+        import pandas as pd
+
+        df = self.load(circuit_hash=circuit_hash, backend=backend, host=host)
+        df = df[df[metric].notna()]
+        results = []
+        for (c_hash, name, run_host, options), series in df.groupby(["circuit_hash", "backend", "host", "options"]):
+            if by == "version":
+                versions = sorted(series["backend_version"].dropna().unique(), key=_version_key)
+                if len(versions) < 2:
+                    continue
+                base_label, cand_label = versions[-2], versions[-1]
+                base = series[series["backend_version"] == base_label][metric]
+                cand = series[series["backend_version"] == cand_label][metric]
+            elif by == "time":
+                if len(series) < 2 * window:
+                    continue
+                base = series[metric].iloc[-2 * window:-window]
+                cand = series[metric].iloc[-window:]
+                base_label = f"runs -{2 * window}..-{window + 1}"
+                cand_label = f"last {window} runs"
+            else:
+                raise ValueError(f"Unknown comparison '{by}' (use 'version' or 'time')")
+
+            base_median, cand_median = float(np.median(base)), float(np.median(cand))
+            change = cand_median / base_median - 1 if base_median > 0 else float("nan")
+            p_value = permutation_pvalue(base, cand)
+            results.append({
+                "circuit_hash": c_hash, "backend": name, "host": run_host, "options": options,
+                "baseline": base_label, "candidate": cand_label,
+                "n_baseline": len(base), "n_candidate": len(cand),
+                "baseline_median": base_median, "candidate_median": cand_median,
+                "change": change, "p_value": p_value,
+                "regression": bool(change >= threshold and p_value < alpha),
+            })
+
+        columns = ["circuit_hash", "backend", "host", "options", "baseline", "candidate", "n_baseline",
+                   "n_candidate", "baseline_median", "candidate_median", "change", "p_value", "regression"]
+        out = pd.DataFrame(results, columns=columns)
+        return out.sort_values(["regression", "change"], ascending=[False, False], ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions in the QBench history.")
+    parser.add_argument("--path", default=DEFAULT_HISTORY_PATH)
+    parser.add_argument("--metric", default="total_latency")
+    parser.add_argument("--by", choices=["version", "time"], default="version")
+    parser.add_argument("--window", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown, e.g. 0.1 = 10%%")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--backend", default=None)
+    args = parser.parse_args(argv)
+
+    report = HistoryStore(args.path).regressions(
+        args.metric, by=args.by, window=args.window, threshold=args.threshold, alpha=args.alpha,
+        backend=args.backend,
+    )
+    if report.empty:
+        print("Not enough history to compare yet.")
+        return 0
+    print(report.drop(columns=["options"]).to_string(index=False))
+    flagged = int(report["regression"].sum())
+    print(f"\n{flagged} regression(s) in {args.metric}")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Startup cost report: imports modules in a fresh interpreter with -X importtime
+and lists the slowest imports.
+
+    python -m app.importtime                  # report for app.runner
+    python -m app.importtime app.runner cirq --max-ms 1500
+"""
+import argparse
+import subprocess
+import sys
+
+
+def import_time_report(modules=("app.runner",), python=None):
+    """
+    Returns (total_ms, rows) where rows are dicts with module, self_ms and
+    cumulative_ms for every import triggered, slowest cumulative first.
+    """
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append({
+                "module": name.strip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+        except ValueError:
+            continue
+
+    total = sum(r["cumulative_ms"] for r in rows if r["module"] in modules)
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return total, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import (startup) time of QBench modules.")
+    parser.add_argument("modules", nargs="*", default=["app.runner"])
+    parser.add_argument("--top", type=int, default=20, help="number of slowest imports to list")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="exit with status 1 when the total exceeds this budget")
+    args = parser.parse_args(argv)
+
+    total, rows = import_time_report(args.modules)
+    print(f"{'cumulative ms':>14} {'self ms':>10}  module")
+    for row in rows[:args.top]:
+        print(f"{row['cumulative_ms']:>14.1f} {row['self_ms']:>10.1f}  {row['module']}")
+    print(f"\nTotal for {', '.join(args.modules)}: {total:.1f} ms")
+
+    if args.max_ms is not None and total > args.max_ms:
+        print(f"Import budget exceeded ({total:.1f} > {args.max_ms:.1f} ms)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import time
+
+from app.analysis import analyze_circuit
+from app.cache import circuit_hash
+
+MAX_DECOMPOSE_PASSES = 8
+
+
+def unroll(qc, supported):
+    """
+    Decomposes every instruction whose name is not in `supported` through its
+    Qiskit definition until only supported names remain. Raises instead of
+    dropping anything that has no definition to fall back on.
+    """
+    for _ in range(MAX_DECOMPOSE_PASSES):
+        unknown = {inst.operation.name for inst in qc.data} - set(supported)
+        if not unknown:
+            return qc
+        qc = qc.decompose(gates_to_decompose=sorted(unknown))
+    raise ValueError(f"Cannot express: {', '.join(sorted(unknown))}")
+
+
+class CircuitIR:
+    """
+    A QASM program parsed once per benchmark. The Qiskit circuit is the
+    shared representation: structural metrics and the routing profile are
+    computed a single time, and each runner lowers it to its own framework
+    (see app.cirq_convert, app.pennylane_convert). parse_time is reported
+    as a stage of its own, separate from every backend's compilation_time.
+    """
+
+    def __init__(self, qasm_code):
+        from qiskit import QuantumCircuit
+
+        t0 = time.perf_counter_ns()
+        self.qasm = qasm_code
+        self.hash = circuit_hash(qasm_code)
+        self.circuit = QuantumCircuit.from_qasm_str(qasm_code)
+        self.base = self.circuit.remove_final_measurements(inplace=False)
+        self.parse_started_ns = t0
+        self.parse_time = (time.perf_counter_ns() - t0) / 1e9
+
+        self.num_qubits = self.circuit.num_qubits
+        # Measured on the unitary part so every backend reports the same "pre" numbers
+        self.metrics = {
+            "num_qubits": self.num_qubits,
+            "pre_depth": self.base.depth(),
+            "pre_gate_count": sum(self.base.count_ops().values()),
+        }
+        self._profile = None
+
+    @property
+    def profile(self):
+        if self._profile is None:
+            self._profile = analyze_circuit(self.base)
+        return self._profile
+
+    def unitary(self):
+        """Fresh copy without final measurements; `base` is the shared read-only one."""
+        return self.base.copy()
+
+    def measured(self):
+        """Copy with one measurement per qubit, for sampling runs."""
+        qc = self.base.copy()
+        qc.measure_all()
+        return qc
+
+    def __repr__(self):
+        return f"CircuitIR({self.hash[:12]}, qubits={self.num_qubits}, depth={self.metrics['pre_depth']})"
+
+
+def as_ir(circuit):
+    """Accepts QASM text or an existing CircuitIR."""
+    return circuit if isinstance(circuit, CircuitIR) else CircuitIR(circuit)
@@ -0,0 +1,342 @@
+"""
+Version-matrix benchmarking: the same circuits through QBenchAnalyzer in one
+local virtualenv per framework version set, built offline from a wheel cache,
+collected into one table tagged by environment and compared against a
+baseline environment.
+
+    # matrix.json: {"qiskit-1.2": ["qiskit==1.2.4", "qiskit-aer==0.15.1"],
+    #               "qiskit-1.3": ["qiskit==1.3.1", "qiskit-aer==0.16.0"]}
+    python -m app.matrix fetch matrix.json              # once, online: fill the wheel cache
+    python -m app.matrix run matrix.json circuits/ --repeats 5 --output matrix.csv
+
+The first environment is the baseline unless --baseline names another.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from app.cache import DEFAULT_CACHE_DIR
+
+DEFAULT_ENV_ROOT = os.path.join(DEFAULT_CACHE_DIR, "envs")
+DEFAULT_WHEELHOUSE = os.path.join(DEFAULT_CACHE_DIR, "wheels")
+# What app.runner needs on top of the frameworks under test: every circuit is parsed
+# with Qiskit (app.ir), even for Cirq- or PennyLane-only specs. A spec that names one
+# of these packages (e.g. "qiskit==1.2.4") replaces the unpinned default
+BASE_REQUIREMENTS = ["numpy", "pandas", "qiskit"]
+ENV_MARKER = ".qbench-env"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ENV_TIMEOUT = 3600  # seconds for one environment's whole suite
+
+
+def load_matrix(path):
+    """Reads {env_name: [requirement, ...]} in file order."""
+    with open(path) as f:
+        matrix = json.load(f)
+    if not isinstance(matrix, dict) or not matrix:
+        raise ValueError(f"{path}: expected a non-empty {{name: [requirements]}} object")
+    return {name: list(reqs) for name, reqs in matrix.items()}
+
+
+def env_python(env_dir):
+    if os.name == "nt":
+        return os.path.join(env_dir, "Scripts", "python.exe")
+    return os.path.join(env_dir, "bin", "python")
+
+
+def _project_name(requirement):
+    return re.split(r"[\s<>=!~;\[@]", requirement.strip(), maxsplit=1)[0].lower().replace("_", "-")
+
+
+def _requirements(requirements):
+    named = {_project_name(r) for r in requirements}
+    return sorted(set(requirements) | {r for r in BASE_REQUIREMENTS if r not in named})
+
+
+def _spec_hash(requirements):
+    return hashlib.sha256(json.dumps(_requirements(requirements)).encode()).hexdigest()
+
+
+# --- ENVIRONMENTS ---
+def fetch_wheels(requirements, wheelhouse=DEFAULT_WHEELHOUSE, log=print):
+    """Downloads every wheel an environment needs (the only online step)."""
+    os.makedirs(wheelhouse, exist_ok=True)
+    log(f"Downloading {' '.join(_requirements(requirements))} into {wheelhouse}")
+    subprocess.run([sys.executable, "-m", "pip", "download", "--dest", wheelhouse, *_requirements(requirements)],
+                   check=True)
+
+
+def build_env(name, requirements, root=DEFAULT_ENV_ROOT, wheelhouse=DEFAULT_WHEELHOUSE, log=print):
+    """
+    Creates (or reuses) the virtualenv for one version set, installing only
+    from `wheelhouse` with no network access. An environment is rebuilt only
+    when its requirement list changed.
+    """
+    env_dir = os.path.join(root, name)
+    marker = os.path.join(env_dir, ENV_MARKER)
+    spec = _spec_hash(requirements)
+    try:
+        with open(marker) as f:
+            if f.read().strip() == spec:
+                return env_dir
+    except OSError:
+        pass
+
+    if os.path.isdir(env_dir):
+        shutil.rmtree(env_dir)
+    log(f"Building {name} in {env_dir}")
+    subprocess.run([sys.executable, "-m", "venv", env_dir], check=True)
+    subprocess.run(
+        [env_python(env_dir), "-m", "pip", "install", "--no-index", "--find-links", wheelhouse,
+         *_requirements(requirements)],
+        check=True,
+    )
+    with open(marker, "w") as f:
+        f.write(spec)
+    return env_dir
+
+
+# --- WORKER (runs inside each environment) ---
+def _worker(argv):
+    from app.backends import get_backend
+    from app.cache import framework_versions
+    from app.runner import QBenchAnalyzer
+
+    parser = argparse.ArgumentParser(prog="app.matrix worker")
+    parser.add_argument("circuits", nargs="+")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--backends", nargs="+", required=True)
+    parser.add_argument("--options", default="{}")
+    parser.add_argument("--no-history", action="store_true")
+    args = parser.parse_args(argv)
+
+    options = json.loads(args.options)
+    analyzer = QBenchAnalyzer(cache=False, history=not args.no_history)
+    versions = framework_versions()
+    with open(args.output, "w") as out:
+        for path in args.circuits:
+            with open(path) as f:
+                qasm_code = f.read()
+            df = analyzer.execute_benchmark(qasm_code, args.backends, use_cache=False, **options)
+            df = df.drop(columns=["probs"], errors="ignore")
+            df.insert(0, "source", path)
+            plugins = [get_backend(b) for b in df["backend"]]
+            df["backend_version"] = [versions.get(p.package) if p else None for p in plugins]
+            df["versions"] = json.dumps(versions, sort_keys=True)
+            out.write(df.to_json(orient="records", lines=True, default_handler=str).rstrip("\n") + "\n")
+            out.flush()
+    return 0
+
+
+# --- ORCHESTRATION ---
+def run_env(name, env_dir, paths, backends, benchmark_options=None, timeout=DEFAULT_ENV_TIMEOUT,
+            history=True):
+    """Runs the whole suite in one environment's interpreter. Returns its rows."""
+    import pandas as pd
+
+    fd, output = tempfile.mkstemp(prefix=f"qbench-{name}-", suffix=".jsonl")
+    os.close(fd)
+    cmd = [env_python(env_dir), "-m", "app.matrix", "worker", "--output", output,
+           "--backends", *backends, "--options", json.dumps(benchmark_options or {}), "--", *paths]
+    if not history:
+        cmd.insert(cmd.index("--"), "--no-history")
+    # Only this repository is added to the environment's own site-packages
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, PIP_NO_INDEX="1")
+    try:
+        try:
+            proc = subprocess.run(cmd, env=env, cwd=REPO_ROOT, capture_output=True, text=True, timeout=timeout)
+            error = None if proc.returncode == 0 else (proc.stderr.strip().splitlines() or ["exit code"])[-1]
+        except subprocess.TimeoutExpired:
+            error = f"Timeout: {name} did not finish in {timeout:.0f}s"
+        rows = pd.read_json(output, lines=True) if os.path.getsize(output) else pd.DataFrame()
+    finally:
+        os.remove(output)
+
+    if error:
+        # Circuits the worker never reached get one error row per backend
+        done = set(rows["source"]) if not rows.empty else set()
+        failed = pd.DataFrame([{"source": p, "backend": b, "error": f"{name}: {error}"}
+                               for p in paths if p not in done for b in backends])
+        rows = pd.concat([rows, failed], ignore_index=True)
+    rows.insert(0, "env", name)
+    return rows
+
+
+def run_matrix(matrix, paths, backends, benchmark_options=None, root=DEFAULT_ENV_ROOT,
+               wheelhouse=DEFAULT_WHEELHOUSE, timeout=DEFAULT_ENV_TIMEOUT, history=True, log=print):
+    """
+    One table with every environment's rows, tagged by `env`. Environments
+    run one after another so they never compete for the CPU.
+    """
+    import pandas as pd
+
+    frames = []
+    for name, requirements in matrix.items():
+        try:
+            env_dir = build_env(name, requirements, root, wheelhouse, log=log)
+        except subprocess.CalledProcessError as e:
+            log(f"{name}: build failed ({e}); is every wheel in {wheelhouse}?")
+            frames.append(pd.DataFrame([{"env": name, "source": p, "backend": b, "error": f"Build failed: {e}"}
+                                        for p in paths for b in backends]))
+            continue
+        log(f"{name}: benchmarking {len(paths)} circuits")
+        frames.append(run_env(name, env_dir, paths, backends, benchmark_options, timeout, history))
+    return pd.concat(frames, ignore_index=True)
+
+
+# --- REPORT ---
+def compare_envs(df, metric="total_latency", baseline=None, threshold=0.10):
+    """
+    Every other environment against the baseline, per (circuit, backend).
+    speedup > 1 is faster than the baseline. A change counts as significant
+    when the trial confidence intervals do not overlap (runs with repeats),
+    or on the threshold alone for single-shot runs.
+    """
+    import pandas as pd
+
+    columns = ["source", "backend", "baseline", "candidate", "baseline_version", "candidate_version",
+               "baseline_median", "candidate_median", "speedup", "change", "significant",
+               "regression", "improvement"]
+    envs = list(dict.fromkeys(df["env"]))
+    if metric not in df.columns:
+        return pd.DataFrame(columns=columns)
+    ok = df[df["error"].isna() & df[metric].notna()] if "error" in df.columns else df[df[metric].notna()]
+    baseline = baseline or envs[0]
+    if baseline not in envs:
+        raise ValueError(f"Unknown baseline environment '{baseline}'")
+
+    ci_low, ci_high = f"{metric}_ci_low", f"{metric}_ci_high"
+    has_ci = ci_low in ok.columns and ci_high in ok.columns
+    base = ok[ok["env"] == baseline].set_index(["source", "backend"])
+    results = []
+    for env in envs:
+        if env == baseline:
+            continue
+        cand = ok[ok["env"] == env].set_index(["source", "backend"])
+        for key in base.index.intersection(cand.index):
+            b, c = base.loc[key], cand.loc[key]
+            if isinstance(b, pd.DataFrame): b = b.iloc[-1]
+            if isinstance(c, pd.DataFrame): c = c.iloc[-1]
+            change = c[metric] / b[metric] - 1 if b[metric] > 0 else float("nan")
+            significant = True
+            if has_ci and pd.notna(b[ci_low]) and pd.notna(c[ci_low]):
+                significant = bool(c[ci_low] > b[ci_high] or c[ci_high] < b[ci_low])
+            results.append({
+                "source": key[0], "backend": key[1], "baseline": baseline, "candidate": env,
+                "baseline_version": b.get("backend_version"), "candidate_version": c.get("backend_version"),
+                "baseline_median": b[metric], "candidate_median": c[metric],
+                "speedup": b[metric] / c[metric] if c[metric] > 0 else float("nan"),
+                "change": change, "significant": significant,
+                "regression": bool(significant and change >= threshold),
+                "improvement": bool(significant and change <= -threshold),
+            })
+    return pd.DataFrame(results, columns=columns)
+
+
+def summarize_speedups(report):
+    """Geometric-mean speedup per (candidate environment, backend) over all circuits."""
+    import numpy as np
+
+    ok = report[report["speedup"] > 0]
+    if ok.empty:
+        return ok
+    return (ok.groupby(["candidate", "backend"])
+              .agg(circuits=("speedup", "size"),
+                   geomean_speedup=("speedup", lambda s: float(np.exp(np.log(s).mean()))),
+                   regressions=("regression", "sum"), improvements=("improvement", "sum"))
+              .reset_index())
+
+
+def _write_table(df, path):
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    elif path.endswith(".jsonl"):
+        df.to_json(path, orient="records", lines=True, default_handler=str)
+    else:
+        df.to_csv(path, index=False)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["worker"]:
+        return _worker(argv[1:])
+
+    from app.admission import PRECISIONS
+    from app.analysis import SIM_METHODS
+    from app.cli import find_circuits
+    from app.runner import SIMULATOR_BACKENDS
+
+    parser = argparse.ArgumentParser(description="Benchmark circuits across framework versions, one venv each.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fetch = sub.add_parser("fetch", help="download every wheel the matrix needs (online, once)")
+    fetch.add_argument("matrix")
+    fetch.add_argument("--wheelhouse", default=DEFAULT_WHEELHOUSE)
+
+    build = sub.add_parser("build", help="build the environments offline from the wheel cache")
+    build.add_argument("matrix")
+    build.add_argument("--wheelhouse", default=DEFAULT_WHEELHOUSE)
+    build.add_argument("--root", default=DEFAULT_ENV_ROOT)
+
+    run = sub.add_parser("run", help="build missing environments, benchmark, compare")
+    run.add_argument("matrix")
+    run.add_argument("inputs", nargs="+", help="QASM files, directories or glob patterns")
+    run.add_argument("--wheelhouse", default=DEFAULT_WHEELHOUSE)
+    run.add_argument("--root", default=DEFAULT_ENV_ROOT)
+    run.add_argument("-b", "--backends", nargs="+", default=SIMULATOR_BACKENDS)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--repeats", type=int, default=5)
+    run.add_argument("--shots", type=int, default=None)
+    run.add_argument("--method", choices=["auto"] + SIM_METHODS, default="auto")
+    run.add_argument("--precision", choices=PRECISIONS, default="double")
+    run.add_argument("--timeout", type=float, default=DEFAULT_ENV_TIMEOUT, help="seconds per environment")
+    run.add_argument("--metric", default="total_latency")
+    run.add_argument("--baseline", default=None, help="environment to compare against (default: the first)")
+    run.add_argument("--threshold", type=float, default=0.10, help="relative change, e.g. 0.1 = 10%%")
+    run.add_argument("-o", "--output", default="qbench_matrix.csv", help="tagged table (.csv, .jsonl, .parquet)")
+    run.add_argument("--report", default=None, help="per-circuit comparison table (.csv)")
+    run.add_argument("--no-history", action="store_true", help="do not record the runs in the benchmark history")
+    args = parser.parse_args(argv)
+
+    matrix = load_matrix(args.matrix)
+    log = lambda msg: print(msg, file=sys.stderr)
+    if args.command == "fetch":
+        for requirements in matrix.values():
+            fetch_wheels(requirements, args.wheelhouse, log=log)
+        return 0
+    if args.command == "build":
+        for name, requirements in matrix.items():
+            build_env(name, requirements, args.root, args.wheelhouse, log=log)
+        return 0
+
+    paths = [os.path.abspath(p) for p in find_circuits(args.inputs)]
+    if not paths:
+        print("No QASM files matched.", file=sys.stderr)
+        return 2
+    options = {"warmup": args.warmup, "repeats": args.repeats, "shots": args.shots,
+               "method": args.method, "precision": args.precision}
+    df = run_matrix(matrix, paths, args.backends, options, args.root, args.wheelhouse, args.timeout,
+                    history=not args.no_history, log=log)
+    _write_table(df, args.output)
+
+    report = compare_envs(df, args.metric, baseline=args.baseline, threshold=args.threshold)
+    if args.report:
+        report.to_csv(args.report, index=False)
+    if report.empty:
+        print("Nothing to compare: no circuit succeeded in two environments.")
+        return 1
+    print(summarize_speedups(report).to_string(index=False))
+    flagged = report[report["regression"]]
+    if not flagged.empty:
+        print(f"\n{len(flagged)} regression(s) in {args.metric}:")
+        print(flagged.drop(columns=["baseline"]).to_string(index=False))
+    return 1 if len(flagged) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
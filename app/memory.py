@@ -0,0 +1,173 @@
+import sys
+import threading
+import tracemalloc
+
+MB = 1024 ** 2
+# Columns MemoryProbe.stop() reports
+MEMORY_COLUMNS = ["python_heap_mb", "native_mb", "peak_rss_mb", "delta_rss_mb", "memory_mb", "memory_probe"]
+
+
+# --- RSS READERS ---
+def _read_status_kb(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def current_rss():
+    """Resident set size of this process in bytes, or None if unavailable."""
+    rss = _read_status_kb("VmRSS")
+    if rss is not None:
+        return rss
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def peak_rss():
+    """High-water mark of the resident set size in bytes, or None."""
+    hwm = _read_status_kb("VmHWM")
+    if hwm is not None:
+        return hwm
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+
+def _read_int(path):
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+        return None if value == "max" else int(value)
+    except (OSError, ValueError):
+        return None
+
+
+def available_memory():
+    """
+    Bytes a new allocation can get without swapping: MemAvailable, capped by
+    the cgroup v2 limit inside containers. None if unknown.
+    """
+    available = None
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        pass
+    if available is None:
+        try:
+            import psutil
+            available = psutil.virtual_memory().available
+        except Exception:
+            return None
+    limit = _read_int("/sys/fs/cgroup/memory.max")
+    if limit is not None:
+        used = _read_int("/sys/fs/cgroup/memory.current") or 0
+        available = min(available, max(limit - used, 0))
+    return available
+
+
+def reset_peak_rss():
+    """Resets VmHWM to the current RSS (Linux >= 4.0). Returns True on success."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class MemoryProbe:
+    """
+    Measures one backend run: Python-heap peak via tracemalloc and whole-process
+    peak RSS, which also sees native buffers (Aer's C++ statevector, NumPy, BLAS).
+
+    The RSS peak comes from the kernel high-water mark when it can be reset,
+    and from a background sampler otherwise. Inside a fresh worker process
+    (execute_benchmark(parallel=True)) the baseline is not polluted by earlier
+    runs, so the numbers are the most trustworthy there.
+    """
+
+    def __init__(self, interval=0.002, trace_python=True):
+        self.interval = interval
+        self.trace_python = trace_python
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._owns_tracer = False
+        self._result = None
+
+    def start(self):
+        self.baseline_rss = current_rss()
+        self.hwm_reset = reset_peak_rss()
+        self.sampled_peak = self.baseline_rss or 0
+        self._owns_tracer = self.trace_python and not tracemalloc.is_tracing()
+        if self._owns_tracer:
+            tracemalloc.start()
+        if self.baseline_rss is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop_event.wait(self.interval):
+            rss = current_rss()
+            if rss and rss > self.sampled_peak:
+                self.sampled_peak = rss
+
+    def stop(self):
+        """Stops the probe and returns the memory columns (idempotent)."""
+        if self._result is not None:
+            return self._result
+
+        heap_peak = 0
+        if self._owns_tracer and tracemalloc.is_tracing():
+            _, heap_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+        final = current_rss()
+        if final and final > self.sampled_peak:
+            self.sampled_peak = final
+
+        if self.baseline_rss is None:
+            source, peak = "unavailable", None
+        elif self.hwm_reset and peak_rss() is not None:
+            source, peak = "vmhwm", max(peak_rss(), self.sampled_peak)
+        else:
+            source, peak = "sampled", self.sampled_peak
+
+        delta = max(peak - self.baseline_rss, 0) if peak is not None else 0
+        self._result = {
+            "python_heap_mb": heap_peak / MB,
+            "native_mb": max(delta - heap_peak, 0) / MB,
+            "peak_rss_mb": (peak or 0) / MB,
+            "delta_rss_mb": delta / MB,
+            # Headline figure: everything the run added, Python or native
+            "memory_mb": max(delta, heap_peak) / MB,
+            "memory_probe": source,
+        }
+        return self._result
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
@@ -0,0 +1,154 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from app.ir import unroll
+
+# Opt-in workaround for Windows installs where lightning's DLLs fail to load
+SAFE_IMPORT_ENV = "QBENCH_PENNYLANE_SAFE_IMPORT"
+PENNYLANE_DEVICES = ["auto", "lightning.qubit", "default.qubit"]
+# Instructions with no effect on the simulated state
+SKIPPED = {"barrier", "delay"}
+# Collapse the state mid-circuit (final measurements were already stripped by
+# the IR); the replayed-operation path has no equivalent, so they raise
+MID_CIRCUIT = {"measure", "reset"}
+
+
+def safe_import_enabled():
+    return os.environ.get(SAFE_IMPORT_ENV, "").lower() in ("1", "true", "yes")
+
+
+def disable_lightning():
+    # Importing pennylane then skips the compiled lightning plugins entirely
+    sys.modules['pennylane_lightning'] = None
+    sys.modules['pennylane_lightning.qubit'] = None
+    sys.modules['controller_wrappers'] = None
+
+
+def load_pennylane():
+    if safe_import_enabled():
+        disable_lightning()
+    import pennylane
+    return pennylane
+
+
+def make_device(qml, name, wires, shots=None, precision="double", options=None):
+    """
+    Returns (device, device_name). "auto" benchmarks lightning.qubit where it
+    loads (Linux wheels) and falls back to the pure-Python default.qubit.
+    Single precision (complex64) is a lightning.qubit option only; `options`
+    are extra device keyword arguments.
+    """
+    options = options or {}
+    if name in (None, "auto"):
+        if not safe_import_enabled():
+            try:
+                return _lightning(qml, wires, shots, precision, options), "lightning.qubit"
+            except Exception:
+                pass
+        name = "default.qubit"
+    if name == "lightning.qubit":
+        return _lightning(qml, wires, shots, precision, options), name
+    if precision != "double":
+        raise ValueError(f"Single precision needs lightning.qubit, not {name}")
+    return qml.device(name, wires=wires, shots=shots, **options), name
+
+
+def _lightning(qml, wires, shots, precision, options):
+    import numpy as np
+
+    c_dtype = np.complex64 if precision == "single" else np.complex128
+    return qml.device("lightning.qubit", wires=wires, shots=shots, c_dtype=c_dtype, **options)
+
+
+def _gate_table(qml):
+    # Qiskit name -> builder(params, wires); conventions match qiskit's matrices
+    adj = qml.adjoint
+    return {
+        "id": lambda p, w: qml.Identity(wires=w),
+        "h": lambda p, w: qml.Hadamard(wires=w),
+        "x": lambda p, w: qml.PauliX(wires=w),
+        "y": lambda p, w: qml.PauliY(wires=w),
+        "z": lambda p, w: qml.PauliZ(wires=w),
+        "s": lambda p, w: qml.S(wires=w),
+        "sdg": lambda p, w: adj(qml.S(wires=w)),
+        "t": lambda p, w: qml.T(wires=w),
+        "tdg": lambda p, w: adj(qml.T(wires=w)),
+        "sx": lambda p, w: qml.SX(wires=w),
+        "sxdg": lambda p, w: adj(qml.SX(wires=w)),
+        "rx": lambda p, w: qml.RX(p[0], wires=w),
+        "ry": lambda p, w: qml.RY(p[0], wires=w),
+        "rz": lambda p, w: qml.RZ(p[0], wires=w),
+        "p": lambda p, w: qml.PhaseShift(p[0], wires=w),
+        "u1": lambda p, w: qml.PhaseShift(p[0], wires=w),
+        "u2": lambda p, w: qml.U2(p[0], p[1], wires=w),
+        "u3": lambda p, w: qml.U3(p[0], p[1], p[2], wires=w),
+        "u": lambda p, w: qml.U3(p[0], p[1], p[2], wires=w),
+        "cx": lambda p, w: qml.CNOT(wires=w),
+        "cy": lambda p, w: qml.CY(wires=w),
+        "cz": lambda p, w: qml.CZ(wires=w),
+        "ch": lambda p, w: qml.CH(wires=w),
+        "swap": lambda p, w: qml.SWAP(wires=w),
+        "iswap": lambda p, w: qml.ISWAP(wires=w),
+        "cp": lambda p, w: qml.ControlledPhaseShift(p[0], wires=w),
+        "cu1": lambda p, w: qml.ControlledPhaseShift(p[0], wires=w),
+        "crx": lambda p, w: qml.CRX(p[0], wires=w),
+        "cry": lambda p, w: qml.CRY(p[0], wires=w),
+        "crz": lambda p, w: qml.CRZ(p[0], wires=w),
+        "rxx": lambda p, w: qml.IsingXX(p[0], wires=w),
+        "ryy": lambda p, w: qml.IsingYY(p[0], wires=w),
+        "rzz": lambda p, w: qml.IsingZZ(p[0], wires=w),
+        "ccx": lambda p, w: qml.Toffoli(wires=w),
+        "cswap": lambda p, w: qml.CSWAP(wires=w),
+    }
+
+
+class PennyLaneConverter:
+    """
+    Lowers a Qiskit circuit to a list of PennyLane operations once per
+    circuit key; QNodes replay the list with qml.apply instead of walking the
+    circuit on every execution. Gates missing from the table are unrolled
+    through their Qiskit definitions, and anything that still cannot be
+    expressed raises instead of being dropped.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        # Shared by every session of a cached analyzer
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._table = None
+
+    def _lower(self, qml, qc):
+        if self._table is None:
+            self._table = _gate_table(qml)
+
+        collapsing = {inst.operation.name for inst in qc.data} & MID_CIRCUIT
+        if collapsing:
+            raise ValueError(f"Cannot express mid-circuit: {', '.join(sorted(collapsing))}")
+        qc = unroll(qc, set(self._table) | SKIPPED)
+        wire = {q: i for i, q in enumerate(qc.qubits)}
+        ops = []
+        for inst in qc.data:
+            name = inst.operation.name
+            if name in SKIPPED:
+                continue
+            params = [float(p) for p in inst.operation.params]
+            ops.append(self._table[name](params, [wire[q] for q in inst.qubits]))
+        return ops
+
+    def convert(self, qml, qc, circuit_key):
+        """Returns (operations, "cached" | "cold")."""
+        with self._lock:
+            if circuit_key in self._memory:
+                self._memory.move_to_end(circuit_key)
+                return self._memory[circuit_key], "cached"
+
+        # Built outside any QNode, so the operations are not queued anywhere yet
+        ops = self._lower(qml, qc)
+        with self._lock:
+            self._memory[circuit_key] = ops
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return ops, "cold"
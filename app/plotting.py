@@ -0,0 +1,166 @@
+import numpy as np
+
+DASHBOARD_METRICS = {
+    "Accuracy & Reliability": ["fidelity", "success_probability"],
+    "Time & Latency (Log Scale)": ["parse_time", "execution_time", "compilation_time", "total_latency"],
+    "Computational Resources": ["memory_mb", "python_heap_mb", "native_mb", "throughput_shots_sec"],
+    "Compiler Efficiency": ["swap_overhead", "optimization_ratio", "post_depth"]
+}
+# Group keys used by aggregate_results when present in the frame
+AGGREGATE_KEYS = ["backend", "type", "family", "circuit_hash", "num_qubits"]
+AGGREGATE_COLUMNS = ["metric", "count", "median", "mean", "err_low", "err_high"]
+MAX_PLOT_POINTS = 500
+
+
+# --- AGGREGATION ---
+def aggregate_results(df, by=None, metrics=None):
+    """
+    Long-form summary with one row per group and metric: count, median, mean
+    and err_low/err_high error bars. Error bars span the interquartile range
+    when a group has several rows, and the trial engine's bootstrap CI
+    (<metric>_ci_low/_ci_high) when it has a single one. Groups default to
+    whichever of AGGREGATE_KEYS exist; rows with an error are left out.
+    """
+    import pandas as pd
+
+    by = [k for k in (by or AGGREGATE_KEYS) if k in df.columns]
+    if metrics is None:
+        metrics = [m for group in DASHBOARD_METRICS.values() for m in group]
+    metrics = [m for m in metrics if m in df.columns]
+    if not by or not metrics or df.empty:
+        return pd.DataFrame(columns=by + AGGREGATE_COLUMNS)
+
+    ok = df[df["error"].isna()] if "error" in df.columns else df
+    long = ok.melt(id_vars=by, value_vars=metrics, var_name="metric", value_name="value")
+    long["value"] = pd.to_numeric(long["value"], errors="coerce")
+    long = long.dropna(subset=["value"])
+    keys = by + ["metric"]
+    grouped = long.groupby(keys, dropna=False)["value"]
+    agg = grouped.agg(["count", "median", "mean"])
+    agg["err_low"] = grouped.quantile(0.25)
+    agg["err_high"] = grouped.quantile(0.75)
+    agg = agg.reset_index()
+
+    ci_metrics = [m for m in metrics if f"{m}_ci_low" in ok.columns and f"{m}_ci_high" in ok.columns]
+    if ci_metrics and not agg.empty:
+        bounds = {}
+        for side in ("low", "high"):
+            part = ok.melt(id_vars=by, value_vars=[f"{m}_ci_{side}" for m in ci_metrics],
+                           var_name="metric", value_name=f"ci_{side}")
+            part["metric"] = part["metric"].str[:-len(f"_ci_{side}")]
+            part[f"ci_{side}"] = pd.to_numeric(part[f"ci_{side}"], errors="coerce")
+            bounds[side] = part.groupby(keys, dropna=False)[f"ci_{side}"].median()
+        ci = pd.concat(bounds.values(), axis=1).reset_index()
+        agg = agg.merge(ci, on=keys, how="left")
+        single = (agg["count"] == 1) & agg["ci_low"].notna() & agg["ci_high"].notna()
+        agg.loc[single, "err_low"] = agg.loc[single, "ci_low"]
+        agg.loc[single, "err_high"] = agg.loc[single, "ci_high"]
+        agg = agg.drop(columns=["ci_low", "ci_high"])
+    return agg
+
+
+def chart_frame(agg, metric, index="backend", columns=None):
+    """Wide medians of one metric (index x columns) for st.bar_chart / st.line_chart."""
+    sub = agg[agg["metric"] == metric]
+    if columns is None:
+        return sub.groupby(index)["median"].median().to_frame(metric)
+    return sub.pivot_table(index=index, columns=columns, values="median", aggfunc="median")
+
+
+def resource_matrix(df, metrics=("memory_mb", "total_latency", "fidelity"), by="backend"):
+    """Backend x metric medians: the aggregated input of the resource heatmap."""
+    agg = aggregate_results(df, by=[by], metrics=list(metrics))
+    if agg.empty:
+        return None
+    matrix = agg.pivot_table(index=by, columns="metric", values="median")
+    return matrix[[m for m in metrics if m in matrix.columns]]
+
+
+def downsample(frame, max_points=MAX_PLOT_POINTS):
+    """
+    Wide chart data (index = x axis) reduced to at most max_points rows:
+    consecutive rows are bucketed, values become the bucket median and the
+    index keeps each bucket's first label.
+    """
+    if len(frame) <= max_points:
+        return frame
+    frame = frame.sort_index()
+    buckets = np.arange(len(frame)) * max_points // len(frame)
+    out = frame.groupby(buckets).median(numeric_only=True)
+    out.index = frame.index[np.searchsorted(buckets, out.index)]
+    return out
+
+
+# --- PLOTTING FUNCTION ---
+def plot_master_dashboard(df, by=("backend", "type")):
+    """
+    One bar per backend and metric, drawn from aggregate_results: medians
+    with error bars, so hundreds of sweep or history rows stay one bar each.
+    """
+    # Deferred so importing the analyzer never pays for matplotlib/seaborn
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_theme(style="whitegrid")
+
+    agg = aggregate_results(df, by=list(by))
+    if agg.empty:
+        return None
+
+    # Filter for existing columns
+    valid_groups = {}
+    for group, metrics in DASHBOARD_METRICS.items():
+        valid_metrics = [m for m in metrics if m in set(agg["metric"])]
+        if valid_metrics:
+            valid_groups[group] = valid_metrics
+
+    total_plots = sum(len(v) for v in valid_groups.values())
+    if total_plots == 0: return None
+
+    rows = (total_plots + 2) // 3
+    fig, axes = plt.subplots(rows, 3, figsize=(20, 5 * rows), squeeze=False)
+    fig.suptitle('🏆 QBench: Ultimate Parameter Comparison', fontsize=24, y=1.02)
+
+    ax_flat = axes.flatten()
+    plot_idx = 0
+    hue = "type" if "type" in agg.columns else None
+    hues = sorted(agg[hue].dropna().unique()) if hue else [None]
+    colors = dict(zip(hues, sns.color_palette("viridis", max(len(hues), 1))))
+
+    for group_name, metrics in valid_groups.items():
+        for metric in metrics:
+            ax = ax_flat[plot_idx]
+            sub = agg[agg["metric"] == metric].reset_index(drop=True)
+
+            # Plot: medians with asymmetric error bars
+            x = np.arange(len(sub))
+            yerr = np.vstack([
+                (sub["median"] - sub["err_low"]).clip(lower=0),
+                (sub["err_high"] - sub["median"]).clip(lower=0),
+            ])
+            bar_colors = [colors.get(t, "grey") for t in sub[hue]] if hue else None
+            ax.bar(x, sub["median"], yerr=yerr, capsize=4, color=bar_colors, edgecolor="black")
+            if hue:
+                handles = [plt.Rectangle((0, 0), 1, 1, color=colors[t]) for t in hues if t in set(sub[hue])]
+                ax.legend(handles, [t for t in hues if t in set(sub[hue])], loc='upper right', fontsize='x-small')
+
+            # Formatting
+            ax.set_title(metric.replace("_", " ").title(), fontsize=14, fontweight='bold')
+            ax.set_xlabel("")
+            ax.set_ylabel("")
+            ax.set_xticks(x)
+            ax.set_xticklabels(sub["backend"], rotation=45, ha='right')
+
+            if metric in ["fidelity", "success_probability"]:
+                ax.set_ylim(0, 1.1)
+            if ("time" in metric or "latency" in metric) and (sub["median"] > 0).any():
+                ax.set_yscale("log")
+                ax.set_ylabel("Seconds (Log)")
+
+            plot_idx += 1
+
+    for i in range(plot_idx, len(ax_flat)):
+        fig.delaxes(ax_flat[i])
+
+    plt.tight_layout()
+    return fig
@@ -0,0 +1,106 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+
+from app.cache import DEFAULT_CACHE_DIR
+
+DEFAULT_PROFILE_DIR = os.path.join(DEFAULT_CACHE_DIR, "profiles")
+STAGE_PREFIX = "stage_"
+
+
+class StageTimer:
+    """
+    Back-to-back named spans for one runner call: lap("transpile") ends the
+    current stage and starts the next, stop() ends the last one. Spans are
+    kept as plain dicts so they survive the trip back from worker processes.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._current = None
+
+    def lap(self, name, **args):
+        now = time.perf_counter_ns()
+        self._close(now)
+        self._current = (name, now, args)
+
+    def stop(self):
+        self._close(time.perf_counter_ns())
+
+    def add(self, name, start_ns, dur_ns, **args):
+        """Records a span measured elsewhere (e.g. the shared IR parse)."""
+        self.events.append({"name": name, "start_ns": start_ns, "dur_ns": dur_ns, "args": args})
+
+    def _close(self, now):
+        if self._current is not None:
+            name, start, args = self._current
+            self.add(name, start, now - start, **args)
+            self._current = None
+
+    def columns(self):
+        """Per-stage seconds, summed when a stage repeats: {"stage_transpile": 0.12, ...}."""
+        totals = {}
+        for event in self.events:
+            key = STAGE_PREFIX + event["name"]
+            totals[key] = totals.get(key, 0.0) + event["dur_ns"] / 1e9
+        return totals
+
+
+def profile_call(fn, label, directory=DEFAULT_PROFILE_DIR, top=15):
+    """
+    Runs fn() under cProfile. Returns (result, info) where info holds the
+    saved .prof path (open with snakeviz or pstats) and the slowest functions
+    by cumulative time as text.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = fn()
+    finally:
+        profiler.disable()
+
+    info = {}
+    try:
+        os.makedirs(directory, exist_ok=True)
+        safe = "".join(c if c.isalnum() else "_" for c in label)
+        path = os.path.join(directory, f"{safe}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        profiler.dump_stats(path)
+        info["cprofile_path"] = path
+    except OSError as e:
+        print(f"Profile not saved: {e}")
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+    info["cprofile_top"] = out.getvalue()
+    return result, info
+
+
+def chrome_trace(rows):
+    """
+    Chrome trace / Perfetto JSON (chrome://tracing, ui.perfetto.dev) from
+    result rows carrying "spans": one track per backend, stages as slices.
+    """
+    events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "QBench"}}]
+    for tid, row in enumerate(rows, start=1):
+        spans = row.get("spans") or []
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                       "args": {"name": str(row.get("backend"))}})
+        for span in spans:
+            events.append({
+                "name": span["name"], "cat": "stage", "ph": "X", "pid": 1, "tid": tid,
+                "ts": span["start_ns"] / 1000, "dur": span["dur_ns"] / 1000,
+                "args": span.get("args", {}),
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(trace, path):
+    """Writes a trace built by chrome_trace()."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(trace, f)
+    return path
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from app.cache import DEFAULT_CACHE_DIR, framework_versions
+from app.ir import as_ir
+from app.memory import MB
+from app.results import ProbabilityResult
+
+# States held in memory at once, in bytes: one 24-qubit complex128 state
+DEFAULT_MAX_BYTES = 256 * MB
+# Size of the .npy directory, in MB: four 24-qubit complex128 states
+DEFAULT_MAX_DISK_MB = 1024
+
+
+def state_fidelity(psi, phi):
+    """|<psi|phi>|^2 of two statevectors in the same qubit order (global phase drops out)."""
+    psi = np.asarray(psi).ravel()
+    phi = np.asarray(phi).ravel()
+    if psi.shape != phi.shape:
+        return None
+    norm = np.vdot(psi, psi).real * np.vdot(phi, phi).real
+    if norm <= 0:
+        return 0.0
+    return float(abs(np.vdot(psi, phi)) ** 2 / norm)
+
+
+class ReferenceStates:
+    """
+    Ideal statevector of each circuit, computed once with
+    qiskit.quantum_info.Statevector (little-endian: qubit i is bit i of the
+    index) and shared by every backend comparison, whichever backends ran.
+
+    An in-process LRU dict (bounded by entries and bytes) sits in front of
+    .npy files on disk so worker processes and later sessions reuse the same
+    reference. Like ResultCache, loads refresh the file mtime and the
+    directory is trimmed least recently used first once it grows past
+    max_disk_mb. Circuits that are too wide or not unitary (mid-circuit
+    measurement, reset) have no reference; comparisons then return None.
+    """
+
+    def __init__(self, directory=None, max_entries=8, max_qubits=24, max_bytes=DEFAULT_MAX_BYTES,
+                 max_disk_mb=DEFAULT_MAX_DISK_MB):
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, "reference")
+        self.max_entries = max_entries
+        self.max_qubits = max_qubits
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = int(max_disk_mb * MB)
+        # Shared by every session of a cached analyzer
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError:
+            self.directory = None
+
+    def key(self, ir):
+        payload = {"circuit": ir.hash, "qiskit": framework_versions().get("qiskit")}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _remember(self, key, state):
+        with self._lock:
+            # A state larger than the whole byte bound is re-read from disk instead
+            if state is not None and state.nbytes > self.max_bytes:
+                self._memory.pop(key, None)
+                return
+            self._memory[key] = state
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries or self._nbytes() > self.max_bytes:
+                self._memory.popitem(last=False)
+
+    def _nbytes(self):
+        return sum(state.nbytes for state in self._memory.values() if state is not None)
+
+    def has(self, circuit):
+        """True when the reference (or a remembered miss) needs no computation."""
+        key = self.key(as_ir(circuit))
+        return key in self._memory or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def skip(self, circuit):
+        """Remembers `circuit` as having no reference, so it is never computed here."""
+        self._remember(self.key(as_ir(circuit)), None)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            # Memory-mapped: pages come from the file instead of a private copy per process
+            state = np.load(path, mmap_mode="r")
+            os.utime(path)
+            return state
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key, state):
+        if not self.directory or state.nbytes > self.max_disk_bytes:
+            return
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".npy.tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, state)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"Reference cache write failed: {e}")
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            return
+        self.evict()
+
+    def evict(self):
+        """Removes least recently used .npy files until the directory fits max_disk_mb."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npy"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                # Open memory maps keep their pages; the next load recomputes
+                os.remove(os.path.join(self.directory, name))
+                total -= size
+            except OSError:
+                pass
+
+    def _compute(self, ir):
+        from qiskit.quantum_info import Statevector
+
+        if ir.num_qubits > self.max_qubits:
+            return None
+        if any(inst.operation.name in ("measure", "reset") for inst in ir.base.data):
+            return None
+        return np.ascontiguousarray(Statevector(ir.base).data)
+
+    def statevector(self, circuit):
+        """Ideal statevector in canonical (little-endian) order, or None. Takes QASM or a CircuitIR."""
+        try:
+            ir = as_ir(circuit)
+        except Exception as e:
+            print(f"Reference state unavailable: {e}")
+            return None
+        key = self.key(ir)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        state = self._load(key)
+        if state is None:
+            try:
+                state = self._compute(ir)
+            except Exception as e:
+                print(f"Reference state unavailable: {e}")
+                state = None
+            if state is not None:
+                self._save(key, state)
+        # Misses are remembered too, so unsupported circuits are not re-parsed per backend
+        self._remember(key, state)
+        return state
+
+    def probabilities(self, circuit):
+        state = self.statevector(circuit)
+        return None if state is None else ProbabilityResult.from_statevector(state)
+
+    def state_fidelity(self, circuit, statevector):
+        """Fidelity of a canonical-order statevector against the ideal one."""
+        reference = self.statevector(circuit)
+        if reference is None:
+            return None
+        return state_fidelity(reference, statevector)
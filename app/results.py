@@ -0,0 +1,184 @@
+import numpy as np
+
+# Above this many qubits basis-state indices no longer fit in int64
+MAX_INT_INDEX_QUBITS = 62
+
+
+def to_little_endian(statevector):
+    """
+    Reorders a big-endian statevector (Cirq, PennyLane: qubit 0 is the most
+    significant bit) into Qiskit's order, where qubit i is bit i of the index.
+    """
+    sv = np.asarray(statevector).ravel()
+    n = max(len(sv).bit_length() - 1, 0)
+    if n < 2:
+        return sv
+    return sv.reshape((2,) * n).transpose(range(n - 1, -1, -1)).ravel()
+
+
+class ProbabilityResult:
+    """
+    Measurement distribution over computational basis states.
+
+    Dense results keep one probability per basis state (index == state).
+    Sparse results keep only the non-negligible states in `indices`, sorted,
+    with the matching probabilities in `probs`. Bitstrings are only built
+    when asked for.
+    """
+
+    def __init__(self, probs, num_qubits, indices=None):
+        self.probs = np.asarray(probs, dtype=np.float64)
+        self.num_qubits = int(num_qubits)
+        self.indices = indices
+
+    # --- CONSTRUCTORS ---
+    @classmethod
+    def from_statevector(cls, statevector, cutoff=1e-9):
+        sv = np.asarray(statevector).ravel()
+        probs = sv.real ** 2 + sv.imag ** 2
+        n = max(len(probs).bit_length() - 1, 0)
+
+        # Keep the compact form when most of the space is empty (GHZ, basis states...)
+        support = np.flatnonzero(probs > cutoff)
+        if 2 * len(support) < len(probs):
+            return cls(probs[support], n, support.astype(np.int64))
+        return cls(probs, n)
+
+    @classmethod
+    def from_counts(cls, counts, num_qubits=None):
+        if not counts:
+            return cls(np.zeros(0), num_qubits or 0, np.zeros(0, dtype=np.int64))
+
+        # Multi-register keys come back space separated ("01 10")
+        keys = [k.replace(" ", "") for k in counts]
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(keys))
+        n = num_qubits or max(len(k) for k in keys)
+
+        if n <= MAX_INT_INDEX_QUBITS:
+            indices = np.fromiter((int(k, 2) for k in keys), dtype=np.int64, count=len(keys))
+        else:
+            indices = np.array([int(k, 2) for k in keys], dtype=object)
+
+        # Sorts the states and merges duplicates left by the key normalisation
+        indices, inverse = np.unique(indices, return_inverse=True)
+        values = np.bincount(inverse.ravel(), weights=values, minlength=len(indices))
+
+        total = values.sum()
+        if total > 0:
+            values = values / total
+        return cls(values, n, indices)
+
+    @classmethod
+    def from_samples(cls, indices, num_qubits):
+        """Sampled distribution from one basis-state index per shot."""
+        dtype = np.int64 if num_qubits <= MAX_INT_INDEX_QUBITS else object
+        indices, counts = np.unique(np.asarray(indices, dtype=dtype), return_counts=True)
+        total = counts.sum()
+        return cls(counts / total if total else counts.astype(np.float64), num_qubits, indices)
+
+    @classmethod
+    def from_bit_matrix(cls, bits):
+        """
+        Sampled distribution from a (shots, n) 0/1 matrix whose column i is
+        qubit i, using Qiskit's convention that qubit i is bit i of the index.
+        """
+        bits = np.asarray(bits, dtype=np.int64)
+        n = bits.shape[1]
+        if n <= MAX_INT_INDEX_QUBITS:
+            weights = np.left_shift(np.int64(1), np.arange(n, dtype=np.int64))
+            return cls.from_samples(bits @ weights, n)
+
+        # Too wide for int64: Python ints built once per distinct row
+        rows, counts = np.unique(bits.astype(np.uint8), axis=0, return_counts=True)
+        packed = np.packbits(rows, axis=1, bitorder="little")
+        indices = np.array([int.from_bytes(row.tobytes(), "little") for row in packed], dtype=object)
+        order = np.argsort(indices)
+        total = counts.sum()
+        return cls(counts[order] / total if total else counts[order].astype(np.float64), n, indices[order])
+
+    # --- ACCESSORS ---
+    @property
+    def is_sparse(self):
+        return self.indices is not None
+
+    @property
+    def nbytes(self):
+        extra = self.indices.nbytes if self.is_sparse else 0
+        return self.probs.nbytes + extra
+
+    def support(self, cutoff=0.0):
+        """Returns (indices, probs) of basis states with probability above cutoff."""
+        if self.is_sparse:
+            mask = self.probs > cutoff
+            return self.indices[mask], self.probs[mask]
+        indices = np.flatnonzero(self.probs > cutoff)
+        return indices, self.probs[indices]
+
+    def bitstrings(self, indices):
+        """Formats basis-state indices as big-endian bitstrings of width num_qubits."""
+        indices = np.asarray(indices)
+        n = self.num_qubits
+        if len(indices) == 0 or n == 0:
+            return np.full(len(indices), "", dtype=f"<U{max(n, 1)}")
+        if indices.dtype == object or n > MAX_INT_INDEX_QUBITS:
+            fmt = f"0{n}b"
+            return np.array([format(int(i), fmt) for i in indices])
+
+        shifts = np.arange(n - 1, -1, -1, dtype=np.int64)
+        bits = ((indices.astype(np.int64)[:, None] >> shifts) & 1).astype(np.uint8)
+        bits += ord("0")
+        return np.ascontiguousarray(bits).view(f"S{n}").ravel().astype(f"<U{n}")
+
+    def to_counts(self, cutoff=1e-9):
+        indices, probs = self.support(cutoff)
+        return dict(zip(self.bitstrings(indices).tolist(), probs.tolist()))
+
+    # --- METRICS ---
+    def success_probability(self):
+        if self.probs.size == 0:
+            return 0.0
+        return float(self.probs.max())
+
+    def top_k(self, k=5):
+        """Returns the k most likely outcomes as [(bitstring, probability), ...]."""
+        if self.probs.size == 0 or k <= 0:
+            return []
+        k = min(k, self.probs.size)
+        top = np.argpartition(self.probs, -k)[-k:]
+        top = top[np.argsort(self.probs[top])[::-1]]
+        indices = self.indices[top] if self.is_sparse else top
+        return list(zip(self.bitstrings(indices).tolist(), self.probs[top].tolist()))
+
+    def hellinger_fidelity(self, other):
+        # Different register widths never share an outcome
+        if self.num_qubits != other.num_qubits:
+            return 0.0
+
+        if not self.is_sparse and not other.is_sparse and self.probs.size == other.probs.size:
+            return float(np.sqrt(self.probs * other.probs).sum() ** 2)
+
+        idx_a, p_a = self.support()
+        idx_b, p_b = other.support()
+        _, ia, ib = np.intersect1d(idx_a, idx_b, assume_unique=True, return_indices=True)
+        return float(np.sqrt(p_a[ia] * p_b[ib]).sum() ** 2)
+
+    def total_variation_distance(self, other):
+        # Disjoint supports are as far apart as two distributions get
+        if self.num_qubits != other.num_qubits:
+            return 1.0
+
+        if not self.is_sparse and not other.is_sparse and self.probs.size == other.probs.size:
+            return float(0.5 * np.abs(self.probs - other.probs).sum())
+
+        idx_a, p_a = self.support()
+        idx_b, p_b = other.support()
+        _, ia, ib = np.intersect1d(idx_a, idx_b, assume_unique=True, return_indices=True)
+        # Outcomes seen by only one side contribute their full mass
+        shared = np.abs(p_a[ia] - p_b[ib]).sum()
+        only_a = p_a.sum() - p_a[ia].sum()
+        only_b = p_b.sum() - p_b[ib].sum()
+        return float(0.5 * (shared + only_a + only_b))
+
+    def __repr__(self):
+        kind = "sparse" if self.is_sparse else "dense"
+        return f"ProbabilityResult({kind}, qubits={self.num_qubits}, entries={self.probs.size})"
@@ -1,86 +1,109 @@
+import sqlite3
+import threading
 import time
-import tracemalloc
-import warnings
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from qiskit import QuantumCircuit, transpile
-from qiskit.quantum_info import Statevector
-from qiskit_ibm_runtime import QiskitRuntimeService, SamplerV2 as Sampler
-import cirq
-from cirq.contrib.qasm_import import circuit_from_qasm
 
+# Frameworks (qiskit, cirq, pennylane), pandas and plotting libraries are
+# imported on first use; see app.backends and `python -m app.importtime`.
+from app.admission import (AdmissionController, AdmissionRejected, PRECISIONS, default_controller,
+                           estimate_memory)
+from app.analysis import SIM_METHODS, resolve_method
+from app.backends import BackendPlugin, get_backend, register_backend, simulator_backends
+from app.cache import ResultCache, result_key
+from app.cirq_convert import to_cirq
+from app.hardware import HardwareQueue, fake_backend_resolver, list_fake_backends
+from app.history import HistoryStore
+from app.ir import CircuitIR, as_ir
+from app.memory import MB, MemoryProbe
+from app.profiling import StageTimer, chrome_trace, profile_call, write_chrome_trace
+from app.pennylane_convert import PennyLaneConverter, load_pennylane, make_device
+from app.reference import ReferenceStates
+from app.results import ProbabilityResult, to_little_endian
+from app.transpile_cache import TranspileCache
+from app.trials import STAT_SUFFIXES, TIMED_METRICS, run_once, run_trials
+from app.workers import DEFAULT_TIMEOUT, WorkerTask, run_isolated
+
+# Statevector cap when admission control is off; otherwise it follows memory (app.admission)
 MAX_QUBITS_LOCAL = 24
+# Shots used when the chosen method cannot return a dense state
+DEFAULT_SHOTS = 1024
+SIMULATOR_BACKENDS = ["Qiskit Aer", "Cirq", "PennyLane"]
 
-# --- PLOTTING FUNCTION ---
-def plot_master_dashboard(df):
-    sns.set_theme(style="whitegrid")
-    
-    metrics_groups = {
-        "Accuracy & Reliability": ["fidelity", "success_probability"],
-        "Time & Latency (Log Scale)": ["execution_time", "compilation_time", "total_latency"],
-        "Computational Resources": ["memory_mb", "throughput_shots_sec"],
-        "Compiler Efficiency": ["swap_overhead", "optimization_ratio", "post_depth"]
-    }
-    
-    # Filter for existing columns
-    valid_groups = {}
-    for group, metrics in metrics_groups.items():
-        valid_metrics = [m for m in metrics if m in df.columns]
-        if valid_metrics:
-            valid_groups[group] = valid_metrics
-
-    total_plots = sum(len(v) for v in valid_groups.values())
-    if total_plots == 0: return None
-
-    rows = (total_plots + 2) // 3
-    fig, axes = plt.subplots(rows, 3, figsize=(20, 5 * rows))
-    fig.suptitle('🏆 QBench: Ultimate Parameter Comparison', fontsize=24, y=1.02)
-    
-    ax_flat = axes.flatten() if rows > 1 else [axes]
-    plot_idx = 0
-    palette = "viridis"
-
-    for group_name, metrics in valid_groups.items():
-        for metric in metrics:
-            if plot_idx >= len(ax_flat): break
-            ax = ax_flat[plot_idx]
-            
-            # Plot
-            sns.barplot(
-                data=df, x="backend", y=metric, hue="type", 
-                ax=ax, palette=palette, edgecolor="black"
-            )
-            
-            # Formatting
-            ax.set_title(metric.replace("_", " ").title(), fontsize=14, fontweight='bold')
-            ax.set_xlabel("")
-            ax.set_ylabel("")
-            ax.legend(loc='upper right', fontsize='x-small')
-            
-            # --- FIX: Rotate X-Axis Labels (45 degrees) ---
-            ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
-
-            if metric in ["fidelity", "success_probability"]:
-                ax.set_ylim(0, 1.1)
-            if "time" in metric or "latency" in metric:
-                ax.set_yscale("log")
-                ax.set_ylabel("Seconds (Log)")
-            
-            plot_idx += 1
 
-    for i in range(plot_idx, len(ax_flat)):
-        fig.delaxes(ax_flat[i])
+def _elapsed(t0_ns):
+    return (time.perf_counter_ns() - t0_ns) / 1e9
+
+
+def __getattr__(name):
+    # Lazy re-export: `from app.runner import plot_master_dashboard` keeps working
+    # without importing matplotlib/seaborn until a figure is actually requested
+    if name == "plot_master_dashboard":
+        from app.plotting import plot_master_dashboard
+        return plot_master_dashboard
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _register_counts(counts, position=0):
+    # Multi-register keys read "meas c"; measure_all's register is the leftmost one
+    merged = {}
+    for key, value in counts.items():
+        bits = key.split()[position]
+        merged[bits] = merged.get(bits, 0) + value
+    return merged
+
+
+def _load_aer():
+    # Aer is optional: run_qiskit falls back to Statevector ("Safe Mode") without it
+    try:
+        import qiskit_aer
+    except ImportError:
+        pass
 
-    plt.tight_layout()
-    return fig
 
 class QBenchAnalyzer:
-    def __init__(self, ibm_token=None, ibm_crn=None):
+    def __init__(self, ibm_token=None, ibm_crn=None, cache=True, transpile_cache=True, offline_hardware=False,
+                 pennylane_device="auto", history=True, admission=True):
         self.service = None
+        # offline_hardware: serve "hardware" from qiskit_ibm_runtime's local fake backends
+        self.offline_hardware = offline_hardware
+        self._hardware = None
+        self._hardware_lock = threading.Lock()
+        self._credentials = {"ibm_token": ibm_token, "ibm_crn": ibm_crn}
+        # cache: True for the default on-disk ResultCache, False to disable, or an instance
+        self.cache = None
+        if isinstance(cache, ResultCache):
+            self.cache = cache
+        elif cache:
+            try:
+                self.cache = ResultCache()
+            except OSError as e:
+                print(f"Result cache disabled: {e}")
+        self.transpile_cache = TranspileCache() if transpile_cache else None
+        # history: True for the default SQLite HistoryStore, False to disable, or an instance
+        self.history = None
+        if isinstance(history, HistoryStore):
+            self.history = history
+        elif history:
+            try:
+                self.history = HistoryStore()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Benchmark history disabled: {e}")
+        # admission: True for the process-wide memory controller, False for the fixed
+        # MAX_QUBITS_LOCAL cap, or an AdmissionController instance
+        self.admission = None
+        if isinstance(admission, AdmissionController):
+            self.admission = admission
+        elif admission:
+            self.admission = default_controller()
+        # Ideal state per circuit: the fidelity reference for every backend. Its width stays
+        # fixed (it lives in this process, next to the admitted runs) instead of following memory
+        self.references = ReferenceStates(max_qubits=min(MAX_QUBITS_LOCAL, self.statevector_limit("Qiskit Aer")))
+        # "auto" prefers lightning.qubit; see app.pennylane_convert.make_device
+        self.pennylane_device = pennylane_device
+        self.pennylane_converter = PennyLaneConverter()
         if ibm_token and ibm_crn:
             try:
+                from qiskit_ibm_runtime import QiskitRuntimeService
                 self.service = QiskitRuntimeService(
                     channel="ibm_cloud", instance=ibm_crn, token=ibm_token
                 )
@@ -92,6 +115,8 @@ class QBenchAnalyzer:
         Fetches devices available to the SPECIFIC USER ACCOUNT.
         Returns empty list if failed.
         """
+        if self.offline_hardware:
+            return list_fake_backends()
         if not self.service:
             return []
             
@@ -113,214 +138,304 @@ class QBenchAnalyzer:
         }
 
     def hellinger_fidelity(self, p_ideal, p_measured):
-        fidelity = 0
-        all_keys = set(p_ideal.keys()) | set(p_measured.keys())
-        for k in all_keys:
-            p1 = p_ideal.get(k, 0)
-            p2 = p_measured.get(k, 0)
-            fidelity += np.sqrt(p1 * p2)
-        return fidelity ** 2
+        # Accepts ProbabilityResult objects or legacy {bitstring: prob} dicts
+        if isinstance(p_ideal, dict): p_ideal = ProbabilityResult.from_counts(p_ideal)
+        if isinstance(p_measured, dict): p_measured = ProbabilityResult.from_counts(p_measured)
+        return p_ideal.hellinger_fidelity(p_measured)
 
     def sv_to_counts(self, statevector):
-        probs = np.abs(statevector)**2
-        n = int(np.log2(len(probs)))
-        counts = {}
-        fmt = f'0{n}b'
-        for i, p in enumerate(probs):
-            if p > 1e-9: counts[format(i, fmt)] = p
-        return counts
+        return ProbabilityResult.from_statevector(statevector).to_counts()
+
+    def _transpile(self, qc, backend, optimization_level, circuit_key):
+        # Returns (transpiled, "cached" | "cold") so reports can tell compile time from lookups
+        if self.transpile_cache is None:
+            from qiskit import transpile
+            if backend is None:
+                return transpile(qc, optimization_level=optimization_level), "cold"
+            return transpile(qc, backend=backend, optimization_level=optimization_level), "cold"
+        return self.transpile_cache.transpile(qc, backend, optimization_level, circuit_key)
 
     # --- RUNNERS ---
-    def run_qiskit(self, qasm_code):
-        metrics = {"backend": "Qiskit Aer", "type": "Simulator"}
+    def run_qiskit(self, qasm_code, track_memory=True, shots=None, method="auto", precision="double",
+                   sim_options=None):
+        metrics = {"backend": "Qiskit Aer", "type": "Simulator", "mode": "shots" if shots else "statevector",
+                   "precision": precision}
+        probe = None
+        stages = StageTimer()
         try:
-            qc = QuantumCircuit.from_qasm_str(qasm_code)
-            if qc.num_qubits > MAX_QUBITS_LOCAL:
-                raise ValueError(f"Circuit too large for local simulation ({qc.num_qubits} > {MAX_QUBITS_LOCAL} qubits).")
-            qc.remove_final_measurements()
-            metrics.update(self.get_circuit_metrics(qc, "pre"))
+            from qiskit.quantum_info import Statevector
+
+            ir = as_ir(qasm_code)
+            metrics['parse_time'] = ir.parse_time
+            stages.lap("route")
+            # Route to a method that fits (stabilizer, MPS...) instead of a hard qubit cap
+            profile = ir.profile
+            sim_method = resolve_method(profile, method, self.statevector_limit("Qiskit Aer", precision), "Qiskit Aer")
+            if sim_method != "statevector" and not shots:
+                shots = DEFAULT_SHOTS
+            metrics['sim_method'] = sim_method
+            metrics['mode'] = "shots" if shots else "statevector"
+            metrics['non_clifford_count'] = profile['non_clifford_count']
+            metrics.update(ir.metrics)
+            # Sampling mode: Aer samples the measurements, no statevector is returned
+            qc = ir.measured() if shots else ir.unitary()
+            circuit_key = ir.hash + (":measured" if shots else ":statevector")
+            if sim_method != "statevector": circuit_key += f":{sim_method}"
             
-            tracemalloc.start()
-            t0 = time.time()
+            if track_memory: probe = MemoryProbe().start()
+            t0 = time.perf_counter_ns()
             
             # Safe Fallback Logic for Windows DLL issues
             try:
                 from qiskit_aer import AerSimulator
-                sim = AerSimulator(method='statevector')
-                qc.save_statevector()
-                transpiled = transpile(qc, sim, optimization_level=2)
-                metrics['compilation_time'] = time.time() - t0
-                t1 = time.time()
-                job = sim.run(transpiled)
-                sv = job.result().get_statevector().data
-                metrics['execution_time'] = time.time() - t1
+                sim = AerSimulator(method=sim_method, precision=precision, **(sim_options or {}))
+                stages.lap("transpile")
+                transpiled, metrics['compilation_cache'] = self._transpile(qc, sim, 2, circuit_key)
+                if not shots: transpiled.save_statevector()
+                metrics['compilation_time'] = _elapsed(t0)
+                t1 = time.perf_counter_ns()
+                stages.lap("simulate")
+                result = sim.run(transpiled, shots=shots).result() if shots else sim.run(transpiled).result()
+                stages.lap("copy_out")
+                if shots:
+                    counts = _register_counts(result.get_counts())
+                else:
+                    sv = result.get_statevector().data
+                metrics['execution_time'] = _elapsed(t1)
                 metrics.update(self.get_circuit_metrics(transpiled, "post"))
             except ImportError:
+                if sim_method != "statevector":
+                    raise ValueError(f"Method '{sim_method}' needs qiskit-aer")
+                if precision != "double":
+                    raise ValueError("Single precision needs qiskit-aer")
                 metrics["backend"] = "Qiskit (Safe Mode)"
-                transpiled = transpile(qc, optimization_level=2)
-                metrics['compilation_time'] = time.time() - t0
-                t1 = time.time()
-                sv = Statevector.from_instruction(transpiled).data
-                metrics['execution_time'] = time.time() - t1
+                stages.lap("transpile")
+                transpiled, metrics['compilation_cache'] = self._transpile(qc, None, 2, circuit_key)
+                metrics['compilation_time'] = _elapsed(t0)
+                t1 = time.perf_counter_ns()
+                stages.lap("simulate")
+                if shots:
+                    unmeasured = transpiled.remove_final_measurements(inplace=False)
+                    counts = Statevector.from_instruction(unmeasured).sample_counts(shots)
+                else:
+                    sv = Statevector.from_instruction(transpiled).data
+                metrics['execution_time'] = _elapsed(t1)
                 metrics.update(self.get_circuit_metrics(transpiled, "post"))
 
-            _, peak_mem = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
+            if probe: metrics.update(probe.stop())
             
-            metrics['memory_mb'] = peak_mem / (1024**2)
-            metrics['counts'] = self.sv_to_counts(sv)
+            stages.lap("postprocess")
+            if shots:
+                metrics['probs'] = ProbabilityResult.from_counts(counts, qc.num_qubits)
+                metrics['throughput_shots_sec'] = shots / metrics['execution_time']
+            else:
+                metrics['probs'] = ProbabilityResult.from_statevector(sv)
+                stages.lap("reference")
+                metrics['state_fidelity'] = self.references.state_fidelity(ir, sv)
             metrics['total_latency'] = metrics['compilation_time'] + metrics['execution_time']
         except Exception as e:
             metrics['error'] = str(e)
+        finally:
+            if probe: probe.stop()
+            _finish_stages(metrics, stages)
         return metrics
 
-    def run_cirq(self, qasm_code):
-        metrics = {"backend": "Cirq", "type": "Simulator"}
+    def run_cirq(self, qasm_code, track_memory=True, shots=None, method="auto", precision="double",
+                 sim_options=None):
+        metrics = {"backend": "Cirq", "type": "Simulator", "mode": "shots" if shots else "statevector",
+                   "precision": precision}
+        probe = None
+        stages = StageTimer()
         try:
-            clean_qasm = "\n".join([l for l in qasm_code.splitlines() if not l.strip().startswith("barrier")])
-            t0 = time.time()
-            circuit = circuit_from_qasm(clean_qasm)
-            if len(circuit.all_qubits()) > MAX_QUBITS_LOCAL:
-                raise ValueError(f"Circuit too large ({len(circuit.all_qubits())} qubits).")
-            metrics['compilation_time'] = time.time() - t0
-            metrics['pre_depth'] = len(circuit.moments)
+            import cirq
+
+            ir = as_ir(qasm_code)
+            metrics['parse_time'] = ir.parse_time
+            stages.lap("route")
+            sim_method = resolve_method(ir.profile, method, self.statevector_limit("Cirq", precision), "Cirq")
+            if sim_method != "statevector" and not shots:
+                shots = DEFAULT_SHOTS
+            metrics['sim_method'] = sim_method
+            metrics['mode'] = "shots" if shots else "statevector"
+            metrics.update(ir.metrics)
+
+            t0 = time.perf_counter_ns()
+            stages.lap("lower")
+            circuit, qubits = to_cirq(ir.base)
             metrics['post_depth'] = len(circuit.moments)
-            metrics['pre_gate_count'] = sum(1 for _ in circuit.all_operations())
-            metrics['post_gate_count'] = metrics['pre_gate_count']
+            metrics['post_gate_count'] = sum(1 for _ in circuit.all_operations())
+            if shots:
+                # One register over every qubit, in place of the QASM's own measurements
+                circuit.append(cirq.measure(*qubits, key="m"))
+            metrics['compilation_time'] = _elapsed(t0)
             
-            tracemalloc.start()
-            t1 = time.time()
-            sim = cirq.Simulator()
-            res = sim.simulate(circuit)
-            metrics['execution_time'] = time.time() - t1
-            _, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
+            if track_memory: probe = MemoryProbe().start()
+            t1 = time.perf_counter_ns()
+            stages.lap("simulate")
+            if sim_method == "stabilizer":
+                sim = cirq.CliffordSimulator()
+            else:
+                sim = cirq.Simulator(dtype=np.complex64 if precision == "single" else np.complex128,
+                                     **(sim_options or {}))
+            if shots:
+                res = sim.run(circuit, repetitions=shots)
+            else:
+                res = sim.simulate(circuit, qubit_order=qubits)
+            metrics['execution_time'] = _elapsed(t1)
+            if probe: metrics.update(probe.stop())
             
-            metrics['memory_mb'] = peak / (1024**2)
-            metrics['counts'] = self.sv_to_counts(res.final_state_vector)
+            stages.lap("postprocess")
+            if shots:
+                # Column i is q_i, indexed like Qiskit's counts
+                metrics['probs'] = ProbabilityResult.from_bit_matrix(res.measurements["m"])
+                metrics['throughput_shots_sec'] = shots / metrics['execution_time']
+            else:
+                # Cirq's state is big-endian over the line qubits
+                sv = to_little_endian(res.final_state_vector)
+                metrics['probs'] = ProbabilityResult.from_statevector(sv)
+                stages.lap("reference")
+                metrics['state_fidelity'] = self.references.state_fidelity(ir, sv)
             metrics['total_latency'] = metrics['compilation_time'] + metrics['execution_time']
         except Exception as e:
             metrics['error'] = str(e)
+        finally:
+            if probe: probe.stop()
+            _finish_stages(metrics, stages)
         return metrics
 
-    def run_pennylane(self, qasm_code):
-        metrics = {"backend": "PennyLane", "type": "Simulator"}
+    def run_pennylane(self, qasm_code, track_memory=True, shots=None, method="auto", precision="double",
+                      sim_options=None):
+        metrics = {"backend": "PennyLane", "type": "Simulator", "mode": "shots" if shots else "statevector",
+                   "precision": precision}
+        probe = None
+        stages = StageTimer()
         try:
-            # --- WINDOWS FIX: Safe Import + Pure Python Device ---
-            import sys
-            # Hack to prevent plugin load
-            sys.modules['pennylane_lightning'] = None
-            sys.modules['pennylane_lightning.qubit'] = None
-            sys.modules['controller_wrappers'] = None
-            
-            import pennylane as qml
-            
-            clean_qasm = "\n".join([l for l in qasm_code.splitlines() if not l.strip().startswith("barrier")])
-            qc_temp = QuantumCircuit.from_qasm_str(clean_qasm)
-            n_qubits = qc_temp.num_qubits
-            
-            if n_qubits > MAX_QUBITS_LOCAL:
-                raise ValueError(f"Circuit too large ({n_qubits} qubits).")
-            
-            t0 = time.time()
+            qml = load_pennylane()
+
+            ir = as_ir(qasm_code)
+            metrics['parse_time'] = ir.parse_time
+            stages.lap("route")
+            n_qubits = ir.num_qubits
+
+            # PennyLane's stabilizer device is default.clifford; no MPS sampling path
+            sim_method = resolve_method(ir.profile, method, self.statevector_limit("PennyLane", precision), "PennyLane")
+            if sim_method != "statevector" and not shots:
+                shots = DEFAULT_SHOTS
+            metrics['sim_method'] = sim_method
+            metrics['mode'] = "shots" if shots else "statevector"
             
-            # Explicitly use 'default.qubit' (Python) to avoid DLL errors from 'lightning.qubit' (C++)
-            dev = qml.device("default.qubit", wires=n_qubits)
+            t0 = time.perf_counter_ns()
+            stages.lap("device")
             
-            # MANUAL CONVERTER: Bypass broken pennylane-qiskit bridge (DLL safe)
-            qubit_map = {q: i for i, q in enumerate(qc_temp.qubits)}
+            if sim_method == "stabilizer":
+                dev = qml.device("default.clifford", wires=n_qubits, shots=shots)
+                metrics['device'] = "default.clifford"
+            else:
+                dev, metrics['device'] = make_device(qml, self.pennylane_device, n_qubits, shots, precision,
+                                                     sim_options)
             
-            def qfunc():
-                for inst in qc_temp.data:
-                    op = inst.operation
-                    name = op.name
-                    wires = [qubit_map[q] for q in inst.qubits]
-                    params = op.params
-                    
-                    if name == 'h': qml.Hadamard(wires=wires)
-                    elif name == 'x': qml.PauliX(wires=wires)
-                    elif name == 'y': qml.PauliY(wires=wires)
-                    elif name == 'z': qml.PauliZ(wires=wires)
-                    elif name == 'cx': qml.CNOT(wires=wires)
-                    elif name == 'cz': qml.CZ(wires=wires)
-                    elif name == 'rx': qml.RX(params[0], wires=wires)
-                    elif name == 'ry': qml.RY(params[0], wires=wires)
-                    elif name == 'rz': qml.RZ(params[0], wires=wires)
-                    elif name == 'measure': pass
-                    elif name == 'barrier': pass
-                    else: 
-                        # Best effort for benchmark
-                        pass
-            metrics['compilation_time'] = time.time() - t0
+            # Gate table lowering, done once per circuit and replayed by every execution
+            stages.lap("lower")
+            ops, metrics['compilation_cache'] = self.pennylane_converter.convert(qml, ir.base, ir.hash)
+            metrics['compilation_time'] = _elapsed(t0)
             
-            metrics['pre_depth'] = qc_temp.depth()
-            metrics['post_depth'] = qc_temp.depth()
-            metrics['pre_gate_count'] = sum(qc_temp.count_ops().values())
-            metrics['post_gate_count'] = metrics['pre_gate_count']
+            metrics.update(ir.metrics)
+            metrics['post_depth'] = metrics['pre_depth']
+            # Unrolled gates count once each, like a transpiled circuit
+            metrics['post_gate_count'] = len(ops)
 
-            tracemalloc.start()
-            t1 = time.time()
+            if track_memory: probe = MemoryProbe().start()
+            t1 = time.perf_counter_ns()
+            stages.lap("simulate")
             @qml.qnode(dev)
             def circuit():
-                qfunc()
+                for op in ops:
+                    qml.apply(op)
+                if shots:
+                    return qml.sample(wires=range(n_qubits))
                 return qml.state()
-            sv = circuit()
-            metrics['execution_time'] = time.time() - t1
-            _, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
+            out = circuit()
+            metrics['execution_time'] = _elapsed(t1)
+            if probe: metrics.update(probe.stop())
             
-            metrics['memory_mb'] = peak / (1024**2)
-            metrics['counts'] = self.sv_to_counts(np.array(sv))
+            stages.lap("postprocess")
+            if shots:
+                samples = np.asarray(out).reshape(shots, n_qubits)
+                metrics['probs'] = ProbabilityResult.from_bit_matrix(samples)
+                metrics['throughput_shots_sec'] = shots / metrics['execution_time']
+            else:
+                # qml.state() is big-endian: wire 0 is the most significant bit
+                sv = to_little_endian(np.array(out))
+                metrics['probs'] = ProbabilityResult.from_statevector(sv)
+                stages.lap("reference")
+                metrics['state_fidelity'] = self.references.state_fidelity(ir, sv)
             metrics['total_latency'] = metrics['compilation_time'] + metrics['execution_time']
             
         except Exception as e:
              # Even if it fails, capture the error properly without crashing
              metrics['error'] = f"PennyLane Error: {str(e)}"
-             metrics['counts'] = {}
+             metrics['probs'] = None
+        finally:
+            if probe: probe.stop()
+            _finish_stages(metrics, stages)
         return metrics
 
-    def run_ibm_hardware(self, qasm_code, backend_name):
-        metrics = {"backend": backend_name, "type": "Hardware"}
-        try:
-            backend = self.service.backend(backend_name)
-            qc = QuantumCircuit.from_qasm_str(qasm_code)
-            if qc.num_clbits == 0: qc.measure_all()
-            metrics.update(self.get_circuit_metrics(qc, "pre"))
-            
-            t0 = time.time()
-            transpiled = transpile(qc, backend=backend, optimization_level=3)
-            metrics['compilation_time'] = time.time() - t0
-            metrics.update(self.get_circuit_metrics(transpiled, "post"))
-            
-            sampler = Sampler(mode=backend)
-            t_submit = time.time()
-            job = sampler.run([transpiled])
-            
-            try:
-                result = job.result(timeout=60)
-            except Exception:
-                metrics['error'] = f"Timeout: Job {job.job_id()} queued. Check IBM Dashboard."
-                metrics['counts'] = {}
-                return metrics
+    def run_ibm_hardware(self, qasm_code, backend_name, wait=60, shots=None):
+        # Blocking convenience wrapper around the hardware queue (one device, one circuit)
+        job_ids, errors = self.submit_hardware(qasm_code, [backend_name], shots=shots)
+        if errors:
+            return errors[0]
+        rows = self.collect_hardware(job_ids, wait=wait)
+        return rows[0]
 
-            metrics['total_latency'] = time.time() - t_submit
-            metrics['execution_time'] = metrics['total_latency']
-            
-            pub_res = result[0]
-            counts_data = list(pub_res.data.values())[0].get_counts()
-            total_shots = sum(counts_data.values())
-            
-            metrics['throughput_shots_sec'] = total_shots / metrics['total_latency']
-            metrics['counts'] = {k: v/total_shots for k,v in counts_data.items()}
-            metrics['memory_mb'] = 0.0 
-        except Exception as e:
-            err_str = str(e)
-            if "No backend matches" in err_str:
-                metrics['error'] = "Access Denied (Not in your Plan)"
-            else:
-                metrics['error'] = err_str
-            metrics['counts'] = {}
-        return metrics
+    # --- HARDWARE QUEUE ---
+    @property
+    def hardware_available(self):
+        return self.service is not None or self.offline_hardware
+
+    @property
+    def hardware(self):
+        with self._hardware_lock:
+            if self._hardware is None:
+                resolver = fake_backend_resolver if self.offline_hardware else None
+                self._hardware = HardwareQueue(self.service, backend_resolver=resolver)
+            return self._hardware
+
+    def submit_hardware(self, qasm_codes, backend_names, shots=None):
+        """
+        Submits one batched Sampler job per device without blocking.
+        Returns (job_ids, error_rows); job IDs are persisted in the job ledger.
+        """
+        return self.hardware.submit(qasm_codes, backend_names, self._transpile, shots=shots)
+
+    def collect_hardware(self, job_ids=None, wait=0.0):
+        """Result rows for finished jobs; jobs still queued after `wait` seconds get a 'Queued' row."""
+        rows, pending = self.hardware.poll(job_ids, wait)
+        entries = {e["job_id"]: e for e in self.hardware.ledger.load()}
+        for job_id in pending:
+            rows.append({
+                "backend": entries[job_id]["backend"], "type": "Hardware", "job_id": job_id,
+                "error": f"Queued: Job {job_id} saved to the job ledger. Collect results later.",
+                "probs": None,
+            })
+        return rows
+
+    def load_hardware_results(self, wait=0.0):
+        """
+        Polls every pending ledger job (including ones submitted in earlier
+        sessions) and returns the finished ones as a sanitized DataFrame,
+        with fidelity against the ideal reference state of the same circuit.
+        """
+        rows, _ = self.hardware.poll(None, wait)
+        qasm_by_hash = {c["circuit_hash"]: c["qasm"] for e in self.hardware.ledger.load() for c in e["circuits"]}
+        for row in rows:
+            qasm_code = qasm_by_hash.get(row.get("circuit_hash"))
+            if qasm_code is not None:
+                self._attach_fidelity([row], qasm_code)
+        import pandas as pd
+        df = self.sanitize_results(pd.DataFrame(rows))
+        self._record_history(df)
+        return df
 
     def sanitize_results(self, df):
         if df.empty: return df
@@ -329,7 +444,7 @@ class QBenchAnalyzer:
         cols_defaults = {
             'swap_overhead': 0.0, 'optimization_ratio': 1.0, 
             'throughput_shots_sec': 0.0, 'execution_time': 0.0, 
-            'total_latency': 0.0, 'pre_gate_count': 0.0, 'post_gate_count': 0.0
+            'total_latency': 0.0, 'parse_time': 0.0, 'pre_gate_count': 0.0, 'post_gate_count': 0.0
         }
         for col, val in cols_defaults.items():
             if col not in df.columns: df[col] = val
@@ -340,55 +455,407 @@ class QBenchAnalyzer:
 
         if 'post_gate_count' in df.columns:
             df['swap_overhead'] = (df['post_gate_count'] - df['pre_gate_count']).fillna(0)
+
+        # Backends without a transpile step have nothing to cache
+        if 'compilation_cache' in df.columns:
+            df['compilation_cache'] = df['compilation_cache'].fillna("n/a")
+
+        # Single-shot rows (hardware, trials disabled) get degenerate statistics
+        for metric in TIMED_METRICS:
+            if metric not in df.columns: continue
+            for suffix in STAT_SUFFIXES:
+                col = f"{metric}_{suffix}"
+                if col not in df.columns: df[col] = np.nan
+                df[col] = df[col].fillna(0.0 if suffix == "std" else df[metric])
             
-        # Calculate Success Probability
-        def calc_success(row):
-            counts = row.get('counts')
-            if pd.isna(row.get('success_probability')) and isinstance(counts, dict):
-                if len(counts) > 0:
-                    return max(counts.values())
-            return 0.0
-        df['success_probability'] = df.apply(calc_success, axis=1)
+        # Success probability / most likely outcome straight from the probability arrays
+        import pandas as pd
+        probs = df['probs'] if 'probs' in df.columns else pd.Series([None] * len(df), index=df.index)
+        df['success_probability'] = [p.success_probability() if isinstance(p, ProbabilityResult) else 0.0 for p in probs]
+        df['top_outcome'] = [
+            p.top_k(1)[0][0] if isinstance(p, ProbabilityResult) and p.probs.size else None for p in probs
+        ]
         
         return df
 
-    def execute_benchmark(self, qasm_code, selected_backends):
-        data = []
-        baseline_counts = None
+    # --- ADMISSION ---
+    def statevector_limit(self, backend_name=None, precision="double"):
+        """Widest dense statevector one run of the backend fits in memory."""
+        if self.admission is None:
+            return MAX_QUBITS_LOCAL
+        return self.admission.statevector_limit(precision, backend_name)
 
-        # 1. Qiskit (Must run first for baseline)
-        if "Qiskit Aer" in selected_backends:
-            q_res = self.run_qiskit(qasm_code)
-            if 'error' not in q_res:
-                q_res['fidelity'] = 1.0 
-                baseline_counts = q_res['counts']
-            
-            data.append(q_res)
-
-        # 2. Cirq
-        if "Cirq" in selected_backends:
-            c_res = self.run_cirq(qasm_code)
-            if 'error' not in c_res and baseline_counts:
-                c_res['fidelity'] = self.hellinger_fidelity(baseline_counts, c_res['counts'])
-            data.append(c_res)
-
-        # 3. PennyLane
-        if "PennyLane" in selected_backends:
-            p_res = self.run_pennylane(qasm_code)
-            if 'error' not in p_res and baseline_counts and p_res.get('counts'):
-                p_res['fidelity'] = self.hellinger_fidelity(baseline_counts, p_res['counts'])
-            elif 'error' in p_res:
-                p_res['fidelity'] = 0.0
-            data.append(p_res)
-
-        # 4. Hardware
-        for backend_name in selected_backends:
-            if backend_name not in ["Qiskit Aer", "Cirq", "PennyLane"]:
-                if self.service:
-                    hw_res = self.run_ibm_hardware(qasm_code, backend_name)
-                    if 'error' not in hw_res and baseline_counts and hw_res.get('counts'):
-                        hw_res['fidelity'] = self.hellinger_fidelity(baseline_counts, hw_res['counts'])
-                    data.append(hw_res)
-
-        df = pd.DataFrame(data)
-        return self.sanitize_results(df)
\ No newline at end of file
+    def routed_method(self, backend_name, circuit, method="auto", precision="double"):
+        """
+        The simulation method a run would use, as the runners route it: "auto"
+        depends on the statevector limit, and so on free memory. None when
+        nothing fits.
+        """
+        ir = as_ir(circuit)
+        try:
+            return resolve_method(ir.profile, method, self.statevector_limit(backend_name, precision), backend_name)
+        except ValueError:
+            return None
+
+    def estimate_memory(self, backend_name, circuit, method="auto", precision="double", shots=None):
+        """Estimated peak bytes of one simulator run, for the method it would be routed to."""
+        ir = as_ir(circuit)
+        sim_method = self.routed_method(backend_name, ir, method, precision)
+        if sim_method not in SIM_METHODS:
+            return 0  # the runner rejects it before allocating anything
+        # Dense runs also hold the ideal state while computing state_fidelity
+        reference = sim_method == "statevector" and not shots and ir.num_qubits <= self.references.max_qubits
+        return estimate_memory(ir.num_qubits, sim_method, precision, backend_name, shots,
+                               ir.profile['non_clifford_count'], reference=reference)
+
+    def _run_admitted(self, backend_name, ir, estimate, timeout=None, cancel_event=None, run_options=None):
+        # Sequential run: wait for the memory (held by other jobs sharing the controller), or reject
+        if self.admission is None or not estimate:
+            return self.run_backend(backend_name, ir, **(run_options or {}))
+        try:
+            with self.admission.reserve(estimate, timeout=timeout, cancel_event=cancel_event):
+                return self.run_backend(backend_name, ir, **(run_options or {}))
+        except AdmissionRejected as e:
+            return {"backend": backend_name, "type": "Simulator", "error": f"Rejected: {e}", "probs": None}
+
+    def _build_reference(self, ir, timeout=None, cancel_event=None):
+        # Computing the ideal state holds dense copies in this process: admit it like a run
+        if self.admission is None or ir.num_qubits > self.references.max_qubits or self.references.has(ir):
+            self.references.statevector(ir)
+            return
+        try:
+            with self.admission.reserve(estimate_memory(ir.num_qubits), timeout=timeout, cancel_event=cancel_event):
+                self.references.statevector(ir)
+        except AdmissionRejected as e:
+            print(f"Reference state skipped: {e}")
+            self.references.skip(ir)
+
+    # --- ORCHESTRATION ---
+    def run_backend(self, backend_name, qasm_code, warmup=0, repeats=1, shots=None, method="auto",
+                    cprofile=False, precision="double", sim_options=None):
+        # sim_options: keyword arguments for the simulator itself (AerSimulator, cirq.Simulator,
+        # the PennyLane device), e.g. {"max_parallel_threads": 4, "fusion_enable": False}
+        # qasm_code may be QASM text or a CircuitIR shared across backends
+        plugin = get_backend(backend_name)
+        if plugin is None:
+            # Hardware shots are too expensive to repeat
+            return self.run_ibm_hardware(qasm_code, backend_name, shots=shots)
+
+        # Import cost is paid (and reported) once, outside every timed section
+        try:
+            import_time = plugin.load()
+        except Exception as e:
+            return {"backend": backend_name, "type": plugin.type, "error": f"Import failed: {e}", "probs": None}
+        if cprofile and not isinstance(qasm_code, CircuitIR):
+            # One parse shared by the profile label and the runner (execute_benchmark passes its IR)
+            try:
+                qasm_code = as_ir(qasm_code)
+            except Exception:
+                pass  # the runner reports the parse error
+        options = {"shots": shots, "method": method, "precision": precision}
+        if sim_options:
+            options["sim_options"] = sim_options
+        if warmup == 0 and repeats <= 1:
+            call = lambda: run_once(lambda **kw: plugin.run(self, qasm_code, **options, **kw))
+        else:
+            call = lambda: run_trials(lambda **kw: plugin.run(self, qasm_code, **options, **kw),
+                                      warmup=warmup, repeats=repeats)
+        if cprofile:
+            # Python-level hot spots only; native simulator kernels show up as one opaque call
+            label = f"{backend_name}-{qasm_code.hash[:12] if isinstance(qasm_code, CircuitIR) else 'unparsed'}"
+            metrics, info = profile_call(call, label)
+            metrics.update(info)
+        else:
+            metrics = call()
+        metrics['import_time'] = import_time
+        return metrics
+
+    def _run_parallel(self, qasm_code, backend_names, max_workers=None, timeout=DEFAULT_TIMEOUT,
+                      cancel_event=None, run_options=None, on_result=None, memory=None):
+        # memory: {backend: estimated bytes}; workers then start only once it is admitted
+        memory = memory or {}
+        tasks = []
+        for name in backend_names:
+            # Only hardware workers need to redo the IBM handshake
+            if name in simulator_backends():
+                credentials = {"pennylane_device": self.pennylane_device}
+            else:
+                credentials = self._credentials
+            tasks.append(WorkerTask(name, _run_backend_task, (credentials, name, qasm_code, run_options or {}),
+                                    memory=memory.get(name, 0)))
+
+        callback = None
+        if on_result is not None:
+            callback = lambda name, outcome: on_result(name, _outcome_row(name, outcome))
+        outcomes = run_isolated(tasks, max_workers=max_workers, timeout=timeout, cancel_event=cancel_event,
+                                on_result=callback, admission=self.admission)
+        return [_outcome_row(name, outcomes[name]) for name in backend_names]
+
+    # --- RESULT CACHE ---
+    def _cache_lookup(self, qasm_code, backend_name, run_options):
+        entry = self.cache.get(result_key(qasm_code, backend_name, run_options))
+        if entry is None:
+            return None
+        entry['cache_hit'] = True
+        return entry
+
+    def _cache_store(self, qasm_code, backend_name, run_options, metrics):
+        if 'error' in metrics:
+            return
+        self.cache.put(result_key(qasm_code, backend_name, run_options), metrics)
+        # Timing-independent outcome, reusable as a fidelity baseline by any later run
+        outcome = {k: v for k, v in metrics.items() if k == 'probs' or k.startswith(("pre_", "post_"))}
+        self.cache.put(result_key(qasm_code, backend_name, kind="outcome"), outcome)
+
+    def _cached_outcome(self, qasm_code, backend_name):
+        if self.cache is None:
+            return None
+        return self.cache.get(result_key(qasm_code, backend_name, kind="outcome"))
+
+    def _attach_fidelity(self, data, qasm_code=None):
+        # The ideal state is the reference for every backend, Aer included
+        baseline_probs = self.references.probabilities(qasm_code) if qasm_code is not None else None
+        if isinstance(qasm_code, CircuitIR): qasm_code = qasm_code.qasm
+
+        # Too wide or non-unitary for a dense reference: compare against Aer instead
+        if baseline_probs is None:
+            for res in data:
+                if res.get("backend") == "Qiskit Aer" and 'error' not in res:
+                    baseline_probs = res['probs']
+            if baseline_probs is None and qasm_code is not None:
+                outcome = self._cached_outcome(qasm_code, "Qiskit Aer")
+                if outcome is not None:
+                    baseline_probs = outcome.get('probs')
+
+        for res in data:
+            if 'error' not in res and baseline_probs is not None and res.get('probs') is not None:
+                res['fidelity'] = baseline_probs.hellinger_fidelity(res['probs'])
+                res['tvd'] = baseline_probs.total_variation_distance(res['probs'])
+            elif 'error' in res and res.get("backend") == "PennyLane":
+                res['fidelity'] = 0.0
+
+    def execute_benchmark(self, qasm_code, selected_backends, parallel=False, max_workers=None,
+                          timeout=DEFAULT_TIMEOUT, cancel_event=None, warmup=0, repeats=1, use_cache=True,
+                          hardware_wait=60, shots=None, method="auto", cprofile=False, precision="double",
+                          on_result=None):
+        """
+        Runs the selected backends and returns the sanitized results DataFrame.
+
+        With parallel=True every backend runs in its own worker process (at most
+        max_workers at once, each killed after `timeout` seconds), so one hung or
+        crashing framework cannot take down the app or the other measurements.
+        Concurrent simulators share the CPU, so prefer sequential runs when
+        absolute timings matter.
+
+        warmup/repeats switch simulators to the repeated-trial engine
+        (see app.trials): timing columns become medians with p95/std/CI columns.
+        Memory columns always come from a separate untimed pass, so the memory
+        tracer never slows the timed calls.
+
+        Simulator results are served from the on-disk result cache when the same
+        canonical circuit, backend, options and framework versions were seen
+        before (cache_hit column). use_cache=False forces fresh timings; the
+        fresh results still refresh the cache.
+
+        Hardware devices are submitted first (one batched job per device) and
+        collected after the simulators finish, waiting at most hardware_wait
+        seconds; anything still queued stays in the job ledger for
+        load_hardware_results().
+
+        shots=N switches simulators to sampling mode (Aer shots, cirq
+        Simulator.run, PennyLane shots=) and sends the same shot count to
+        hardware, so throughput_shots_sec and fidelity compare like with like.
+
+        method="auto" keeps dense statevector while it fits in memory and routes
+        larger circuits by structure (Clifford -> stabilizer, few non-Clifford
+        gates -> extended_stabilizer, short-range interactions ->
+        matrix_product_state); the choice is reported in sim_method.
+
+        The QASM is parsed once into a CircuitIR (app.ir) shared by every
+        runner; its cost is the parse_time column, outside compilation_time.
+
+        on_result(backend_name, row) is called as soon as each backend's row
+        is ready (cache hits first), with fidelity already attached, so
+        callers can stream progress before the DataFrame is assembled.
+
+        Every runner times its stages (stage_* columns, see app.profiling);
+        the spans of this call come back in the DataFrame's attrs["trace"]
+        (see export_trace), never on the analyzer that concurrent sessions share.
+        cprofile=True also runs each simulator under cProfile and adds
+        cprofile_path / cprofile_top columns.
+
+        Admission control (app.admission): each simulator's peak memory is
+        estimated from qubits, method and precision (memory_estimate_mb). Runs
+        wait while concurrent runs hold the memory they need and are rejected
+        when they exceed the whole budget. precision="single" runs complex64
+        statevectors (Aer precision="single", Cirq dtype=complex64, lightning
+        c_dtype=complex64) at half the memory.
+        """
+        import pandas as pd
+
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}' (use {' or '.join(PRECISIONS)})")
+        simulators = simulator_backends()
+        stages = StageTimer()
+        try:
+            ir = as_ir(qasm_code)
+        except Exception as e:
+            rows = [{"backend": name, "type": "Simulator" if name in simulators else "Hardware",
+                     "error": f"Parse error: {e}", "probs": None} for name in selected_backends]
+            # Streaming callers (the service's SSE jobs) see the failure too
+            if on_result is not None:
+                for row in rows:
+                    on_result(row["backend"], dict(row))
+            return self.sanitize_results(pd.DataFrame(rows))
+        qasm_code = ir.qasm
+        stages.add("parse", ir.parse_started_ns, int(ir.parse_time * 1e9))
+        spans, memory = {}, {}
+
+        def emit(name, metrics):
+            # Spans go to the trace only, never into rows, caches or history
+            if 'spans' in metrics:
+                spans[name] = metrics.pop('spans')
+            if name in memory:
+                metrics.setdefault('memory_estimate_mb', memory[name] / MB)
+            if on_result is None:
+                return
+            row = dict(metrics, parse_time=ir.parse_time, circuit_hash=ir.hash)
+            row.setdefault('cache_hit', False)
+            self._attach_fidelity([row], ir)
+            on_result(name, row)
+
+        backend_names = [b for b in simulators if b in selected_backends]
+        hardware_names = []
+        if self.hardware_available:
+            hardware_names = [b for b in selected_backends if b not in simulators]
+
+        # Hardware queues while the simulators run
+        hw_jobs, hw_rows = [], []
+        if hardware_names:
+            stages.lap("hardware_submit")
+            hw_jobs, hw_rows = self.submit_hardware(ir, hardware_names, shots=shots)
+
+        stages.lap("cache_lookup")
+        run_options = {"warmup": warmup, "repeats": repeats, "shots": shots, "method": method, "cprofile": cprofile,
+                       "precision": precision}
+        # The PennyLane device changes timings without being a per-run option
+        cache_options = dict(run_options, pennylane_device=self.pennylane_device)
+        # "auto" is keyed by the method it resolves to now, which follows free memory
+        backend_options = {name: dict(cache_options, method=self.routed_method(name, ir, method, precision))
+                           for name in backend_names}
+        cached, to_run = {}, []
+        for name in backend_names:
+            hit = None
+            if use_cache and self.cache is not None:
+                hit = self._cache_lookup(qasm_code, name, backend_options[name])
+            if hit is not None:
+                cached[name] = hit
+                emit(name, hit)
+            else:
+                to_run.append(name)
+
+        if to_run:
+            # Built up front and saved to disk (at any width it is built for), so worker
+            # processes map the file instead of recomputing it; runs count it in their estimate
+            stages.lap("reference")
+            self._build_reference(ir, timeout, cancel_event)
+        stages.lap("admission")
+        memory.update({name: self.estimate_memory(name, ir, method, precision, shots) for name in to_run})
+        stages.lap("backends")
+        if parallel and to_run:
+            fresh = self._run_parallel(ir, to_run, max_workers, timeout, cancel_event, run_options, emit, memory)
+        else:
+            fresh = []
+            for name in to_run:
+                fresh.append(self._run_admitted(name, ir, memory[name], timeout, cancel_event, run_options))
+                emit(name, fresh[-1])
+        fresh = dict(zip(to_run, fresh))
+        for name, metrics in fresh.items():
+            metrics.setdefault('memory_estimate_mb', memory[name] / MB)
+
+        stages.lap("cache_store")
+        for name, metrics in fresh.items():
+            metrics['cache_hit'] = False
+            if 'spans' in metrics:
+                spans[name] = metrics.pop('spans')
+            if self.cache is not None:
+                self._cache_store(qasm_code, name, backend_options[name], metrics)
+
+        data = [cached[name] if name in cached else fresh[name] for name in backend_names]
+        if hw_jobs:
+            stages.lap("hardware_wait")
+            hw_rows += self.collect_hardware(hw_jobs, wait=hardware_wait)
+        for row in hw_rows:
+            emit(row['backend'], row)
+        data += hw_rows
+        for row in data:
+            row['parse_time'] = ir.parse_time
+            row['circuit_hash'] = ir.hash
+        stages.lap("fidelity")
+        self._attach_fidelity(data, ir)
+        stages.lap("sanitize")
+        df = self.sanitize_results(pd.DataFrame(data))
+        stages.lap("history")
+        self._record_history(df, cache_options, ir.hash)
+        stages.stop()
+        df.attrs["trace"] = chrome_trace(
+            [{"backend": "execute_benchmark", "spans": stages.events}]
+            + [{"backend": name, "spans": spans[name]} for name in backend_names if name in spans]
+        )
+        return df
+
+    def export_trace(self, results, path):
+        """
+        Writes the spans of one execute_benchmark call (its DataFrame, or the
+        trace from its attrs) as Chrome trace JSON (open in ui.perfetto.dev or
+        chrome://tracing). Returns the path, or None if there is no trace.
+        """
+        trace = results.attrs.get("trace") if hasattr(results, "attrs") else results
+        if trace is None:
+            return None
+        return write_chrome_trace(trace, path)
+
+    def _record_history(self, df, options=None, circuit_hash=None):
+        if self.history is None:
+            return
+        try:
+            self.history.record(df, options, circuit_hash=circuit_hash)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Benchmark history write failed: {e}")
+
+
+def _finish_stages(metrics, stages):
+    # Per-stage columns for the DataFrame; raw spans for the Chrome trace
+    stages.stop()
+    metrics.update(stages.columns())
+    metrics['spans'] = stages.events
+
+
+def _outcome_row(backend_name, outcome):
+    # run_isolated outcome -> runner metrics dict (failures become error rows)
+    status, value = outcome
+    if status == "ok":
+        return value
+    b_type = "Simulator" if backend_name in simulator_backends() else "Hardware"
+    return {"backend": backend_name, "type": b_type, "error": value, "probs": None}
+
+
+def _run_backend_task(credentials, backend_name, qasm_code, run_options):
+    # Entry point inside worker processes: rebuild the analyzer from plain data
+    analyzer = QBenchAnalyzer(cache=False, history=False, **credentials)
+    return analyzer.run_backend(backend_name, qasm_code, **run_options)
+
+
+# --- BUILT-IN BACKENDS ---
+register_backend(BackendPlugin(
+    "Qiskit Aer", lambda analyzer, qasm, **kw: analyzer.run_qiskit(qasm, **kw),
+    modules=("qiskit",), loader=_load_aer, package="qiskit-aer",
+))
+register_backend(BackendPlugin(
+    "Cirq", lambda analyzer, qasm, **kw: analyzer.run_cirq(qasm, **kw),
+    modules=("cirq", "cirq.contrib.qasm_import"), package="cirq",
+))
+register_backend(BackendPlugin(
+    "PennyLane", lambda analyzer, qasm, **kw: analyzer.run_pennylane(qasm, **kw),
+    modules=("qiskit",), loader=load_pennylane, package="pennylane",
+))
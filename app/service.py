@@ -0,0 +1,244 @@
+"""
+HTTP benchmark service: several users share one benchmark box instead of
+each holding a Streamlit session open for a whole run.
+
+    uvicorn app.service:api --host 0.0.0.0 --port 8000
+
+    POST   /jobs               {"qasm": "...", "backends": ["Qiskit Aer", "Cirq"]} -> 202 {"job_id": ...}
+    GET    /jobs/{id}          status plus every per-backend row finished so far
+    GET    /jobs/{id}/events   the same rows as Server-Sent Events, as each backend finishes
+    DELETE /jobs/{id}          cancel a queued or running job
+
+Only local simulators are served; no IBM credentials are ever loaded.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.admission import PRECISIONS, default_controller
+from app.backends import simulator_backends
+from app.memory import MB
+from app.runner import QBenchAnalyzer, SIMULATOR_BACKENDS
+from app.workers import DEFAULT_TIMEOUT
+
+# Jobs running at once; each runs its backends one at a time in a worker process.
+# All jobs share one memory admission controller, so wide circuits wait for each other.
+MAX_CONCURRENT_JOBS = int(os.environ.get("QBENCH_MAX_JOBS", "2"))
+MAX_QUEUED_JOBS = int(os.environ.get("QBENCH_MAX_QUEUED", "32"))
+MAX_RETAINED_JOBS = 200
+SSE_KEEPALIVE = 15.0  # seconds
+
+FINAL_STATES = ("done", "failed", "cancelled", "timeout")
+
+
+class JobRequest(BaseModel):
+    qasm: str
+    backends: List[str] = SIMULATOR_BACKENDS
+    shots: Optional[int] = None
+    warmup: int = 0
+    repeats: int = 1
+    method: str = "auto"
+    precision: str = "double"
+    use_cache: bool = True
+    timeout: float = DEFAULT_TIMEOUT  # seconds for the whole job
+
+
+def _record(analyzer, row):
+    # One sanitized, JSON-safe row (pandas handles NaN and numpy scalars)
+    import pandas as pd
+
+    df = analyzer.sanitize_results(pd.DataFrame([row])).drop(columns=["probs"], errors="ignore")
+    return json.loads(df.to_json(orient="records", default_handler=str))[0]
+
+
+class BenchmarkJob:
+    def __init__(self, request):
+        self.id = uuid.uuid4().hex
+        self.request = request
+        self.status = "queued"
+        self.error = None
+        self.rows = []
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.changed = threading.Condition()
+
+    def update(self, **fields):
+        with self.changed:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self.changed.notify_all()
+
+    def add_row(self, row):
+        with self.changed:
+            self.rows.append(row)
+            self.changed.notify_all()
+
+    def summary(self):
+        return {
+            "job_id": self.id, "status": self.status, "error": self.error,
+            "backends": self.request.backends,
+            "completed": len(self.rows), "created_at": self.created_at,
+            "started_at": self.started_at, "finished_at": self.finished_at,
+            "results": list(self.rows),
+        }
+
+
+class JobQueue:
+    """
+    Bounded job pool: at most max_jobs run at once, at most max_queued wait,
+    and a job that outlives its timeout is cancelled (its worker processes
+    are killed by workers.run_isolated).
+    """
+
+    def __init__(self, max_jobs=MAX_CONCURRENT_JOBS, max_queued=MAX_QUEUED_JOBS):
+        self.max_queued = max_queued
+        self._pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="qbench-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def counts(self):
+        with self._lock:
+            statuses = [j.status for j in self._jobs.values()]
+        return {s: statuses.count(s) for s in ("queued", "running")}
+
+    def submit(self, request):
+        unknown = [b for b in request.backends if b not in simulator_backends()]
+        if unknown:
+            raise ValueError(f"Only local simulators are served; unknown backends: {', '.join(unknown)}")
+        if not request.backends:
+            raise ValueError("Select at least one backend")
+        if request.precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{request.precision}'")
+
+        job = BenchmarkJob(request)
+        with self._lock:
+            if sum(j.status == "queued" for j in self._jobs.values()) >= self.max_queued:
+                raise OverflowError("Job queue is full, retry later")
+            self._jobs[job.id] = job
+            # Forget the oldest finished jobs
+            finished = [k for k, j in self._jobs.items() if j.status in FINAL_STATES]
+            for key in finished[:max(0, len(self._jobs) - MAX_RETAINED_JOBS)]:
+                del self._jobs[key]
+        self._pool.submit(self._run, job)
+        return job
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel_event.set()
+            if job.status == "queued":
+                job.update(status="cancelled", finished_at=time.time())
+        return job
+
+    def _run(self, job):
+        if job.cancel_event.is_set():
+            return
+        req = job.request
+        job.update(status="running", started_at=time.time())
+        deadline = threading.Timer(req.timeout, job.cancel_event.set)
+        deadline.daemon = True
+        deadline.start()
+        try:
+            # A fresh analyzer per job: no shared in-process caches between job threads
+            analyzer = QBenchAnalyzer()
+            analyzer.execute_benchmark(
+                req.qasm, req.backends, parallel=True, max_workers=1, timeout=req.timeout,
+                cancel_event=job.cancel_event, warmup=req.warmup, repeats=req.repeats,
+                use_cache=req.use_cache, shots=req.shots, method=req.method, precision=req.precision,
+                on_result=lambda name, row: job.add_row(_record(analyzer, row)),
+            )
+            if not job.cancel_event.is_set():
+                status = "done"
+            elif time.time() - job.started_at >= req.timeout:
+                status = "timeout"
+            else:
+                status = "cancelled"
+            job.update(status=status, finished_at=time.time())
+        except Exception as e:
+            job.update(status="failed", error=str(e), finished_at=time.time())
+        finally:
+            deadline.cancel()
+
+    def events(self, job):
+        """Yields SSE frames: one "result" event per backend row, then "end"."""
+        sent = 0
+        while True:
+            with job.changed:
+                if sent == len(job.rows) and job.status not in FINAL_STATES:
+                    job.changed.wait(SSE_KEEPALIVE)
+                rows, status = job.rows[sent:], job.status
+            for row in rows:
+                yield f"event: result\ndata: {json.dumps(row)}\n\n"
+            sent += len(rows)
+            if status in FINAL_STATES:
+                yield f"event: end\ndata: {json.dumps({'status': status, 'error': job.error})}\n\n"
+                return
+            if not rows:
+                yield ": keepalive\n\n"
+
+
+queue = JobQueue()
+api = FastAPI(title="QBench Service", description="Queued simulator benchmarks over HTTP.")
+
+
+@api.get("/health")
+def health():
+    admission = default_controller()
+    budget = admission.budget
+    return {
+        "backends": simulator_backends(), "jobs": queue.counts(), "max_jobs": MAX_CONCURRENT_JOBS,
+        "memory_budget_mb": budget / MB if budget is not None else None,
+        "memory_reserved_mb": admission.reserved / MB,
+    }
+
+
+@api.post("/jobs", status_code=202)
+def submit_job(request: JobRequest):
+    try:
+        job = queue.submit(request)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except OverflowError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"job_id": job.id, "status": job.status}
+
+
+def _job_or_404(job_id):
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No job {job_id}")
+    return job
+
+
+@api.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    return _job_or_404(job_id).summary()
+
+
+@api.get("/jobs/{job_id}/events")
+def job_events(job_id: str):
+    job = _job_or_404(job_id)
+    return StreamingResponse(queue.events(job), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+@api.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    _job_or_404(job_id)
+    job = queue.cancel(job_id)
+    return {"job_id": job.id, "status": job.status}
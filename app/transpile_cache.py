@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from app.cache import DEFAULT_CACHE_DIR, framework_versions
+
+
+def backend_fingerprint(backend):
+    """
+    Identifies everything about a target that changes transpiler output:
+    name, basis gates, coupling map and (for devices) the calibration date.
+    """
+    if backend is None:
+        return "generic"
+
+    info = {"name": getattr(backend, "name", str(backend))}
+    target = getattr(backend, "target", None)
+    try:
+        info["basis"] = sorted(target.operation_names) if target is not None else None
+    except Exception:
+        info["basis"] = None
+    try:
+        coupling = backend.coupling_map
+        info["coupling"] = sorted(map(tuple, coupling.get_edges())) if coupling is not None else None
+    except Exception:
+        info["coupling"] = None
+    try:
+        props = backend.properties()
+        info["calibrated"] = str(props.last_update_date) if props is not None else None
+    except Exception:
+        info["calibrated"] = None
+    return hashlib.sha256(json.dumps(info, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class TranspileCache:
+    """
+    Two-level cache of transpiled circuits: an in-process LRU dict in front of
+    QPY files on disk. Callers get a fresh copy plus "cached" or "cold" so
+    reports can say whether compilation_time was actually spent compiling.
+    """
+
+    def __init__(self, directory=None, max_entries=128):
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, "transpiled")
+        self.max_entries = max_entries
+        # Shared by every session of a cached analyzer
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError:
+            self.directory = None
+
+    def key(self, circuit_key, backend, optimization_level):
+        payload = {
+            "circuit": circuit_key,
+            "target": backend_fingerprint(backend),
+            "level": optimization_level,
+            "qiskit": framework_versions().get("qiskit"),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _remember(self, key, circuit):
+        with self._lock:
+            self._memory[key] = circuit
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, f"{key}.qpy")
+        if not os.path.exists(path):
+            return None
+        try:
+            from qiskit import qpy
+            with open(path, "rb") as f:
+                return qpy.load(f)[0]
+        except Exception:
+            return None
+
+    def _save(self, key, circuit):
+        if not self.directory:
+            return
+        try:
+            from qiskit import qpy
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".qpy.tmp")
+            with os.fdopen(fd, "wb") as f:
+                qpy.dump(circuit, f)
+            os.replace(tmp, os.path.join(self.directory, f"{key}.qpy"))
+        except Exception as e:
+            print(f"Transpile cache write failed: {e}")
+
+    def transpile(self, qc, backend, optimization_level, circuit_key):
+        """Returns (transpiled_copy, "cached" | "cold")."""
+        key = self.key(circuit_key, backend, optimization_level)
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key].copy(), "cached"
+
+        loaded = self._load(key)
+        if loaded is not None:
+            self._remember(key, loaded)
+            return loaded.copy(), "cached"
+
+        from qiskit import transpile
+        if backend is None:
+            transpiled = transpile(qc, optimization_level=optimization_level)
+        else:
+            transpiled = transpile(qc, backend=backend, optimization_level=optimization_level)
+        self._remember(key, transpiled)
+        self._save(key, transpiled)
+        return transpiled.copy(), "cold"
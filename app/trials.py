@@ -0,0 +1,105 @@
+import numpy as np
+
+from app.memory import MEMORY_COLUMNS
+from app.profiling import STAGE_PREFIX
+
+# Metrics that get repeated-trial statistics
+TIMED_METRICS = ["compilation_time", "execution_time", "total_latency"]
+STAT_SUFFIXES = ["median", "p95", "std", "ci_low", "ci_high"]
+
+
+def bootstrap_ci(samples, n_boot=2000, confidence=0.95, seed=0):
+    """Percentile bootstrap confidence interval of the median."""
+    samples = np.asarray(samples, dtype=float)
+    if samples.size < 2:
+        value = float(samples[0]) if samples.size else float("nan")
+        return value, value
+    rng = np.random.default_rng(seed)
+    resamples = rng.choice(samples, size=(n_boot, samples.size), replace=True)
+    medians = np.median(resamples, axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(medians, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def summarize(samples, n_boot=2000, confidence=0.95):
+    samples = np.asarray(samples, dtype=float)
+    ci_low, ci_high = bootstrap_ci(samples, n_boot, confidence)
+    return {
+        "median": float(np.median(samples)),
+        "p95": float(np.percentile(samples, 95)),
+        "std": float(np.std(samples, ddof=1)) if samples.size > 1 else 0.0,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+
+def run_trials(run_fn, warmup=1, repeats=5):
+    """
+    Repeated-trial wrapper around a runner.
+
+    `run_fn(track_memory=...)` must return a runner metrics dict. The engine
+    does `warmup` untimed calls (imports, device construction, JIT caches),
+    then `repeats` timed calls with the memory tracer off, then a single
+    separate pass with the tracer on for the memory figures. Headline timing
+    columns hold the median; `<metric>_median/_p95/_std/_ci_low/_ci_high`
+    hold the distribution. Per-stage `stage_*` columns hold the median too.
+    """
+    for _ in range(warmup):
+        res = run_fn(track_memory=False)
+        if 'error' in res:
+            return res
+
+    timed = []
+    for _ in range(max(repeats, 1)):
+        res = run_fn(track_memory=False)
+        if 'error' in res:
+            return res
+        timed.append(res)
+
+    # Memory pass: outcomes and circuit metrics come from here too
+    result = run_fn(track_memory=True)
+    if 'error' in result:
+        return result
+    # Shots actually sampled (routing may have switched to sampling)
+    shots = (round(result['throughput_shots_sec'] * result['execution_time'])
+             if result.get('throughput_shots_sec') and result.get('execution_time') else None)
+
+    for metric in TIMED_METRICS:
+        samples = [r[metric] for r in timed if r.get(metric) is not None]
+        if not samples:
+            continue
+        stats = summarize(samples)
+        result[metric] = stats["median"]
+        for suffix in STAT_SUFFIXES:
+            result[f"{metric}_{suffix}"] = stats[suffix]
+
+    # Stage columns from the timed calls too, not from the traced memory pass
+    for key in [k for k in result if k.startswith(STAGE_PREFIX)]:
+        samples = [r[key] for r in timed if r.get(key) is not None]
+        if samples:
+            result[key] = float(np.median(samples))
+
+    # Throughput follows the headline time, not the traced memory pass
+    if shots and result.get('execution_time'):
+        result['throughput_shots_sec'] = shots / result['execution_time']
+
+    result['warmup_runs'] = warmup
+    result['trials'] = len(timed)
+    return result
+
+
+def run_once(run_fn):
+    """
+    Single run without trial statistics. The timed call runs with the memory
+    tracer off, since tracemalloc slows Python-level code inside the timed
+    section; a separate untimed pass with the tracer on supplies only the
+    memory columns.
+    """
+    result = run_fn(track_memory=False)
+    if 'error' in result:
+        return result
+    traced = run_fn(track_memory=True)
+    if 'error' not in traced:
+        result.update({k: traced[k] for k in MEMORY_COLUMNS if k in traced})
+    return result
@@ -0,0 +1,271 @@
+"""
+Configuration sweep: the same circuit under every combination of thread
+count and simulator option, each in a fresh worker process with BLAS and
+OpenMP pinned to that thread count, to size hardware and pick per-backend
+defaults.
+
+    python -m app.tuning circuit.qasm --threads 1 2 4 8 16
+    python -m app.tuning circuit.qasm --option fusion_enable=True,False \\
+        --option "Qiskit Aer:blocking_enable=False,True" --output sweep.csv
+"""
+import argparse
+import ast
+import itertools
+import os
+import sys
+
+from app.workers import DEFAULT_TIMEOUT, WorkerTask, run_isolated
+
+# Every common BLAS / OpenMP runtime reads one of these at import time
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS",
+]
+# Simulator option that takes the thread count directly; the others follow OMP_NUM_THREADS
+THREAD_OPTIONS = {"Qiskit Aer": "max_parallel_threads"}
+# Options swept by default, per backend
+OPTION_GRIDS = {
+    "Qiskit Aer": {"fusion_enable": [True, False]},
+    "Cirq": {"split_untangled_states": [True, False]},
+    "PennyLane": {},
+}
+
+
+def thread_env(threads):
+    return {var: str(threads) for var in THREAD_ENV_VARS}
+
+
+def default_thread_counts(max_threads=None):
+    """1, 2, 4, ... up to the core count, which is always included."""
+    max_threads = max_threads or os.cpu_count() or 1
+    counts = [2 ** i for i in range(max_threads.bit_length()) if 2 ** i <= max_threads]
+    return sorted(set(counts + [max_threads]))
+
+
+def option_grid(grid):
+    """{"a": [1, 2], "b": [x]} -> [{"a": 1, "b": x}, {"a": 2, "b": x}]; {} -> [{}]."""
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def _options_label(options):
+    return ", ".join(f"{k}={v}" for k, v in sorted(options.items())) or "defaults"
+
+
+def _run_config(backend_name, qasm_code, run_options, pennylane_device):
+    # Entry point inside worker processes, after the thread env is applied
+    from app.runner import QBenchAnalyzer
+
+    analyzer = QBenchAnalyzer(cache=False, history=False, pennylane_device=pennylane_device)
+    metrics = analyzer.run_backend(backend_name, qasm_code, **run_options)
+    metrics.pop('probs', None)
+    metrics.pop('spans', None)
+    return metrics
+
+
+def run_config_sweep(qasm_code, backends=None, threads=None, grids=None, warmup=1, repeats=3,
+                     shots=None, method="auto", precision="double", pennylane_device="auto",
+                     timeout=DEFAULT_TIMEOUT, on_progress=None):
+    """
+    One row per (backend, options, threads). Configurations run one at a time
+    so they never share cores; timing columns are medians over `repeats`.
+    """
+    import pandas as pd
+
+    from app.runner import SIMULATOR_BACKENDS
+
+    backends = backends or SIMULATOR_BACKENDS
+    threads = threads or default_thread_counts()
+    grids = OPTION_GRIDS if grids is None else grids
+
+    tasks, configs = [], {}
+    for backend in backends:
+        for options in option_grid(grids.get(backend, {})):
+            for t in threads:
+                sim_options = dict(options)
+                if backend in THREAD_OPTIONS:
+                    sim_options[THREAD_OPTIONS[backend]] = t
+                run_options = {"warmup": warmup, "repeats": repeats, "shots": shots, "method": method,
+                               "precision": precision, "sim_options": sim_options}
+                key = len(tasks)
+                configs[key] = {"backend": backend, "options": _options_label(options), "threads": t}
+                tasks.append(WorkerTask(key, _run_config, (backend, qasm_code, run_options, pennylane_device),
+                                        env=thread_env(t)))
+
+    done = [0]
+
+    def on_result(key, outcome):
+        done[0] += 1
+        if on_progress:
+            on_progress(done[0], len(tasks))
+
+    outcomes = run_isolated(tasks, max_workers=1, timeout=timeout, on_result=on_result)
+    rows = []
+    for key, config in configs.items():
+        status, value = outcomes[key]
+        row = dict(value) if status == "ok" else {"error": value}
+        row.update(config)
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    if "error" not in df.columns:
+        df["error"] = None
+    return add_speedup(df)
+
+
+def add_speedup(df, metric="execution_time"):
+    """
+    speedup = time at the fewest threads / time, per (backend, options);
+    efficiency = speedup / (threads / fewest threads). 1.0 is linear scaling.
+    """
+    df = df.copy()
+    df["speedup"] = float("nan")
+    df["efficiency"] = float("nan")
+    if metric not in df.columns:
+        return df
+    ok = df["error"].isna() & (df[metric] > 0)
+    for _, group in df[ok].groupby(["backend", "options"]):
+        base = group.loc[group["threads"].idxmin()]
+        speedup = base[metric] / group[metric]
+        df.loc[group.index, "speedup"] = speedup
+        df.loc[group.index, "efficiency"] = speedup / (group["threads"] / base["threads"])
+    return df
+
+
+def best_configs(df, metric="execution_time"):
+    """Fastest (options, threads) per backend: the candidate production default."""
+    if metric not in df.columns:
+        return df.iloc[0:0]
+    ok = df[df["error"].isna() & df[metric].notna()]
+    if ok.empty:
+        return ok
+    best = ok.loc[ok.groupby("backend")[metric].idxmin()]
+    return best[["backend", "options", "threads", metric, "speedup", "efficiency"]].reset_index(drop=True)
+
+
+def plot_thread_scaling(df):
+    """Speedup (with the ideal line) and parallel efficiency against threads."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    df = df[df["speedup"].notna()]
+    if df.empty:
+        return None
+
+    sns.set_theme(style="whitegrid")
+    fig, (ax_speed, ax_eff) = plt.subplots(1, 2, figsize=(14, 5))
+    fig.suptitle("QBench: Thread Scaling", fontsize=20, y=1.02)
+    for (backend, options), grp in df.groupby(["backend", "options"]):
+        grp = grp.sort_values("threads")
+        label = f"{backend} ({options})"
+        ax_speed.plot(grp["threads"], grp["speedup"], marker="o", label=label)
+        ax_eff.plot(grp["threads"], grp["efficiency"], marker="o", label=label)
+
+    threads = sorted(df["threads"].unique())
+    ax_speed.plot(threads, [t / threads[0] for t in threads], "k--", linewidth=1, label="ideal")
+    for ax, title in ((ax_speed, "Speedup"), (ax_eff, "Parallel Efficiency")):
+        ax.set_xscale("log", base=2)
+        ax.set_xlabel("Threads")
+        ax.set_title(title, fontsize=13, fontweight='bold')
+        ax.legend(fontsize='x-small')
+    ax_eff.axhline(1.0, color="k", linestyle="--", linewidth=1)
+    ax_eff.set_ylim(bottom=0)
+
+    plt.tight_layout()
+    return fig
+
+
+def parse_option(text):
+    """
+    Parses "[BACKEND:]name=v1,v2" into (backend or None, name, values), e.g.
+    "Qiskit Aer:fusion_threshold=14,20" -> ("Qiskit Aer", "fusion_threshold", [14, 20]).
+    Values are Python literals, or strings when they do not parse as one.
+    """
+    target, _, values = text.partition("=")
+    backend, _, name = target.rpartition(":")
+    name = name.strip()
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"Expected [BACKEND:]name=value[,value...], got '{text}'")
+
+    def literal(value):
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return value
+
+    return backend.strip() or None, name, [literal(v.strip()) for v in values.split(",")]
+
+
+def option_grids(options, backends):
+    """
+    Sweep grids per backend from parsed --option values. An option goes to
+    the backend it names, or else to every backend whose OPTION_GRIDS define
+    it (every selected backend when none do). Backends with options sweep
+    only those; the others keep their default grid.
+    """
+    grids = {}
+    for backend, name, values in options:
+        if backend is not None:
+            if backend not in backends:
+                raise ValueError(f"--option targets '{backend}', which is not among the selected backends")
+            targets = [backend]
+        else:
+            targets = [b for b in backends if name in OPTION_GRIDS.get(b, {})] or list(backends)
+        for target in targets:
+            grids.setdefault(target, {})[name] = values
+    return {b: grids.get(b, OPTION_GRIDS.get(b, {})) for b in backends}
+
+
+def main(argv=None):
+    from app.admission import PRECISIONS
+    from app.analysis import SIM_METHODS
+    from app.runner import SIMULATOR_BACKENDS
+
+    parser = argparse.ArgumentParser(description="Sweep thread counts and simulator options for one circuit.")
+    parser.add_argument("circuit", help="QASM file")
+    parser.add_argument("-b", "--backends", nargs="+", default=SIMULATOR_BACKENDS)
+    parser.add_argument("-t", "--threads", nargs="+", type=int, default=None,
+                        help="thread counts (default: powers of two up to the core count)")
+    parser.add_argument("--option", type=parse_option, action="append", default=[],
+                        help="simulator option grid, e.g. fusion_enable=True,False or "
+                             "'Qiskit Aer:blocking_enable=False,True'; unprefixed names go to the backends whose "
+                             "default grid has them (all selected backends if none does). A backend given options "
+                             "sweeps only those, the others keep their default grid; repeat for more options")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--shots", type=int, default=None)
+    parser.add_argument("--method", choices=["auto"] + SIM_METHODS, default="auto")
+    parser.add_argument("--precision", choices=PRECISIONS, default="double")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per configuration")
+    parser.add_argument("-o", "--output", default=None, help="CSV file for every configuration")
+    parser.add_argument("--plot", default=None, help="image file for the speedup/efficiency curves")
+    args = parser.parse_args(argv)
+
+    with open(args.circuit) as f:
+        qasm_code = f.read()
+    grids = None
+    if args.option:
+        try:
+            grids = option_grids(args.option, args.backends)
+        except ValueError as e:
+            parser.error(str(e))
+
+    df = run_config_sweep(
+        qasm_code, args.backends, threads=args.threads, grids=grids, warmup=args.warmup, repeats=args.repeats,
+        shots=args.shots, method=args.method, precision=args.precision, timeout=args.timeout,
+        on_progress=lambda done, total: print(f"[{done}/{total}]", file=sys.stderr),
+    )
+    columns = ["backend", "options", "threads", "execution_time", "total_latency", "speedup", "efficiency", "error"]
+    print(df[[c for c in columns if c in df.columns]].to_string(index=False))
+    print("\nFastest configuration per backend:")
+    print(best_configs(df).to_string(index=False))
+    if args.output:
+        df.to_csv(args.output, index=False)
+    if args.plot:
+        fig = plot_thread_scaling(df)
+        if fig:
+            fig.savefig(args.plot, bbox_inches="tight")
+    return 1 if df["error"].notna().all() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
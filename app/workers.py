@@ -0,0 +1,159 @@
+import multiprocessing as mp
+import os
+import pickle
+import time
+from multiprocessing.connection import wait
+
+DEFAULT_TIMEOUT = 600  # seconds per task
+
+
+class WorkerTask:
+    """
+    A picklable callable plus the key its outcome is reported under.
+    `memory` is the estimated peak in bytes, checked by run_isolated's admission.
+    `env` is applied in the worker before the callable's modules are imported,
+    so it can pin OMP_NUM_THREADS and friends.
+    """
+
+    def __init__(self, key, fn, args=(), kwargs=None, timeout=None, memory=0, env=None):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.timeout = timeout
+        self.memory = memory
+        self.env = env
+
+
+def _worker_main(conn, fn, args, kwargs, env=None):
+    try:
+        if env:
+            os.environ.update(env)
+            # Pickled in the parent so unpickling (and importing numpy & co.) happens after the env is set
+            fn, args, kwargs = pickle.loads(fn)
+        conn.send(("ok", fn(*args, **kwargs)))
+    except BaseException as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def _stop(proc):
+    if proc.is_alive():
+        proc.terminate()
+        proc.join(5)
+        if proc.is_alive():
+            proc.kill()
+    proc.join()
+
+
+def run_isolated(tasks, max_workers=None, timeout=DEFAULT_TIMEOUT, cancel_event=None,
+                 on_result=None, mp_context="spawn", admission=None):
+    """
+    Runs every task in its own process, at most `max_workers` at a time.
+
+    Returns {key: ("ok", value) | ("error", message)}. A task that exceeds its
+    timeout is terminated, a crashed worker (segfault, OOM kill...) is reported
+    as an error, and setting `cancel_event` stops everything still queued or
+    running. `on_result(key, outcome)` fires as soon as each task finishes.
+
+    With an `admission` controller (app.admission), a task only starts once
+    its memory estimate is reserved: it waits in the queue while running
+    tasks hold the memory, and fails at once if it could never fit.
+    """
+    ctx = mp.get_context(mp_context)
+    pending = list(tasks)
+    max_workers = max(1, max_workers or min(len(pending), os.cpu_count() or 1))
+    running = {}  # conn -> (task, process, deadline)
+    outcomes = {}
+
+    def release(task):
+        if admission is not None and task.memory:
+            admission.release(task.memory)
+
+    def finish(task, outcome):
+        outcomes[task.key] = outcome
+        if on_result:
+            on_result(task.key, outcome)
+
+    try:
+        if admission is not None:
+            # Runs that could never fit fail up front instead of waiting their turn
+            for task in [t for t in pending if t.memory]:
+                try:
+                    admission.check(task.memory)
+                except MemoryError as e:
+                    pending.remove(task)
+                    finish(task, ("error", f"Rejected: {e}"))
+
+        while pending or running:
+            if cancel_event is not None and cancel_event.is_set():
+                for conn, (task, proc, _) in list(running.items()):
+                    _stop(proc)
+                    conn.close()
+                    release(task)
+                    finish(task, ("error", "Cancelled"))
+                running.clear()
+                for task in pending:
+                    finish(task, ("error", "Cancelled"))
+                pending = []
+                break
+
+            # Fill free slots
+            while pending and len(running) < max_workers:
+                task = pending[0]
+                if admission is not None and task.memory:
+                    try:
+                        if not admission.try_reserve(task.memory):
+                            break  # queued until running tasks free their memory
+                    except MemoryError as e:
+                        pending.pop(0)
+                        finish(task, ("error", f"Rejected: {e}"))
+                        continue
+                pending.pop(0)
+                parent_conn, child_conn = ctx.Pipe(duplex=False)
+                if task.env:
+                    payload = (pickle.dumps((task.fn, task.args, task.kwargs)), (), {}, task.env)
+                else:
+                    payload = (task.fn, task.args, task.kwargs)
+                proc = ctx.Process(target=_worker_main, args=(child_conn, *payload), daemon=True)
+                proc.start()
+                # Parent keeps only the read end so a dead child shows up as EOF
+                child_conn.close()
+                limit = task.timeout if task.timeout is not None else timeout
+                deadline = time.monotonic() + limit if limit else None
+                running[parent_conn] = (task, proc, deadline)
+
+            # Enforce per-task deadlines
+            now = time.monotonic()
+            for conn, (task, proc, deadline) in list(running.items()):
+                if deadline is not None and now > deadline:
+                    _stop(proc)
+                    conn.close()
+                    del running[conn]
+                    release(task)
+                    limit = task.timeout if task.timeout is not None else timeout
+                    finish(task, ("error", f"Timeout: no result after {limit:.0f}s"))
+
+            if pending and not running:
+                time.sleep(0.1)  # memory held by other callers sharing the controller
+            for conn in wait(list(running), timeout=0.1) if running else []:
+                task, proc, _ = running.pop(conn)
+                try:
+                    outcome = conn.recv()
+                except (EOFError, OSError):
+                    outcome = None
+                conn.close()
+                proc.join(5)
+                if outcome is None:
+                    _stop(proc)
+                    outcome = ("error", f"Worker crashed (exit code {proc.exitcode})")
+                release(task)
+                finish(task, outcome)
+    finally:
+        for conn, (task, proc, _) in running.items():
+            _stop(proc)
+            conn.close()
+            release(task)
+
+    return outcomes
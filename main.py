@@ -1,27 +1,61 @@
-import sys
-try:
-    sys.modules['pennylane_lightning'] = None
-    sys.modules['pennylane_lightning.qubit'] = None
-    sys.modules['controller_wrappers'] = None
-except: pass
+import json
 
 import streamlit as st
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 
+from app.admission import PRECISIONS
+from app.analysis import SIM_METHODS
+from app.cache import circuit_hash
+from app.pennylane_convert import PENNYLANE_DEVICES
+from app.profiling import STAGE_PREFIX
+from app.plotting import aggregate_results, chart_frame, downsample, resource_matrix
 from app.runner import QBenchAnalyzer, plot_master_dashboard
 
+MAX_MEMOIZED_RUNS = 8
+# Above this many result rows the dashboard starts on the interactive charts
+INTERACTIVE_CHART_ROWS = 12
+HARDWARE_LIST_TTL = 300  # seconds
+ANALYZER_TTL = 3600  # seconds
+
 
 st.set_page_config(page_title="QBench Pro", layout="wide")
 
-# CSS INJECTION
+# --- SESSION RESOURCES ---
 import base64
+import hashlib
+
+@st.cache_data(show_spinner=False)
 def get_base64(bin_file):
     with open(bin_file, 'rb') as f:
         data = f.read()
     return base64.b64encode(data).decode()
 
+def credential_hash(*parts):
+    return hashlib.sha256("\x00".join(p or "" for p in parts).encode()).hexdigest()
+
+# Each analyzer holds reference states, converters and a hardware session: keep
+# a few credential/device combinations, and drop them after ANALYZER_TTL
+@st.cache_resource(show_spinner=False, max_entries=4, ttl=ANALYZER_TTL)
+def get_analyzer(cred_hash, offline_hardware, pennylane_device, _ibm_token, _ibm_crn):
+    # Keyed by the credential hash; underscore args stay out of Streamlit's cache key
+    return QBenchAnalyzer(ibm_token=_ibm_token, ibm_crn=_ibm_crn, offline_hardware=offline_hardware,
+                          pennylane_device=pennylane_device)
+
+# History reads are keyed on the store's newest row id: widget reruns reuse them
+# until a new run is recorded
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_history(store_path, revision, hist_hash, _store):
+    # The full-row JSON stays in SQLite; the expander never shows it
+    return _store.load(circuit_hash=hist_hash).drop(columns=["data"])
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def history_regressions(store_path, revision, metric, by, hist_hash, _store):
+    return _store.regressions(metric, by=by, circuit_hash=hist_hash)
+
+@st.cache_data(ttl=HARDWARE_LIST_TTL, show_spinner=False)
+def fetch_hardware(cred_hash, offline_hardware, _analyzer):
+    return _analyzer.get_available_hardware()
+
+# CSS INJECTION
 try:
     bg_code = get_base64("assets/bg.png")
     st.markdown(
@@ -75,9 +109,19 @@ st.sidebar.header("1. Configuration")
 st.sidebar.info("To run on Hardware, you need an IBM Quantum Account (IBM Cloud).")
 ibm_crn = st.sidebar.text_input("IBM Cloud CRN", type="password")
 ibm_api = st.sidebar.text_input("IBM API Key", type="password")
+offline_hardware = st.sidebar.checkbox(
+    "Offline hardware (fake backends)", value=False,
+    help="Use qiskit-ibm-runtime's local fake devices instead of IBM Cloud."
+)
+pennylane_device = st.sidebar.selectbox(
+    "PennyLane device", PENNYLANE_DEVICES,
+    help="auto benchmarks lightning.qubit where it loads and falls back to default.qubit. "
+         "Set QBENCH_PENNYLANE_SAFE_IMPORT=1 if lightning's DLLs crash on import (Windows)."
+)
 
-# Initialize Analyzer with credentials if provided
-analyzer = QBenchAnalyzer(ibm_token=ibm_api, ibm_crn=ibm_crn)
+# Analyzer (and its IBM handshake) lives as long as the credentials stay the same
+cred_hash = credential_hash(ibm_api, ibm_crn)
+analyzer = get_analyzer(cred_hash, offline_hardware, pennylane_device, ibm_api, ibm_crn)
 
 st.sidebar.header("2. Select Backends")
 simulators = st.sidebar.multiselect(
@@ -91,22 +135,70 @@ if 'hardware_list' not in st.session_state:
     st.session_state.hardware_list = []
 
 if st.sidebar.button("Fetch Available Hardware"):
-    if not ibm_api:
+    if not ibm_api and not offline_hardware:
         st.sidebar.error("Please enter an API Key first.")
     else:
         with st.sidebar:
             with st.spinner("Connecting to IBM Cloud..."):
-                fetched = analyzer.get_available_hardware()
+                fetched = fetch_hardware(cred_hash, offline_hardware, analyzer)
                 if fetched:
                     st.session_state.hardware_list = fetched
                     st.success(f"Found {len(fetched)} devices!")
                 else:
+                    # Don't pin a failed lookup for the whole TTL
+                    fetch_hardware.clear()
                     st.warning("No devices found or Auth failed.")
 
 hardware_options = st.session_state.hardware_list
 
 selected_hardware = st.sidebar.multiselect("Quantum Hardware", hardware_options)
 
+if st.sidebar.button("Collect Queued Hardware Results"):
+    with st.spinner("Polling queued jobs..."):
+        hw_df = analyzer.load_hardware_results()
+    if hw_df.empty:
+        st.sidebar.info("No finished jobs in the ledger.")
+    else:
+        st.subheader("Collected Hardware Results")
+        st.dataframe(hw_df.drop(columns=['probs'], errors='ignore'))
+
+st.sidebar.header("3. Execution")
+run_parallel = st.sidebar.checkbox(
+    "Run backends in parallel", value=False,
+    help="Each backend runs in its own process. Faster overall, but simulators compete for CPU."
+)
+backend_timeout = st.sidebar.number_input(
+    "Per-backend timeout (s)", min_value=10, value=600, step=10,
+    help="Kills a backend's worker process after this long, so it only applies in parallel mode and to "
+         "the thread sweep. Sequential runs cannot be interrupted; there it only limits the wait for memory."
+)
+warmup_runs = st.sidebar.number_input("Warmup runs", min_value=0, value=0, step=1)
+timed_repeats = st.sidebar.number_input(
+    "Timed repetitions", min_value=1, value=1, step=1,
+    help="More than one switches to median timings with p95 and bootstrap confidence intervals."
+)
+sim_shots = st.sidebar.number_input(
+    "Shots (0 = exact statevector)", min_value=0, value=0, step=1000,
+    help="Sample simulators with the same shot count as hardware, for comparable throughput and fidelity."
+)
+sim_method = st.sidebar.selectbox(
+    "Simulation method", ["auto"] + SIM_METHODS,
+    help="auto keeps exact statevector up to the local limit and routes larger circuits to "
+         "stabilizer, extended stabilizer or MPS simulation based on their structure."
+)
+use_cache = st.sidebar.checkbox(
+    "Reuse cached results", value=True,
+    help="Untick to force fresh timings for an unchanged circuit and backend selection."
+)
+sim_precision = st.sidebar.selectbox(
+    "Precision", PRECISIONS + ["both"],
+    help="single runs complex64 statevectors at half the memory; both benchmarks them side by side."
+)
+use_cprofile = st.sidebar.checkbox(
+    "Profile with cProfile", value=False,
+    help="Runs each simulator under cProfile; the .prof path and hottest functions land in the results."
+)
+
 # --- MAIN ---
 col1, col2 = st.columns([2, 1])
 
@@ -127,50 +219,241 @@ rx(0.5) q[0];
 with col2:
     run_btn = st.button("RUN BENCHMARK", type="primary", use_container_width=True)
 
+# Results are memoized per session: an unchanged circuit + backend selection
+# re-renders instantly instead of re-simulating on every widget interaction
+all_backends = simulators + selected_hardware
+run_key = (
+    cred_hash, offline_hardware, circuit_hash(qasm_code), tuple(all_backends),
+    run_parallel, int(backend_timeout), int(warmup_runs), int(timed_repeats), int(sim_shots),
+    sim_method, pennylane_device, use_cprofile, sim_precision,
+)
+if 'results' not in st.session_state:
+    st.session_state.results = {}
+if 'traces' not in st.session_state:
+    st.session_state.traces = {}
+if 'figures' not in st.session_state:
+    st.session_state.figures = {}
+
 if run_btn:
-    all_backends = simulators + selected_hardware
-    
     if not all_backends:
         st.error("Select at least one backend!")
-    else:
+    elif not use_cache or run_key not in st.session_state.results:
         with st.spinner(f"Benchmarking on {len(all_backends)} devices..."):
             # Pass the combined list of strings (simulators + hardware names)
-            df = analyzer.execute_benchmark(qasm_code, all_backends)
-            
-            if df.empty:
-                st.error("No data returned. Check your backend selection.")
+            import pandas as pd
+
+            # Live chart: re-aggregated and redrawn as each backend's row arrives
+            live_rows = []
+            live_chart = st.empty()
+
+            def show_row(name, row):
+                live_rows.append(row)
+                live = aggregate_results(pd.DataFrame(live_rows), by=["backend"], metrics=["total_latency"])
+                if not live.empty:
+                    live_chart.bar_chart(chart_frame(live, "total_latency"))
+
+            frames = []
+            for precision in (PRECISIONS if sim_precision == "both" else [sim_precision]):
+                # Hardware is submitted once; only the simulators have a precision knob
+                backends = simulators if frames else all_backends
+                frame = analyzer.execute_benchmark(
+                    qasm_code, backends, parallel=run_parallel, timeout=backend_timeout,
+                    warmup=int(warmup_runs), repeats=int(timed_repeats), use_cache=use_cache,
+                    shots=int(sim_shots) or None, method=sim_method, cprofile=use_cprofile,
+                    precision=precision, on_result=show_row
+                )
+                trace = frame.attrs.get("trace")
+                if frames and not frame.empty:
+                    # Distinct labels so the charts show both precisions per backend
+                    frame['backend'] = frame['backend'] + f" ({precision})"
+                frames.append(frame)
+            st.session_state.results[run_key] = pd.concat(frames, ignore_index=True)
+            st.session_state.traces[run_key] = trace
+            st.session_state.figures.pop(run_key, None)
+            live_chart.empty()
+            # Keep only the most recent runs
+            while len(st.session_state.results) > MAX_MEMOIZED_RUNS:
+                oldest = next(iter(st.session_state.results))
+                st.session_state.results.pop(oldest)
+                st.session_state.traces.pop(oldest, None)
+                st.session_state.figures.pop(oldest, None)
+
+df = st.session_state.results.get(run_key)
+if df is not None:
+    if df.empty:
+        st.error("No data returned. Check your backend selection.")
+    else:
+        st.success("Benchmark Complete!")
+        
+        # METRICS TABS
+        tab1, tab2, tab3, tab4 = st.tabs(["Master Dashboard", "Data Table", "Memory Matrix", "Stages"])
+        
+        with tab1:
+            interactive = st.checkbox(
+                "Interactive charts", value=len(df) > INTERACTIVE_CHART_ROWS,
+                help="Lightweight per-metric charts of the aggregated medians instead of the full figure."
+            )
+            if interactive:
+                agg = aggregate_results(df, by=["backend"])
+                if agg.empty:
+                    st.warning("Not enough data to plot.")
+                for metric in agg["metric"].unique():
+                    st.caption(metric.replace("_", " ").title())
+                    st.bar_chart(chart_frame(agg, metric))
             else:
-                st.success("Benchmark Complete!")
-                
-                # METRICS TABS
-                tab1, tab2, tab3 = st.tabs(["Master Dashboard", "Data Table", "Memory Matrix"])
-                
-                with tab1:
-                    fig = plot_master_dashboard(df)
-                    if fig: st.pyplot(fig)
-                    else: st.warning("Not enough data to plot.")
-
-                with tab2:
-                    # Clean display dataframe
-                    display_df = df.drop(columns=['counts'], errors='ignore')
-                    st.dataframe(display_df)
-
-                with tab3:
-                    st.subheader("Memory & Resource Matrix")
-                    cols_to_show = ['backend', 'type', 'memory_mb', 'total_latency', 'fidelity']
-                    valid_cols = [c for c in cols_to_show if c in df.columns]
-                    st.dataframe(df[valid_cols])
+                # Built once per run; widget reruns reuse the figure
+                if run_key not in st.session_state.figures:
+                    st.session_state.figures[run_key] = plot_master_dashboard(df)
+                fig = st.session_state.figures[run_key]
+                if fig: st.pyplot(fig)
+                else: st.warning("Not enough data to plot.")
+
+        with tab2:
+            # Clean display dataframe
+            display_df = df.drop(columns=['probs'], errors='ignore')
+            st.dataframe(display_df)
+
+        with tab3:
+            st.subheader("Memory & Resource Matrix")
+            cols_to_show = ['backend', 'type', 'precision', 'memory_estimate_mb', 'memory_mb', 'python_heap_mb', 'native_mb', 'peak_rss_mb', 'total_latency', 'fidelity', 'state_fidelity', 'tvd']
+            valid_cols = [c for c in cols_to_show if c in df.columns]
+            st.dataframe(df[valid_cols])
+            
+            if len(df) > 1 and 'fidelity' in df.columns:
+                st.write("### Resource Heatmap")
+                try:
+                    # Medians per backend, so repeated rows collapse into one cell
+                    h_data = resource_matrix(df)
+                    # Colors are normalized per column; annotations keep the raw medians
+                    spread = (h_data.max() - h_data.min()).replace(0, 1)
+                    normalized_df = (h_data - h_data.min()) / spread
                     
-                    if len(df) > 1 and 'fidelity' in df.columns:
-                        st.write("### Resource Heatmap")
-                        try:
-                            # Pivot data for heatmap
-                            h_data = df.set_index('backend')[['memory_mb', 'total_latency', 'fidelity']]
-                            # Normalize columns for better heatmap visualization
-                            normalized_df = (h_data - h_data.min()) / (h_data.max() - h_data.min())
-                            
-                            fig_heat, ax_heat = plt.subplots(figsize=(8, 5))
-                            sns.heatmap(h_data, annot=True, cmap="YlGnBu", ax=ax_heat)
-                            st.pyplot(fig_heat)
-                        except Exception as e:
-                            st.info(f"Heatmap unavailable: {e}")
+                    import matplotlib.pyplot as plt
+                    import seaborn as sns
+
+                    fig_heat, ax_heat = plt.subplots(figsize=(8, max(3, 0.6 * len(h_data) + 2)))
+                    sns.heatmap(normalized_df, annot=h_data, fmt=".3g", cmap="YlGnBu", cbar=False, ax=ax_heat)
+                    st.pyplot(fig_heat)
+                except Exception as e:
+                    st.info(f"Heatmap unavailable: {e}")
+
+        with tab4:
+            st.subheader("Per-Stage Breakdown")
+            stage_cols = [c for c in df.columns if c.startswith(STAGE_PREFIX)]
+            if stage_cols:
+                stages_df = df.set_index('backend')[stage_cols].fillna(0.0)
+                stages_df.columns = [c[len(STAGE_PREFIX):] for c in stage_cols]
+                st.bar_chart(stages_df)
+                st.dataframe(stages_df)
+            else:
+                st.info("No stage timings (cached or hardware-only results).")
+            trace = st.session_state.traces.get(run_key)
+            if trace is not None:
+                st.download_button(
+                    "Download Chrome trace (JSON)", json.dumps(trace), "qbench_trace.json",
+                    help="Open in ui.perfetto.dev or chrome://tracing."
+                )
+            if 'cprofile_top' in df.columns:
+                for _, row in df[df['cprofile_top'].notna()].iterrows():
+                    with st.expander(f"cProfile: {row['backend']}"):
+                        st.caption(row.get('cprofile_path') or "profile not saved")
+                        st.code(row['cprofile_top'])
+
+# --- HISTORY ---
+st.markdown("---")
+with st.expander("Benchmark History (no re-run needed)"):
+    from app.history import HISTORY_METRICS
+
+    if analyzer.history is None:
+        st.info("The history store is unavailable on this machine.")
+    else:
+        hist_scope = st.radio("Circuits", ["Current circuit", "All circuits"], horizontal=True)
+        hist_metric = st.selectbox("Metric", HISTORY_METRICS, index=HISTORY_METRICS.index("total_latency"))
+        hist_hash = circuit_hash(qasm_code) if hist_scope == "Current circuit" else None
+        hist_revision = analyzer.history.revision()
+        hist_df = load_history(analyzer.history.path, hist_revision, hist_hash, analyzer.history)
+        if hist_df.empty:
+            st.info("No recorded runs yet.")
+        else:
+            trend = hist_df.pivot_table(index="recorded_at", columns="backend", values=hist_metric)
+            st.line_chart(downsample(trend))
+
+            hist_by = st.radio("Compare", ["version", "time"], horizontal=True,
+                               help="version: newest framework version vs the previous one. "
+                                    "time: last 5 runs vs the 5 before them.")
+            report = history_regressions(analyzer.history.path, hist_revision, hist_metric, hist_by, hist_hash,
+                                         analyzer.history)
+            if report.empty:
+                st.caption("Not enough runs per backend to compare yet.")
+            else:
+                flagged = int(report["regression"].sum())
+                if flagged: st.error(f"{flagged} significant slowdown(s) in {hist_metric}")
+                st.dataframe(report.drop(columns=["options"]))
+            st.dataframe(hist_df.drop(columns=["versions"]))
+
+# --- THREAD SCALING ---
+st.markdown("---")
+with st.expander("Thread Scaling (simulator options sweep)"):
+    from app.tuning import OPTION_GRIDS, best_configs, default_thread_counts, plot_thread_scaling, run_config_sweep
+
+    st.caption(
+        "Runs the circuit above once per (thread count, simulator option) in a fresh process with "
+        "BLAS/OpenMP pinned to that thread count. Configurations run one at a time."
+    )
+    all_counts = default_thread_counts()
+    tune_threads = st.multiselect("Thread counts", all_counts, default=all_counts)
+    tune_options = st.checkbox(
+        "Sweep simulator options", value=True,
+        help=", ".join(f"{b}: {', '.join(g) or 'threads only'}" for b, g in OPTION_GRIDS.items())
+    )
+    if st.button("RUN THREAD SWEEP"):
+        if not simulators or not tune_threads:
+            st.error("Select at least one simulator and thread count!")
+        else:
+            progress = st.progress(0.0)
+            tune_df = run_config_sweep(
+                qasm_code, simulators, threads=sorted(tune_threads), grids=None if tune_options else {},
+                warmup=max(int(warmup_runs), 1), repeats=max(int(timed_repeats), 3),
+                shots=int(sim_shots) or None, method=sim_method,
+                precision="double" if sim_precision == "both" else sim_precision,
+                pennylane_device=pennylane_device, timeout=backend_timeout,
+                on_progress=lambda done, total: progress.progress(done / total),
+            )
+            fig_threads = plot_thread_scaling(tune_df)
+            if fig_threads: st.pyplot(fig_threads)
+            else: st.warning("No successful runs to plot.")
+            st.write("### Fastest configuration per backend")
+            st.dataframe(best_configs(tune_df))
+            st.dataframe(tune_df)
+            st.download_button("Download thread sweep (CSV)", tune_df.to_csv(index=False), "qbench_threads.csv")
+
+# --- SCALING SWEEP ---
+st.markdown("---")
+with st.expander("Scaling Sweep (generated circuit families)"):
+    from app.circuits import CIRCUIT_FAMILIES, plot_scaling, run_sweep
+    sweep_families = st.multiselect("Circuit families", list(CIRCUIT_FAMILIES), default=["ghz", "qft"])
+    sweep_precision = "double" if sim_precision == "both" else sim_precision
+    # Past the statevector limit (what fits in memory) only structure-aware methods can run
+    sv_limit = analyzer.statevector_limit(precision=sweep_precision)
+    sweep_limit = sv_limit if sim_method == "statevector" else 4 * sv_limit
+    sweep_max_qubits = st.slider("Max qubits", min_value=2, max_value=sweep_limit, value=min(12, sweep_limit), step=1)
+    sweep_step = st.number_input("Qubit step", min_value=1, value=2, step=1)
+
+    if st.button("RUN SWEEP"):
+        if not simulators:
+            st.error("Select at least one simulator!")
+        else:
+            progress = st.progress(0.0)
+            sweep_df = run_sweep(
+                analyzer, families=sweep_families,
+                qubits=range(2, sweep_max_qubits + 1, int(sweep_step)),
+                backends=simulators, parallel=run_parallel, timeout=backend_timeout,
+                warmup=int(warmup_runs), repeats=int(timed_repeats), use_cache=use_cache,
+                shots=int(sim_shots) or None, method=sim_method, precision=sweep_precision,
+                on_progress=lambda done, total: progress.progress(done / total),
+            )
+            fig_scale = plot_scaling(sweep_df)
+            if fig_scale: st.pyplot(fig_scale)
+            else: st.warning("No successful runs to plot.")
+            st.dataframe(sweep_df)
+            st.download_button("Download sweep (CSV)", sweep_df.to_csv(index=False), "qbench_sweep.csv")
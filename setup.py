@@ -20,9 +20,13 @@ setup(
         "pandas",
         "numpy"
     ],
+    extras_require={
+        "parquet": ["pyarrow"],
+    },
     entry_points={
         "console_scripts": [
-            "quantumbench=streamlit.web.cli:main_run_cl"
+            "quantumbench=streamlit.web.cli:main_run_cl",
+            "qbench=app.cli:main"
         ]
     },
 )
\ No newline at end of file
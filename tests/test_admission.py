@@ -0,0 +1,51 @@
+import pytest
+
+from app.admission import (AMPLITUDE_BYTES, BASE_OVERHEAD, FALLBACK_STATEVECTOR_QUBITS, AdmissionController,
+                           AdmissionRejected, estimate_memory, qasm_num_qubits, statevector_qubit_limit)
+from app.memory import MB
+
+
+def test_statevector_estimate_doubles_per_qubit_and_halves_in_single():
+    base = estimate_memory(20, "statevector", backend="Qiskit Aer") - BASE_OVERHEAD
+    assert estimate_memory(21, "statevector", backend="Qiskit Aer") - BASE_OVERHEAD == 2 * base
+    assert estimate_memory(20, "statevector", "single", backend="Qiskit Aer") - BASE_OVERHEAD == base // 2
+
+
+def test_reference_state_adds_one_double_precision_copy():
+    plain = estimate_memory(10, "statevector", "single")
+    assert estimate_memory(10, "statevector", "single", reference=True) - plain == AMPLITUDE_BYTES["double"] * 2 ** 10
+
+
+def test_stabilizer_is_polynomial():
+    assert estimate_memory(1000, "stabilizer") < BASE_OVERHEAD + 10 * MB
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        estimate_memory(4, "tensor_network")
+
+
+def test_qubit_limit_is_the_widest_fit():
+    budget = estimate_memory(22, "statevector", backend="Cirq")
+    assert statevector_qubit_limit(budget, backend="Cirq") == 22
+    assert statevector_qubit_limit(budget - 1, backend="Cirq") == 21
+    assert statevector_qubit_limit(budget, "single", backend="Cirq") == 23
+    assert statevector_qubit_limit(None) == FALLBACK_STATEVECTOR_QUBITS
+
+
+def test_qasm_num_qubits_sums_registers():
+    assert qasm_num_qubits("qreg a[3];\nqreg b [ 4 ];\ncreg c[7];") == 7
+
+
+def test_controller_queues_then_rejects():
+    controller = AdmissionController(budget=100)
+    assert controller.try_reserve(60)
+    assert not controller.try_reserve(60)  # fits only once the first run finishes
+    controller.release(60)
+    assert controller.try_reserve(60)
+    with pytest.raises(AdmissionRejected):
+        controller.try_reserve(101)
+    with pytest.raises(AdmissionRejected):
+        with controller.reserve(50, timeout=0.1):
+            pass
+    assert controller.reserved == 60
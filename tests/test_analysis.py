@@ -0,0 +1,45 @@
+import pytest
+
+from app.analysis import BACKEND_METHODS, MAX_NON_CLIFFORD_EXTENDED, resolve_method, select_method
+
+
+def profile(num_qubits, clifford=False, non_clifford=0, distance=1):
+    return {"num_qubits": num_qubits, "clifford": clifford, "non_clifford_count": non_clifford,
+            "max_interaction_distance": distance}
+
+
+def test_statevector_whenever_it_fits():
+    assert select_method(profile(20, non_clifford=500, distance=19), 24) == "statevector"
+
+
+def test_large_circuits_route_by_structure():
+    assert select_method(profile(100, clifford=True), 24) == "stabilizer"
+    assert select_method(profile(40, non_clifford=MAX_NON_CLIFFORD_EXTENDED), 24) == "extended_stabilizer"
+    assert select_method(profile(40, non_clifford=100, distance=2), 24) == "matrix_product_state"
+    assert select_method(profile(40, non_clifford=100, distance=30), 24) is None
+
+
+def test_resolve_auto_raises_when_nothing_fits():
+    with pytest.raises(ValueError, match="too large"):
+        resolve_method(profile(40, non_clifford=100, distance=30), "auto", 24)
+
+
+def test_resolve_validates_explicit_methods():
+    assert resolve_method(profile(4), "matrix_product_state", 24) == "matrix_product_state"
+    with pytest.raises(ValueError, match="Unknown"):
+        resolve_method(profile(4), "density_matrix", 24)
+    with pytest.raises(ValueError, match="too large"):
+        resolve_method(profile(30), "statevector", 24)
+    with pytest.raises(ValueError, match="Clifford"):
+        resolve_method(profile(4, non_clifford=1), "stabilizer", 24)
+
+
+def test_backends_route_only_to_methods_they_have():
+    cirq = BACKEND_METHODS["Cirq"]
+    assert select_method(profile(100, clifford=True), 24, cirq) == "stabilizer"
+    assert select_method(profile(40, non_clifford=1), 24, cirq) is None
+    assert resolve_method(profile(100, clifford=True), "auto", 24, "PennyLane") == "stabilizer"
+    with pytest.raises(ValueError, match="Cirq has no 'matrix_product_state'"):
+        resolve_method(profile(4), "matrix_product_state", 24, "Cirq")
+    with pytest.raises(ValueError, match="too large"):
+        resolve_method(profile(40, non_clifford=1), "auto", 24, "PennyLane")
@@ -0,0 +1,54 @@
+import os
+
+from app.cache import ResultCache, canonicalize_qasm, circuit_hash, result_key
+
+BELL = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+h q[0];
+cx q[0],q[1];
+"""
+
+
+def test_canonical_form_ignores_whitespace_comments_and_barriers():
+    messy = """OPENQASM 2.0;   include "qelib1.inc";
+    qreg q[ 2 ];  // two qubits
+    h q[0];
+    barrier q[0], q[1];
+    cx q[0] , q[1];"""
+    assert canonicalize_qasm(messy) == canonicalize_qasm(BELL)
+    assert circuit_hash(messy) == circuit_hash(BELL)
+
+
+def test_hash_changes_with_the_program():
+    assert circuit_hash(BELL) != circuit_hash(BELL.replace("h q[0]", "x q[0]"))
+
+
+def test_result_key_separates_backends_options_and_kinds():
+    keys = {
+        result_key(BELL, "Cirq"),
+        result_key(BELL, "Qiskit Aer"),
+        result_key(BELL, "Cirq", {"shots": 100}),
+        result_key(BELL, "Cirq", kind="outcome"),
+    }
+    assert len(keys) == 4
+
+
+def test_cache_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = result_key(BELL, "Cirq")
+    assert cache.get(key) is None
+    cache.put(key, {"execution_time": 0.5})
+    assert cache.get(key) == {"execution_time": 0.5}
+
+
+def test_evict_drops_least_recently_used_first(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    for i, key in enumerate(["old", "read", "new"]):
+        cache.put(key, b"x" * 1000)
+        os.utime(cache._path(key), (i * 100, i * 100))
+    cache.get("old")  # a read refreshes the mtime, so "read" is now the oldest
+
+    cache.max_bytes = 2500  # room for two entries
+    cache.evict()
+    assert sorted(os.listdir(tmp_path)) == ["new.pkl", "old.pkl"]
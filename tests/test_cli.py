@@ -0,0 +1,42 @@
+import json
+
+from app.cli import JsonlSink, find_circuits
+
+
+def write_rows(path, rows, tail=""):
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+        f.write(tail)
+
+
+def test_completed_counts_successful_rows_only(tmp_path):
+    path = tmp_path / "results.jsonl"
+    write_rows(path, [
+        {"circuit_hash": "a", "backend": "Cirq", "error": None},
+        {"circuit_hash": "a", "backend": "Qiskit Aer"},
+        {"circuit_hash": "b", "backend": "Cirq", "error": "Timeout: no result after 600s"},
+    ], tail='{"circuit_hash": "c", "backe')  # torn line from an interrupted run
+
+    assert JsonlSink(str(path)).completed() == {("a", "Cirq"), ("a", "Qiskit Aer")}
+
+
+def test_retried_circuit_counts_once_it_succeeds(tmp_path):
+    path = tmp_path / "results.jsonl"
+    write_rows(path, [
+        {"circuit_hash": "b", "backend": "Cirq", "error": "Worker crashed (exit code -9)"},
+        {"circuit_hash": "b", "backend": "Cirq", "error": None},
+    ])
+    assert JsonlSink(str(path)).completed() == {("b", "Cirq")}
+
+
+def test_missing_output_has_nothing_completed(tmp_path):
+    assert JsonlSink(str(tmp_path / "none.jsonl")).completed() == set()
+
+
+def test_find_circuits_expands_directories(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ("a.qasm", "sub/b.qasm2", "notes.txt"):
+        (tmp_path / name).write_text("")
+    found = find_circuits([str(tmp_path)])
+    assert [p[len(str(tmp_path)) + 1:] for p in found] == ["a.qasm", "sub/b.qasm2"]
@@ -0,0 +1,42 @@
+import multiprocessing as mp
+
+import pytest
+
+from app.hardware import JobLedger
+
+
+def _add_jobs(path, start, count):
+    ledger = JobLedger(path)
+    for i in range(start, start + count):
+        ledger.add({"job_id": f"job-{i}", "status": "SUBMITTED"})
+
+
+def test_concurrent_writers_keep_every_job(tmp_path):
+    path = str(tmp_path / "jobs.json")
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else None
+    if ctx is None:
+        pytest.skip("needs fork")
+    procs = [ctx.Process(target=_add_jobs, args=(path, i * 25, 25)) for i in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(60)
+
+    ids = [e["job_id"] for e in JobLedger(path).load()]
+    assert sorted(ids) == sorted(f"job-{i}" for i in range(100))
+
+
+def test_update_and_pending(tmp_path):
+    ledger = JobLedger(str(tmp_path / "jobs.json"))
+    _add_jobs(ledger.path, 0, 3)
+    ledger.update("job-1", status="DONE", finished_at=1.0)
+
+    assert [e["job_id"] for e in ledger.pending()] == ["job-0", "job-2"]
+    assert next(e for e in ledger.load() if e["job_id"] == "job-1")["finished_at"] == 1.0
+
+
+def test_missing_or_corrupt_ledger_is_empty(tmp_path):
+    path = tmp_path / "jobs.json"
+    assert JobLedger(str(path)).load() == []
+    path.write_text("{not json")
+    assert JobLedger(str(path)).load() == []
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+import app.history as history
+from app.history import HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.sqlite"))
+
+
+@pytest.fixture
+def record(store, monkeypatch):
+    def record(latencies, version, recorded_at):
+        # Hardware rows: their version is qiskit-ibm-runtime's
+        monkeypatch.setattr(history, "framework_versions", lambda: {"qiskit-ibm-runtime": version})
+        for i, latency in enumerate(latencies):
+            df = pd.DataFrame([{"backend": "ibm_fake", "type": "Hardware", "total_latency": latency}])
+            store.record(df, {"shots": 100}, circuit_hash="c1", host="h", recorded_at=recorded_at + i)
+    return record
+
+
+def test_version_regression_is_flagged(store, record):
+    record([1.0, 1.02, 0.98, 1.01, 0.99, 1.0], "1.0", 0)
+    record([2.0, 2.05, 1.95, 2.02, 1.98, 2.0], "1.1", 100)
+
+    report = store.regressions("total_latency", by="version")
+    assert len(report) == 1
+    row = report.iloc[0]
+    assert (row["baseline"], row["candidate"]) == ("1.0", "1.1")
+    assert row["change"] == pytest.approx(1.0, rel=0.05)
+    assert row["p_value"] < 0.05
+    assert bool(row["regression"])
+
+
+def test_noise_is_not_a_regression(store, record):
+    record([1.0, 1.3, 0.8, 1.2, 0.9], "1.0", 0)
+    record([1.1, 0.9, 1.25, 0.85, 1.0], "1.0", 100)
+
+    report = store.regressions("total_latency", by="time", window=5)
+    assert len(report) == 1
+    assert not bool(report.iloc[0]["regression"])
+
+
+def test_revision_follows_inserts(store, record):
+    assert store.revision() == 0
+    record([1.0], "1.0", 0)
+    assert store.revision() == 1
+    assert store.regressions("total_latency").empty
+
+
+def test_connections_are_closed(store, monkeypatch):
+    opened = []
+    connect = history.sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(history.sqlite3, "connect", tracking_connect)
+    store.revision()
+    store.load()
+    assert len(opened) == 2
+    for conn in opened:
+        with pytest.raises(history.sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
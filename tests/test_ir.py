@@ -0,0 +1,30 @@
+import pytest
+
+from app.cache import circuit_hash
+
+pytest.importorskip("qiskit")
+
+from app.ir import as_ir  # noqa: E402
+
+BELL = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+creg c[2];
+h q[0];
+cx q[0],q[1];
+measure q -> c;
+"""
+
+
+def test_ir_hash_is_the_canonical_hash():
+    ir = as_ir(BELL)
+    assert ir.hash == circuit_hash(BELL)
+    assert as_ir(ir) is ir
+
+
+def test_base_drops_final_measurements_only():
+    ir = as_ir(BELL)
+    assert ir.num_qubits == 2
+    assert "measure" not in ir.base.count_ops()
+    assert ir.metrics["pre_gate_count"] == 2
+    assert ir.measured().count_ops()["measure"] == 2
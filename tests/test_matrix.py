@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from app.matrix import _requirements, compare_envs, summarize_speedups
+
+
+def rows(env, latency, ci=None, version=None, error=None):
+    row = {"env": env, "source": "ghz.qasm", "backend": "Qiskit Aer", "total_latency": latency,
+           "backend_version": version, "error": error}
+    if ci is not None:
+        row["total_latency_ci_low"], row["total_latency_ci_high"] = ci
+    return row
+
+
+def test_disjoint_intervals_are_significant():
+    df = pd.DataFrame([rows("old", 1.0, (0.9, 1.1), "0.15"), rows("new", 2.0, (1.9, 2.1), "0.16")])
+    report = compare_envs(df)
+
+    assert len(report) == 1
+    row = report.iloc[0]
+    assert (row["baseline"], row["candidate"]) == ("old", "new")
+    assert row["speedup"] == pytest.approx(0.5)
+    assert row["change"] == pytest.approx(1.0)
+    assert bool(row["significant"]) and bool(row["regression"]) and not bool(row["improvement"])
+
+
+def test_overlapping_intervals_are_not_significant():
+    df = pd.DataFrame([rows("old", 1.0, (0.5, 1.5)), rows("new", 1.3, (0.8, 1.8))])
+    row = compare_envs(df).iloc[0]
+    assert not bool(row["significant"]) and not bool(row["regression"])
+
+
+def test_baseline_choice_and_errors():
+    df = pd.DataFrame([rows("a", 2.0), rows("b", 1.0), rows("c", None, error="Build failed")])
+    report = compare_envs(df, baseline="b")
+    assert report["candidate"].tolist() == ["a"]
+    assert bool(report.iloc[0]["regression"])
+    with pytest.raises(ValueError):
+        compare_envs(df, baseline="missing")
+
+
+def test_summary_is_a_geometric_mean():
+    df = pd.DataFrame([rows("old", 1.0), rows("new", 0.5),
+                       dict(rows("old", 1.0), source="qft.qasm"), dict(rows("new", 2.0), source="qft.qasm")])
+    summary = summarize_speedups(compare_envs(df))
+    assert summary.iloc[0]["geomean_speedup"] == pytest.approx(1.0)
+    assert summary.iloc[0]["circuits"] == 2
+
+
+def test_framework_only_specs_still_get_qiskit():
+    assert _requirements(["cirq==1.4.1"]) == ["cirq==1.4.1", "numpy", "pandas", "qiskit"]
+
+
+def test_spec_pins_replace_the_unpinned_base():
+    reqs = _requirements(["qiskit==1.2.4", "qiskit-aer==0.15.1", "NumPy<2"])
+    assert reqs == ["NumPy<2", "pandas", "qiskit-aer==0.15.1", "qiskit==1.2.4"]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from app.plotting import AGGREGATE_COLUMNS, aggregate_results, chart_frame, downsample, resource_matrix
+
+
+def rows():
+    return pd.DataFrame({
+        "backend": ["Cirq"] * 4 + ["Qiskit Aer", "PennyLane"],
+        "execution_time": [1.0, 2.0, 3.0, 4.0, 5.0, 100.0],
+        "execution_time_ci_low": [None] * 4 + [4.5, None],
+        "execution_time_ci_high": [None] * 4 + [5.5, None],
+        "memory_mb": [10.0, 10.0, 20.0, 20.0, 30.0, None],
+        "error": [None] * 5 + ["Timeout"],
+    })
+
+
+def test_groups_get_medians_with_iqr_or_bootstrap_error_bars():
+    agg = aggregate_results(rows(), metrics=["execution_time", "memory_mb"]).set_index(["backend", "metric"])
+    assert "PennyLane" not in agg.index.get_level_values("backend")  # error row left out
+
+    cirq = agg.loc[("Cirq", "execution_time")]
+    assert (cirq["count"], cirq["median"], cirq["mean"]) == (4, 2.5, 2.5)
+    assert (cirq["err_low"], cirq["err_high"]) == (1.75, 3.25)
+
+    aer = agg.loc[("Qiskit Aer", "execution_time")]
+    assert (aer["count"], aer["err_low"], aer["err_high"]) == (1, 4.5, 5.5)
+    assert agg.loc[("Qiskit Aer", "memory_mb"), "err_low"] == 30.0
+
+
+def test_nothing_to_aggregate_gives_an_empty_frame():
+    agg = aggregate_results(rows(), metrics=["fidelity"])
+    assert agg.empty
+    assert list(agg.columns) == ["backend"] + AGGREGATE_COLUMNS
+
+
+def test_chart_frame_and_resource_matrix_are_wide_medians():
+    agg = aggregate_results(rows(), metrics=["execution_time"])
+    frame = chart_frame(agg, "execution_time")
+    assert frame["execution_time"].to_dict() == {"Cirq": 2.5, "Qiskit Aer": 5.0}
+
+    matrix = resource_matrix(rows(), metrics=("memory_mb", "execution_time", "fidelity"))
+    assert list(matrix.columns) == ["memory_mb", "execution_time"]
+    assert matrix.loc["Cirq", "memory_mb"] == 15.0
+    assert resource_matrix(rows(), metrics=("fidelity",)) is None
+
+
+def test_downsample_buckets_into_medians():
+    frame = pd.DataFrame({"t": np.arange(1000, dtype=float)}, index=np.arange(1000)[::-1])
+    small = frame.head(10)
+    assert downsample(small) is small
+
+    out = downsample(frame, max_points=100)
+    assert len(out) == 100
+    assert list(out.index[:2]) == [0, 10]  # sorted, first label of each bucket
+    assert out["t"].iloc[0] == np.median(np.arange(990, 1000))
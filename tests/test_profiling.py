@@ -0,0 +1,49 @@
+import json
+import os
+
+from app.profiling import StageTimer, chrome_trace, profile_call, write_chrome_trace
+
+
+def test_laps_are_back_to_back_and_summed_per_stage():
+    timer = StageTimer()
+    timer.add("parse", 0, 2_000_000_000)
+    timer.lap("transpile", level=2)
+    timer.lap("simulate")
+    timer.lap("transpile")
+    timer.stop()
+    timer.stop()  # idempotent
+
+    names = [e["name"] for e in timer.events]
+    assert names == ["parse", "transpile", "simulate", "transpile"]
+    assert timer.events[1]["args"] == {"level": 2}
+    for prev, nxt in zip(timer.events[1:], timer.events[2:]):
+        assert prev["start_ns"] + prev["dur_ns"] == nxt["start_ns"]
+
+    columns = timer.columns()
+    assert set(columns) == {"stage_parse", "stage_transpile", "stage_simulate"}
+    assert columns["stage_parse"] == 2.0
+    assert columns["stage_transpile"] == (timer.events[1]["dur_ns"] + timer.events[3]["dur_ns"]) / 1e9
+
+
+def test_chrome_trace_has_one_track_per_backend(tmp_path):
+    rows = [
+        {"backend": "Cirq", "spans": [{"name": "simulate", "start_ns": 5000, "dur_ns": 3000, "args": {}}]},
+        {"backend": "Qiskit Aer", "spans": None},
+    ]
+    trace = chrome_trace(rows)
+    events = trace["traceEvents"]
+    assert [e["args"]["name"] for e in events if e["name"] == "thread_name"] == ["Cirq", "Qiskit Aer"]
+    (slice_,) = [e for e in events if e["ph"] == "X"]
+    assert (slice_["tid"], slice_["ts"], slice_["dur"]) == (1, 5.0, 3.0)
+
+    path = write_chrome_trace(trace, str(tmp_path / "traces" / "run.json"))
+    with open(path) as f:
+        assert json.load(f) == trace
+
+
+def test_profile_call_saves_the_profile(tmp_path):
+    result, info = profile_call(lambda: sum(range(1000)), "Qiskit Aer/abc", directory=str(tmp_path))
+    assert result == 499500
+    assert os.path.basename(info["cprofile_path"]).startswith("Qiskit_Aer_abc-")
+    assert os.path.exists(info["cprofile_path"])
+    assert "function calls" in info["cprofile_top"]
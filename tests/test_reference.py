@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+
+from app.reference import ReferenceStates, state_fidelity
+
+
+def test_state_fidelity_ignores_global_phase():
+    psi = np.array([1, 1j]) / np.sqrt(2)
+    assert np.isclose(state_fidelity(psi, 1j * psi), 1.0)
+    assert np.isclose(state_fidelity([1, 0], [0, 1]), 0.0)
+    assert state_fidelity([1, 0], [1, 0, 0, 0]) is None
+
+
+def test_saved_states_load_memory_mapped(tmp_path):
+    refs = ReferenceStates(directory=str(tmp_path))
+    state = np.arange(8, dtype=np.complex128)
+    refs._save("a", state)
+    loaded = refs._load("a")
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, state)
+    assert refs._load("missing") is None
+
+
+def test_disk_is_trimmed_least_recently_used_first(tmp_path):
+    state = np.zeros(1024, dtype=np.complex128)  # 16 KiB
+    refs = ReferenceStates(directory=str(tmp_path))
+    for i, key in enumerate(["old", "mid", "new"]):
+        refs._save(key, state)
+        os.utime(tmp_path / f"{key}.npy", (1000 + i, 1000 + i))
+    refs._load("old")  # refreshes the mtime
+
+    refs.max_disk_bytes = 2 * state.nbytes + 1024
+    refs.evict()
+    assert sorted(os.listdir(tmp_path)) == ["new.npy", "old.npy"]
+
+
+def test_states_larger_than_the_disk_bound_are_not_written(tmp_path):
+    refs = ReferenceStates(directory=str(tmp_path), max_disk_mb=0.001)
+    refs._save("big", np.zeros(1024, dtype=np.complex128))
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    refs = ReferenceStates(directory=str(tmp_path))
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    refs._save("a", np.zeros(4, dtype=np.complex128))
+    assert os.listdir(tmp_path) == []
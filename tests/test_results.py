@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from app.results import MAX_INT_INDEX_QUBITS, ProbabilityResult, to_little_endian
+
+
+def test_from_bit_matrix_wide_register_keeps_exact_indices():
+    n = 100
+    bits = np.zeros((10, n), dtype=np.int64)
+    bits[5:] = 1
+    bits[9, 0] = 0  # one shot differs only in qubit 0, the least significant bit
+
+    result = ProbabilityResult.from_bit_matrix(bits)
+
+    assert result.indices.dtype == object
+    assert list(result.indices) == [0, 2 ** n - 2, 2 ** n - 1]
+    assert np.allclose(result.probs, [0.5, 0.1, 0.4])
+    assert result.top_k(2)[1] == ("1" * n, 0.4)
+
+
+def test_wide_sampled_result_matches_counts():
+    n = MAX_INT_INDEX_QUBITS + 2
+    bits = np.zeros((4, n), dtype=np.int64)
+    bits[2:] = 1
+    sampled = ProbabilityResult.from_bit_matrix(bits)
+    counts = ProbabilityResult.from_counts({"0" * n: 2, "1" * n: 2})
+
+    assert sampled.hellinger_fidelity(counts) == 1.0
+    assert sampled.total_variation_distance(counts) == 0.0
+
+
+def test_from_samples_wide_indices():
+    n = 80
+    result = ProbabilityResult.from_samples([2 ** 79, 0, 2 ** 79], n)
+    assert list(result.indices) == [0, 2 ** 79]
+    assert np.allclose(result.probs, [1 / 3, 2 / 3])
+
+
+def test_to_little_endian_reverses_qubit_order():
+    # Big-endian |01> (qubit 0 = 0, qubit 1 = 1) is index 1; little-endian puts qubit 1 at bit 1
+    sv = np.zeros(4, dtype=complex)
+    sv[1] = 1
+    assert np.flatnonzero(to_little_endian(sv)).tolist() == [2]
+
+    three = np.arange(8, dtype=complex)
+    expected = [three[int(format(i, "03b")[::-1], 2)] for i in range(8)]
+    assert to_little_endian(three).tolist() == expected
+
+
+def test_from_statevector_keeps_sparse_support():
+    sv = np.zeros(16, dtype=complex)
+    sv[0] = sv[15] = 1 / np.sqrt(2)
+    result = ProbabilityResult.from_statevector(sv)
+
+    assert result.is_sparse
+    assert result.num_qubits == 4
+    assert result.to_counts() == pytest.approx({"0000": 0.5, "1111": 0.5})
+
+
+def test_from_statevector_dense_when_support_is_large():
+    sv = np.full(8, 1 / np.sqrt(8), dtype=complex)
+    result = ProbabilityResult.from_statevector(sv)
+    assert not result.is_sparse
+    assert result.success_probability() == pytest.approx(1 / 8)
+
+
+def test_from_counts_merges_register_keys_and_normalises():
+    result = ProbabilityResult.from_counts({"01 10": 30, "0110": 10, "11 11": 60})
+
+    assert result.num_qubits == 4
+    assert result.to_counts() == pytest.approx({"0110": 0.4, "1111": 0.6})
+    assert result.top_k(1) == [("1111", pytest.approx(0.6))]
+
+
+def test_from_counts_empty():
+    result = ProbabilityResult.from_counts({}, num_qubits=3)
+    assert result.success_probability() == 0.0
+    assert result.top_k() == []
+
+
+def test_from_bit_matrix_column_i_is_bit_i():
+    # Qubit 0 set, qubit 1 clear: index 1, printed big-endian as "01"
+    bits = np.array([[1, 0], [1, 0], [0, 1], [1, 1]])
+    result = ProbabilityResult.from_bit_matrix(bits)
+    assert result.to_counts() == pytest.approx({"01": 0.5, "10": 0.25, "11": 0.25})
+
+
+def test_hellinger_and_tvd_dense_and_sparse_agree():
+    probs = np.array([0.5, 0.0, 0.0, 0.5])
+    dense = ProbabilityResult(probs, 2)
+    sparse = ProbabilityResult.from_counts({"00": 1, "11": 1})
+    other = ProbabilityResult.from_counts({"00": 1})
+
+    assert dense.hellinger_fidelity(dense) == pytest.approx(1.0)
+    assert dense.hellinger_fidelity(sparse) == pytest.approx(1.0)
+    assert sparse.hellinger_fidelity(other) == pytest.approx(0.5)
+    assert sparse.total_variation_distance(other) == pytest.approx(0.5)
+    assert dense.total_variation_distance(sparse) == pytest.approx(0.0)
+
+
+def test_different_widths_never_match():
+    a = ProbabilityResult.from_counts({"0": 1})
+    b = ProbabilityResult.from_counts({"00": 1})
+    assert a.hellinger_fidelity(b) == 0.0
+    assert a.total_variation_distance(b) == 1.0
@@ -0,0 +1,65 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.trials import bootstrap_ci, run_once, run_trials, summarize
+
+
+def test_bootstrap_ci_brackets_the_median():
+    samples = np.random.default_rng(1).normal(10, 1, 50)
+    low, high = bootstrap_ci(samples)
+    assert low < np.median(samples) < high
+    assert bootstrap_ci(samples) == (low, high)  # seeded
+    assert bootstrap_ci([3.0]) == (3.0, 3.0)
+
+
+def test_summarize_single_sample():
+    stats = summarize([2.0])
+    assert stats["median"] == stats["p95"] == stats["ci_low"] == stats["ci_high"] == 2.0
+    assert stats["std"] == 0.0
+
+
+def fake_runner(times):
+    """Runner whose execution_time is the next of `times`; traced calls are 10x slower."""
+    times = iter(times)
+    calls = []
+
+    def run(track_memory):
+        calls.append(track_memory)
+        t = next(times) * (10 if track_memory else 1)
+        return {"execution_time": t, "compilation_time": 0.5, "total_latency": t + 0.5,
+                "stage_simulate": t, "throughput_shots_sec": 1000 / t, "memory_mb": 64 if track_memory else 0}
+
+    return run, calls
+
+
+def test_timings_come_from_untraced_calls():
+    run, calls = fake_runner([9.0, 1.0, 2.0, 3.0, 5.0])
+    result = run_trials(run, warmup=1, repeats=3)
+    assert calls == [False, False, False, False, True]
+    assert result["execution_time"] == 2.0
+    assert result["execution_time_p95"] == pytest.approx(2.9)
+    assert result["stage_simulate"] == 2.0
+    assert result["memory_mb"] == 64
+    assert result["throughput_shots_sec"] == pytest.approx(500.0)
+    assert (result["warmup_runs"], result["trials"]) == (1, 3)
+
+
+def test_errors_stop_the_trials():
+    counter = itertools.count()
+
+    def run(track_memory):
+        return {"error": "boom"} if next(counter) == 1 else {"execution_time": 1.0}
+
+    assert run_trials(run, warmup=0, repeats=5) == {"error": "boom"}
+    assert next(counter) == 2
+
+
+def test_single_run_takes_memory_from_a_separate_pass():
+    run, calls = fake_runner([1.0, 1.0])
+    result = run_once(run)
+    assert calls == [False, True]
+    assert result["execution_time"] == 1.0
+    assert result["memory_mb"] == 64
+    assert "trials" not in result
@@ -0,0 +1,58 @@
+import argparse
+import math
+
+import pandas as pd
+import pytest
+
+from app.tuning import add_speedup, best_configs, default_thread_counts, option_grid, option_grids, parse_option
+
+
+def test_parse_option_literals_and_backend_prefix():
+    assert parse_option("fusion_threshold=14,20") == (None, "fusion_threshold", [14, 20])
+    assert parse_option("Qiskit Aer:fusion_enable=True,False") == ("Qiskit Aer", "fusion_enable", [True, False])
+    assert parse_option("method=auto") == (None, "method", ["auto"])
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_option("fusion_enable")
+
+
+def test_option_grid_is_the_cartesian_product():
+    assert option_grid({}) == [{}]
+    assert option_grid({"b": ["x"], "a": [1, 2]}) == [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}]
+
+
+def test_options_go_only_to_backends_that_take_them():
+    backends = ["Qiskit Aer", "Cirq", "PennyLane"]
+    grids = option_grids([parse_option("fusion_enable=True")], backends)
+    assert grids["Qiskit Aer"] == {"fusion_enable": [True]}
+    assert grids["Cirq"] == {"split_untangled_states": [True, False]}  # default kept
+    assert grids["PennyLane"] == {}
+
+    grids = option_grids([parse_option("Cirq:split_untangled_states=False"), parse_option("blocking_enable=True")],
+                         ["Qiskit Aer", "Cirq"])
+    assert grids == {"Qiskit Aer": {"blocking_enable": [True]},
+                     "Cirq": {"split_untangled_states": [False], "blocking_enable": [True]}}
+    with pytest.raises(ValueError):
+        option_grids([parse_option("Cirq:x=1")], ["Qiskit Aer"])
+
+
+def test_default_thread_counts():
+    assert default_thread_counts(6) == [1, 2, 4, 6]
+    assert default_thread_counts(1) == [1]
+
+
+def test_speedup_and_efficiency_relative_to_fewest_threads():
+    df = pd.DataFrame({
+        "backend": ["Cirq"] * 3 + ["Qiskit Aer"],
+        "options": ["defaults"] * 4,
+        "threads": [1, 2, 4, 1],
+        "execution_time": [4.0, 2.0, 2.0, None],
+        "error": [None, None, None, "Timeout"],
+    })
+    out = add_speedup(df)
+    assert out["speedup"].tolist()[:3] == [1.0, 2.0, 2.0]
+    assert out["efficiency"].tolist()[:3] == [1.0, 1.0, 0.5]
+    assert math.isnan(out["speedup"].iloc[3])
+
+    best = best_configs(out)
+    assert best["backend"].tolist() == ["Cirq"]
+    assert best["threads"].iloc[0] == 2
@@ -0,0 +1,47 @@
+import os
+import time
+
+from app.admission import AdmissionController
+from app.workers import WorkerTask, run_isolated
+
+
+def test_results_and_errors_come_back_by_key():
+    seen = []
+    outcomes = run_isolated(
+        [WorkerTask("sum", sum, ([1, 2, 3],)), WorkerTask("bad", int, ("not a number",))],
+        max_workers=2, on_result=lambda key, outcome: seen.append(key),
+    )
+    assert outcomes["sum"] == ("ok", 6)
+    status, message = outcomes["bad"]
+    assert status == "error" and message.startswith("ValueError")
+    assert sorted(seen) == ["bad", "sum"]
+
+
+def test_timeout_terminates_the_worker():
+    t0 = time.monotonic()
+    outcomes = run_isolated([WorkerTask("slow", time.sleep, (60,), timeout=1)])
+    assert outcomes["slow"][0] == "error"
+    assert outcomes["slow"][1].startswith("Timeout")
+    assert time.monotonic() - t0 < 30
+
+
+def test_crashed_worker_is_reported():
+    outcomes = run_isolated([WorkerTask("crash", os._exit, (3,)), WorkerTask("fine", abs, (-1,))])
+    assert outcomes["crash"] == ("error", "Worker crashed (exit code 3)")
+    assert outcomes["fine"] == ("ok", 1)
+
+
+def test_admission_rejects_tasks_that_never_fit():
+    controller = AdmissionController(budget=100)
+    outcomes = run_isolated(
+        [WorkerTask("huge", abs, (1,), memory=1000), WorkerTask("small", abs, (2,), memory=10)],
+        admission=controller,
+    )
+    assert outcomes["huge"][0] == "error" and outcomes["huge"][1].startswith("Rejected")
+    assert outcomes["small"] == ("ok", 2)
+    assert controller.reserved == 0
+
+
+def test_env_is_applied_in_the_worker():
+    outcomes = run_isolated([WorkerTask("env", os.getenv, ("QBENCH_TEST_VAR",), env={"QBENCH_TEST_VAR": "7"})])
+    assert outcomes["env"] == ("ok", "7")